@@ -106,7 +106,7 @@ class Ui_MainWindow(object):
         self.countLabel.setObjectName("countLabel")
         self.horizontalLayout.addWidget(self.countLabel)
         self.verticalLayout_3.addLayout(self.horizontalLayout)
-        self.applicationTable = QtWidgets.QTableWidget(parent=self.tableColumn)
+        self.applicationTable = QtWidgets.QTableView(parent=self.tableColumn)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -115,17 +115,8 @@ class Ui_MainWindow(object):
         self.applicationTable.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
         self.applicationTable.setAlternatingRowColors(True)
         self.applicationTable.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
-        self.applicationTable.setColumnCount(4)
+        self.applicationTable.setSortingEnabled(False)
         self.applicationTable.setObjectName("applicationTable")
-        self.applicationTable.setRowCount(0)
-        item = QtWidgets.QTableWidgetItem()
-        self.applicationTable.setHorizontalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.applicationTable.setHorizontalHeaderItem(1, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.applicationTable.setHorizontalHeaderItem(2, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.applicationTable.setHorizontalHeaderItem(3, item)
         self.applicationTable.horizontalHeader().setCascadingSectionResizes(False)
         self.applicationTable.horizontalHeader().setStretchLastSection(True)
         self.applicationTable.verticalHeader().setVisible(False)
@@ -186,17 +177,12 @@ class Ui_MainWindow(object):
         self.eventsPanel.setObjectName("eventsPanel")
         self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.eventsPanel)
         self.verticalLayout_5.setObjectName("verticalLayout_5")
-        self.eventsTable = QtWidgets.QTableWidget(parent=self.eventsPanel)
+        self.eventsTable = QtWidgets.QTableView(parent=self.eventsPanel)
         self.eventsTable.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
         self.eventsTable.setAlternatingRowColors(False)
         self.eventsTable.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
-        self.eventsTable.setColumnCount(2)
+        self.eventsTable.setSortingEnabled(False)
         self.eventsTable.setObjectName("eventsTable")
-        self.eventsTable.setRowCount(0)
-        item = QtWidgets.QTableWidgetItem()
-        self.eventsTable.setHorizontalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.eventsTable.setHorizontalHeaderItem(1, item)
         self.eventsTable.horizontalHeader().setStretchLastSection(True)
         self.eventsTable.verticalHeader().setVisible(False)
         self.verticalLayout_5.addWidget(self.eventsTable)
@@ -232,15 +218,6 @@ class Ui_MainWindow(object):
         self.searchBox.setPlaceholderText(_translate("MainWindow", "Search"))
         self.filterLabel.setText(_translate("MainWindow", "Filter:"))
         self.countLabel.setText(_translate("MainWindow", "Applications:"))
-        self.applicationTable.setSortingEnabled(False)
-        item = self.applicationTable.horizontalHeaderItem(0)
-        item.setText(_translate("MainWindow", "Company"))
-        item = self.applicationTable.horizontalHeaderItem(1)
-        item.setText(_translate("MainWindow", "Job Title"))
-        item = self.applicationTable.horizontalHeaderItem(2)
-        item.setText(_translate("MainWindow", "Apply Date"))
-        item = self.applicationTable.horizontalHeaderItem(3)
-        item.setText(_translate("MainWindow", "Status"))
         self.companyLabel.setText(_translate("MainWindow", "Company"))
         self.jobTitleLabel.setText(_translate("MainWindow", "Job Title"))
         self.applyDateLabel.setText(_translate("MainWindow", "Apply Date"))
@@ -248,11 +225,6 @@ class Ui_MainWindow(object):
         self.locationLabel.setText(_translate("MainWindow", "Location"))
         self.editButton.setText(_translate("MainWindow", "Edit"))
         self.eventsPanel.setTitle(_translate("MainWindow", "Events"))
-        self.eventsTable.setSortingEnabled(False)
-        item = self.eventsTable.horizontalHeaderItem(0)
-        item.setText(_translate("MainWindow", "Type"))
-        item = self.eventsTable.horizontalHeaderItem(1)
-        item.setText(_translate("MainWindow", "Date"))
         self.deleteEventButton.setText(_translate("MainWindow", "Delete Event"))
         self.newEventButton.setText(_translate("MainWindow", "New Event"))
         self.viewNoteButton.setText(_translate("MainWindow", "View Note"))
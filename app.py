@@ -5,25 +5,27 @@ This module serves as the main entry point for the Job Application Tracker appli
 It handles database initialization, schema updates, and application startup.
 
 Key Functions:
-- ensure_database_exists(): Creates/verifies database and updates schema
-- update_database_schema(): Handles database migrations and schema updates
+- ensure_database_exists(): Creates/verifies database and runs schema migrations
 - load_resource_path(): Resolves paths for resources in both dev and built versions
 
 Dependencies:
 - PyQt6: For the GUI framework
-- sqlite3: For database operations
+- database.migrations: For versioned schema upgrades
 - os, sys: For file and system operations
 """
 
 import sys
 import shutil
 import os
-import sqlite3
+import time
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import Qt
 from windows.main_window import MainWindow
 from helpers.style_helper import load_stylesheet
+from database.connection import close_connections
+from database import db_helper
+from database.migrations import MigrationError, migrate
 
 def ensure_database_exists():
     """
@@ -43,53 +45,13 @@ def ensure_database_exists():
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         shutil.copy(template_path, db_path)
     
-    # Check and update database schema
-    update_database_schema(db_path)
-
-def update_database_schema(db_path):
-    """
-    Updates the database schema to the latest version.
-    Handles creation of new tables and columns for features like locations.
-    
-    Args:
-        db_path (str): Path to the database file
-    """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
+    # Bring the database schema up to date; the app cannot run on a half-migrated schema
     try:
-        # Check if locations table exists
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='locations'
-        """)
-        
-        if not cursor.fetchone():
-            # Create locations table
-            cursor.execute("""
-                CREATE TABLE locations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    city TEXT UNIQUE NOT NULL,
-                    latitude REAL,
-                    longitude REAL
-                )
-            """)
-            
-            # Add location_id column to applications table
-            cursor.execute("""
-                ALTER TABLE applications 
-                ADD COLUMN location_id INTEGER 
-                REFERENCES locations(id)
-            """)
-            
-            print("Database schema updated with locations support")
-        
-        conn.commit()
-    except Exception as e:
-        print(f"Error updating database schema: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
+        migrate(db_path)
+    except MigrationError as e:
+        sys.exit(f"Could not upgrade the database {db_path}: {e}")
+    # Drop geocode cache entries past their TTL so they are looked up again
+    db_helper.purge_expired_geocodes(int(time.time()))
 
 # Call the function to ensure the database is present
 ensure_database_exists()
@@ -116,6 +78,7 @@ if __name__ == "__main__":
     # Initialize Qt Application with OpenGL context sharing
     QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(close_connections)
 
     # Set up application icon and styling
     icon_path = load_resource_path("assets/icon.ico")
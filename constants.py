@@ -4,12 +4,25 @@ STATUS_PENDING = "Pending"
 STATUS_ACTIVE = "Active"
 STATUS_CLOSED = "Closed"
 
+EVENT_TYPES = ("Rejection", "Interview", "Test", "Assignment", "Offer")
+
 TABLE_COLUMN_COMPANY = 0
 TABLE_COLUMN_JOB_TITLE = 1
 TABLE_COLUMN_DATE_APPLIED = 2
 TABLE_COLUMN_STATUS = 3
+TABLE_COLUMN_EVENT_COUNT = 4
+TABLE_COLUMN_LAST_EVENT = 5
+TABLE_COLUMN_LAST_EVENT_DATE = 6
+TABLE_COLUMN_LOCATION = 7
 
 class FilterMode(Enum):
     ALL = "all"
     ACTIVE = "active"
-    CLOSED = "closed"
\ No newline at end of file
+    CLOSED = "closed"
+
+# Statuses included by each filter mode (None means no status restriction)
+FILTER_MODE_STATUSES = {
+    FilterMode.ALL: None,
+    FilterMode.ACTIVE: (STATUS_PENDING, STATUS_ACTIVE),
+    FilterMode.CLOSED: (STATUS_CLOSED,),
+}
@@ -0,0 +1,304 @@
+"""
+Job Application Tracker - Application Store
+
+This module keeps the applications in memory and applies every insert,
+update and delete incrementally. Views subscribe to its signals and update
+only the rows that changed instead of reloading the whole table.
+
+No database work runs on the GUI thread. The initial load streams the
+applications from a worker thread in chunks, and writes are queued on the
+DataService's serialized writer. Updates and deletes are applied to the store
+optimistically, before the write has run; once an application's writes have
+settled it is re-read, which also rolls back any change whose write failed.
+
+Event reads and writes go through the store's EventRepository, which caches
+the events of recently viewed applications.
+
+The store also counts its applications per status as they are loaded,
+changed and removed, so the counts are read in constant time.
+
+Applications with a pending location are handed to a GeocodingQueue; when
+their coordinates arrive the affected applications are re-read and emitted as
+changed, so the table and map pick them up without blocking the save.
+
+Classes:
+    ApplicationStore: In-memory application cache emitting fine-grained change signals
+"""
+from collections import Counter
+from PyQt6 import QtCore
+from database import db_helper
+from database.data_service import DataService
+from database.event_repository import EventRepository
+from geocoding.worker import GeocodingQueue
+from models.event import Event
+
+
+class ApplicationStore(QtCore.QObject):
+    """
+    In-memory collection of Application objects keyed by ID.
+
+    Attributes:
+        service (DataService): Background reader and writer used for every database call
+        events (EventRepository): Cached events of the stored applications
+
+    Signals:
+        reset: The collection was cleared and is being reloaded
+        applications_loaded (list): A chunk of applications arrived during a (re)load
+        loaded: The (re)load has finished
+        application_added (Application): A new application was stored
+        application_changed (Application): An application was replaced with a newer version
+        application_removed (int): The application with this ID was deleted
+        write_failed (str): A write failed and was rolled back; the error message
+        counts_changed: The number of applications of some status changed (see status_counts)
+    """
+    reset = QtCore.pyqtSignal()
+    applications_loaded = QtCore.pyqtSignal(object)
+    loaded = QtCore.pyqtSignal()
+    application_added = QtCore.pyqtSignal(object)
+    application_changed = QtCore.pyqtSignal(object)
+    application_removed = QtCore.pyqtSignal(int)
+    write_failed = QtCore.pyqtSignal(str)
+    counts_changed = QtCore.pyqtSignal()
+
+    LOAD_CHUNK_SIZE = 500
+
+    def __init__(self, geocoding=None, service=None, parent=None):
+        super().__init__(parent)
+        self._applications = {}
+        # Status -> number of stored applications with it, kept in step with _applications
+        self._status_counts = Counter()
+        self._load_generation = 0
+        # Application ID -> number of its writes queued or running
+        self._pending_writes = {}
+        # Deleted since the current load started, so a chunk read earlier cannot bring them back
+        self._deleted = set()
+        self.service = service or DataService(parent=self)
+        self.events = EventRepository(parent=self)
+        self.geocoding = geocoding or GeocodingQueue(parent=self)
+        self.geocoding.location_resolved.connect(self._location_resolved)
+
+    def load(self):
+        """Reload every application in the background, replacing the current contents chunk by chunk."""
+        self._load_generation += 1
+        generation = self._load_generation
+        self._applications = {}
+        self._status_counts = Counter()
+        self._deleted = set()
+        self.events.clear()
+        self.reset.emit()
+        self.counts_changed.emit()
+        self.service.stream(db_helper.iter_applications, chunk_size=self.LOAD_CHUNK_SIZE,
+                            on_chunk=lambda chunk: self._chunk_loaded(generation, chunk),
+                            on_result=lambda _: self._load_finished(generation))
+
+    def applications(self):
+        """Return all stored applications in insertion order."""
+        return list(self._applications.values())
+
+    def get(self, app_id):
+        """Return the stored Application with this ID, or None."""
+        return self._applications.get(app_id)
+
+    def __len__(self):
+        return len(self._applications)
+
+    def status_counts(self):
+        """
+        Return the number of stored applications per status.
+
+        Returns:
+            dict: Status -> count, for every status with at least one application
+        """
+        return {status: count for status, count in self._status_counts.items() if count}
+
+    def add_application(self, company, job_title, apply_date, status, location=None):
+        """
+        Queue the insert of a new application.
+
+        The application needs its ID from the database, so it is added to the
+        store (and application_added emitted) once the insert has committed.
+        """
+        self._write(None, db_helper.insert_application, company, job_title, apply_date, status, location,
+                    on_success=self.reload_application)
+
+    def update_application(self, app_id, company, job_title, apply_date, location=None):
+        """
+        Queue an update of an application and apply it to the store straight away.
+
+        The status is not edited here; it follows from the events (see add_event).
+
+        Returns:
+            Application: The application as it will be once the update is written, or None if not loaded yet
+        """
+        app = self._applications.get(app_id)
+        if app is not None:
+            location = location or None
+            moved = location != app.location
+            app = app._replace(company=company, job_title=job_title, application_date=apply_date,
+                               location=location,
+                               latitude=None if moved else app.latitude,
+                               longitude=None if moved else app.longitude)
+            self._put(app)
+            self.application_changed.emit(app)
+        self._write(app_id, db_helper.update_application, app_id, company, job_title, apply_date, location)
+        return app
+
+    def delete_application(self, app_id):
+        """Queue the delete of an application and its events and drop it from the store straight away."""
+        self.events.invalidate(app_id)
+        self._deleted.add(app_id)
+        if self._pop(app_id) is not None:
+            self.application_removed.emit(app_id)
+        self._write(app_id, db_helper.delete_application, app_id)
+
+    def add_event(self, app_id, event_type, event_date, note=None):
+        """
+        Queue a new event of an application and show it straight away.
+
+        The status and event summary are recomputed by database triggers;
+        until the insert has run they are predicted from the cached events.
+
+        Returns:
+            Application: The application with its expected status
+        """
+        events = self.events.cached(app_id)
+        if events is not None:
+            # The new event sorts after existing events of the same date, as its ID will
+            events = sorted([*events, Event(None, app_id, event_type, event_date, note)],
+                            key=lambda event: event.event_date)
+        self._write(app_id, db_helper.insert_event, app_id, event_type, event_date, note)
+        return self._apply_events(app_id, events)
+
+    def delete_event(self, app_id, event_id):
+        """
+        Queue the delete of an event of an application and hide it straight away.
+
+        Returns:
+            Application: The application with its expected status
+        """
+        events = self.events.cached(app_id)
+        if events is not None:
+            events = [event for event in events if event.id != event_id]
+        self._write(app_id, db_helper.delete_event, event_id)
+        return self._apply_events(app_id, events)
+
+    def reload_application(self, app_id):
+        """Re-read one application from the database in the background and emit the matching signal."""
+        self.service.read(db_helper.get_application, app_id,
+                          on_result=lambda app: self._application_reloaded(app_id, app))
+
+    def wait_for_done(self, msecs=-1):
+        """Block until every queued read and write has finished (used on shutdown and in scripts)."""
+        return self.service.wait_for_done(msecs)
+
+    def shutdown(self):
+        """
+        Stop background work before the database connections are closed.
+
+        Queued writes still run to completion; event prefetches and geocoding
+        not started yet are dropped, and geocoding in flight stops retrying.
+        Blocks until every worker thread is idle.
+        """
+        self.events.cancel()
+        self.geocoding.cancel()
+        self.service.wait_for_done()
+        self.events.wait_for_done()
+        self.geocoding.wait_for_done()
+
+    def _apply_events(self, app_id, events):
+        # Show the expected events of an application and its summary following from them
+        app = self._applications.get(app_id)
+        if events is None:
+            return app
+        self.events.put(app_id, events)
+        if app is not None:
+            count, status, last_type, last_date = db_helper.summarize_events(
+                [(event.event_type, event.event_date) for event in events])
+            app = app._replace(event_count=count, status=status, last_event_type=last_type, last_event_date=last_date)
+            self._put(app)
+            self.application_changed.emit(app)
+        return app
+
+    def _write(self, app_id, func, *args, on_success=None):
+        # Queue func(*args) on the writer; once the application's last pending write has settled,
+        # re-read it so the store holds what was committed (rolling back a failed optimistic change)
+        if app_id is not None:
+            self._pending_writes[app_id] = self._pending_writes.get(app_id, 0) + 1
+
+        def settled(result=None, error=None):
+            if error is not None:
+                print(f"Error writing application {app_id}: {error}")
+                self.write_failed.emit(str(error))
+            elif on_success is not None:
+                on_success(result)
+            if app_id is None:
+                return
+            self._pending_writes[app_id] -= 1
+            if not self._pending_writes[app_id]:
+                del self._pending_writes[app_id]
+                self.reload_application(app_id)
+                self.events.refresh(app_id)
+
+        self.service.write(func, *args, on_result=settled, on_error=lambda error: settled(error=error))
+
+    def _application_reloaded(self, app_id, app):
+        if app_id in self._pending_writes:
+            # Newer writes are queued; the application is re-read again once they settle
+            return
+        if app is None:
+            if self._pop(app_id) is not None:
+                self.application_removed.emit(app_id)
+            return
+
+        existed = app_id in self._applications
+        self._put(app)
+        if existed:
+            self.application_changed.emit(app)
+        else:
+            self.application_added.emit(app)
+        self._geocode_if_pending(app)
+
+    def _chunk_loaded(self, generation, chunk):
+        if generation != self._load_generation:
+            return
+        # Applications with writes in flight are re-read once those settle
+        chunk = [app for app in chunk if app.id not in self._pending_writes
+                 and app.id not in self._applications and app.id not in self._deleted]
+        for app in chunk:
+            self._applications[app.id] = app
+            self._status_counts[app.status] += 1
+            # Resume geocoding of locations left pending by a previous session
+            self._geocode_if_pending(app)
+        self.applications_loaded.emit(chunk)
+        if chunk:
+            self.counts_changed.emit()
+
+    def _put(self, app):
+        # Store a new or changed application, updating the per-status counts by the difference
+        previous = self._applications.get(app.id)
+        self._applications[app.id] = app
+        if previous is None or previous.status != app.status:
+            if previous is not None:
+                self._status_counts[previous.status] -= 1
+            self._status_counts[app.status] += 1
+            self.counts_changed.emit()
+
+    def _pop(self, app_id):
+        # Remove an application, returning it (or None if it was not stored)
+        app = self._applications.pop(app_id, None)
+        if app is not None:
+            self._status_counts[app.status] -= 1
+            self.counts_changed.emit()
+        return app
+
+    def _load_finished(self, generation):
+        if generation == self._load_generation:
+            self.loaded.emit()
+
+    def _geocode_if_pending(self, app):
+        if app is not None and app.location and app.latitude is None:
+            self.geocoding.enqueue(app.location)
+
+    def _location_resolved(self, city, lat, lng):
+        for app_id in [app.id for app in self._applications.values() if app.location == city]:
+            self.reload_application(app_id)
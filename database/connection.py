@@ -0,0 +1,126 @@
+"""
+Job Application Tracker - SQLite Connection Manager
+
+This module owns every SQLite connection the application opens. Instead of
+opening and closing a connection per query, each thread keeps one long-lived
+connection that is tuned once when it is opened.
+
+Key Functions:
+- get_connection(): Returns the calling thread's connection, opening it on first use
+- transaction(): Context manager wrapping a block of statements in one transaction
+- set_database_path(): Points the manager at a different database file
+- close_connections(): Closes every connection opened by the manager
+
+Connections are opened in autocommit mode so plain reads never hold a
+transaction open; writes must go through transaction(), which issues an
+explicit BEGIN IMMEDIATE and commits (or rolls back) once at the end.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Define the database file path
+DB_PATH = os.path.join("Data", "job_tracker.db")
+
+# Applied once to every new connection
+PRAGMAS = (
+    ("journal_mode", "WAL"),          # Readers never block the writer
+    ("synchronous", "NORMAL"),        # Only fsync at WAL checkpoints
+    ("mmap_size", 256 * 1024 * 1024), # Read pages straight from the page cache
+    ("cache_size", -64 * 1024),       # 64 MiB page cache (negative = KiB)
+    ("busy_timeout", 5000),           # Wait for a competing writer instead of failing
+    ("temp_store", "MEMORY"),
+)
+
+_local = threading.local()
+_registry_lock = threading.Lock()
+_connections = []
+_generation = 0
+
+
+def _open_connection(db_path):
+    conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    for name, value in PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+    with _registry_lock:
+        _connections.append(conn)
+    return conn
+
+
+def get_connection():
+    """
+    Get the connection belonging to the calling thread.
+
+    The connection is opened lazily and reused for the lifetime of the thread,
+    so callers must not close it.
+
+    Returns:
+        sqlite3.Connection: The thread's connection to DB_PATH
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.generation != _generation:
+        conn = _open_connection(DB_PATH)
+        _local.conn = conn
+        _local.generation = _generation
+        _local.depth = 0
+    return conn
+
+
+@contextmanager
+def transaction():
+    """
+    Run a block of statements as a single transaction.
+
+    Nested calls join the outermost transaction, so helpers can be composed
+    without committing halfway through a logical write.
+
+    Yields:
+        sqlite3.Cursor: A cursor on the thread's connection
+    """
+    conn = get_connection()
+    outermost = _local.depth == 0
+    if outermost:
+        conn.execute("BEGIN IMMEDIATE")
+    _local.depth += 1
+    try:
+        yield conn.cursor()
+    except BaseException:
+        _local.depth -= 1
+        if outermost:
+            conn.rollback()
+        raise
+    else:
+        _local.depth -= 1
+        if outermost:
+            conn.commit()
+
+
+def set_database_path(db_path):
+    """
+    Point the manager at a different database file.
+
+    Existing connections are closed; threads reopen against the new path on
+    their next call to get_connection().
+
+    Args:
+        db_path (str): Path to the database file
+    """
+    global DB_PATH
+    close_connections()
+    DB_PATH = db_path
+
+
+def close_connections():
+    """Close every connection opened by the manager."""
+    global _generation
+    with _registry_lock:
+        connections = list(_connections)
+        _connections.clear()
+        _generation += 1
+    for conn in connections:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,128 @@
+"""
+Job Application Tracker - Data Service
+
+Runs database work off the GUI thread so the window stays responsive however
+slow the disk is. Reads run on a reader thread and writes on a writer thread;
+each is a single long-lived thread, so it keeps its SQLite connection and
+writes commit one at a time in the order they were submitted. A read
+submitted while writes are still queued runs on the writer thread after them,
+so it always sees the caller's own writes.
+
+Results and errors are delivered on the GUI thread through callbacks.
+
+Classes:
+    DataService: Background reader and serialized writer for db_helper calls
+"""
+from PyQt6 import QtCore
+
+
+class _TaskSignals(QtCore.QObject):
+    # Emitted from worker threads, delivered to the service on the GUI thread
+    finished = QtCore.pyqtSignal(object, object)
+    failed = QtCore.pyqtSignal(object, object)
+    write_done = QtCore.pyqtSignal()
+
+
+class _Task(QtCore.QRunnable):
+    # Runs func(*args) and reports its result (or, for streams, each chunk of its items)
+    def __init__(self, func, args, on_result, on_error, signals, chunk_size=None, on_chunk=None, write=False):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.on_result = on_result
+        self.on_error = on_error
+        self.signals = signals
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk
+        self.write = write
+
+    def run(self):
+        try:
+            if self.chunk_size is None:
+                result = self.func(*self.args)
+            else:
+                result = None
+                chunk = []
+                for item in self.func(*self.args):
+                    chunk.append(item)
+                    if len(chunk) >= self.chunk_size:
+                        self.signals.finished.emit(self.on_chunk, chunk)
+                        chunk = []
+                if chunk:
+                    self.signals.finished.emit(self.on_chunk, chunk)
+        except Exception as e:
+            self.signals.failed.emit(self.on_error or self._print_error, e)
+        else:
+            self.signals.finished.emit(self.on_result, result)
+        finally:
+            if self.write:
+                self.signals.write_done.emit()
+
+    def _print_error(self, error):
+        print(f"Error in background database call {getattr(self.func, '__name__', self.func)}: {error}")
+
+
+class DataService(QtCore.QObject):
+    """
+    Background reader and serialized writer for database calls.
+
+    Every method takes the function to run (typically from db_helper) and its
+    arguments, and returns immediately. on_result is called with the return
+    value and on_error with the exception, both on the GUI thread; without
+    on_error, errors are printed.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending_writes = 0
+
+        self._reader = QtCore.QThreadPool(self)
+        self._writer = QtCore.QThreadPool(self)
+        for pool in (self._reader, self._writer):
+            pool.setMaxThreadCount(1)
+            pool.setExpiryTimeout(-1)
+
+        self._signals = _TaskSignals(self)
+        self._signals.finished.connect(self._deliver)
+        self._signals.failed.connect(self._deliver)
+        self._signals.write_done.connect(self._write_done)
+
+    def read(self, func, *args, on_result=None, on_error=None):
+        """Run a read in the background, after any writes still queued."""
+        self._read_pool().start(_Task(func, args, on_result, on_error, self._signals))
+
+    def stream(self, func, *args, chunk_size=500, on_chunk=None, on_result=None, on_error=None):
+        """
+        Run a read returning an iterator in the background and deliver its items in chunks.
+
+        Args:
+            func: Callable returning an iterator, e.g. a db_helper generator
+            chunk_size (int): Items per on_chunk call
+            on_chunk: Called with each list of up to chunk_size items, in order
+            on_result: Called with None once every chunk was delivered
+        """
+        self._read_pool().start(_Task(func, args, on_result, on_error, self._signals, chunk_size, on_chunk))
+
+    def write(self, func, *args, on_result=None, on_error=None):
+        """Queue a write; writes run one at a time in submission order."""
+        self._pending_writes += 1
+        self._writer.start(_Task(func, args, on_result, on_error, self._signals, write=True))
+
+    def pending_writes(self):
+        """Return the number of writes queued or running."""
+        return self._pending_writes
+
+    def wait_for_done(self, msecs=-1):
+        """Block until every queued read and write has finished (used on shutdown and in scripts)."""
+        return self._writer.waitForDone(msecs) and self._reader.waitForDone(msecs)
+
+    def _read_pool(self):
+        return self._writer if self._pending_writes else self._reader
+
+    def _write_done(self):
+        self._pending_writes -= 1
+
+    @staticmethod
+    def _deliver(callback, value):
+        if callback is not None:
+            callback(value)
@@ -1,130 +1,633 @@
-import sqlite3
-import os
+import json
+import re
+import time
 import constants as c
+from database import search_query
+from database.connection import get_connection, transaction
 from models.application import Application
 from models.event import Event
-import requests
-try:
-    from config import GOOGLE_MAPS_API_KEY
-except ImportError:
-    print("Please create a config.py file with your API key (see config_template.py)")
-    GOOGLE_MAPS_API_KEY = None
-
-# Define the database file path
-DB_PATH = os.path.join("Data", "job_tracker.db")
-
-def connect_db():
-    return sqlite3.connect(DB_PATH)
-
-def get_all_applications():
-    """Retrieve all applications with company names and locations."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT 
-            a.id, 
-            c.name, 
-            a.job_title, 
-            a.application_date, 
-            a.status,
-            l.city,
-            l.latitude,
-            l.longitude
-        FROM applications a 
-        JOIN companies c ON a.company_id = c.id
-        LEFT JOIN locations l ON a.location_id = l.id
-    """)
-    
-    applications = []
-    for row in cursor.fetchall():
-        app = Application(
-            id=row[0],
-            company=row[1],
-            job_title=row[2],
-            application_date=row[3],
-            status=row[4],
-            location=row[5],  # city from locations table
-            latitude=row[6],  # latitude from locations table
-            longitude=row[7]  # longitude from locations table
-        )
-        applications.append(app)
-    
-    conn.close()
+from models.columnar import ColumnarTable
+from geocoding.normalize import normalize_query
+from geocoding.gazetteer import get_gazetteer
+
+APPLICATION_COLUMNS = """
+    a.id, 
+    c.name, 
+    a.job_title, 
+    a.application_date, 
+    a.status,
+    l.city,
+    l.latitude,
+    l.longitude,
+    a.event_count,
+    a.last_event_type,
+    a.last_event_date
+"""
+
+# Application fields filled by APPLICATION_COLUMNS, in the same order
+APPLICATION_FIELDS = Application._fields[:-1]
+
+# CROSS JOIN keeps applications as the outer loop so status filters use their index
+APPLICATION_JOINS = """
+    FROM applications a 
+    CROSS JOIN companies c ON a.company_id = c.id
+    LEFT JOIN locations l ON a.location_id = l.id
+"""
+
+def _application_factory(cursor, row):
+    # Row factory: query rows in APPLICATION_COLUMNS order become Applications directly
+    return Application(*row)
+
+def _event_factory(cursor, row):
+    return Event(*row)
+
+def _query(row_factory, sql, params=()):
+    """Run a query on a cursor that builds its rows with row_factory."""
+    cursor = get_connection().cursor()
+    cursor.row_factory = row_factory
+    return cursor.execute(sql, params)
+
+def get_all_applications(with_events=False):
+    """
+    Retrieve all applications with company names and locations, ordered by ID.
+    Args:
+        with_events (bool): Also fill each application's events list, using one
+            extra query for the events of every application.
+    Returns:
+        List[Application]: The applications.
+    """
+    applications = _query(_application_factory,
+                          f"SELECT {APPLICATION_COLUMNS} {APPLICATION_JOINS} ORDER BY a.id").fetchall()
+    if with_events:
+        applications = _attach_events(applications, _query(
+            _event_factory,
+            "SELECT id, application_id, event_type, event_date, note FROM events "
+            "ORDER BY application_id, event_date, id"))
     return applications
 
+def iter_applications(batch_size=1000):
+    """
+    Stream all applications with company names and locations, ordered by ID.
+    Args:
+        batch_size (int): Rows fetched from the cursor at a time.
+    Yields:
+        Application: Each application, without events.
+    """
+    cursor = _query(_application_factory, f"SELECT {APPLICATION_COLUMNS} {APPLICATION_JOINS} ORDER BY a.id")
+    try:
+        yield from _fetch_batches(cursor, batch_size)
+    finally:
+        cursor.close()
+
+def _attach_events(applications, events):
+    """Merge events sorted by application ID into applications sorted by ID, in one pass."""
+    return list(_merge_events(applications, events))
+
+def _merge_events(applications, events, same_order=False):
+    # Yield applications carrying their events. Both inputs are sorted by application ID, or, with
+    # same_order, events belong only to these applications and come grouped in their order.
+    events = iter(events)
+    event = next(events, None)
+    for app in applications:
+        while not same_order and event is not None and event.application_id < app.id:
+            event = next(events, None)
+        app_events = []
+        while event is not None and event.application_id == app.id:
+            app_events.append(event)
+            event = next(events, None)
+        yield app.with_events(app_events) if app_events else app
+
+def _fetch_batches(cursor, batch_size):
+    # Iterate a cursor's rows, fetching batch_size rows at a time
+    while rows := cursor.fetchmany(batch_size):
+        yield from rows
+
+def iter_applications_with_events(filter_mode=c.FilterMode.ALL, date_from=None, date_to=None, batch_size=1000):
+    """
+    Stream the applications matching a filter mode and date range with their events, oldest first.
+
+    Applications and events are read by two cursors walking the same order
+    (application date, then ID) and merged as they arrive, so memory use does
+    not depend on the number of rows. Both walks follow indexes; the status
+    filter is applied to the rows as they pass instead of through the status
+    index, which would need a sort.
+
+    Args:
+        filter_mode (FilterMode): Which statuses to include
+        date_from (str): Earliest application date to include ("yyyy-MM-dd"), None for no limit
+        date_to (str): Latest application date to include ("yyyy-MM-dd"), None for no limit
+        batch_size (int): Rows fetched from each cursor at a time
+    Yields:
+        Application: Each matching application, carrying its events oldest first.
+    """
+    statuses = c.FILTER_MODE_STATUSES[filter_mode]
+    clauses = []
+    params = []
+    if statuses is not None:
+        # Unary + keeps the planner on the application_date index, which gives the order for free
+        clauses.append(f"+a.status IN ({', '.join('?' * len(statuses))})")
+        params.extend(statuses)
+    if date_from:
+        clauses.append("a.application_date >= ?")
+        params.append(date_from)
+    if date_to:
+        clauses.append("a.application_date <= ?")
+        params.append(date_to)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    applications = _query(_application_factory,
+                          f"SELECT {APPLICATION_COLUMNS} {APPLICATION_JOINS} {where} "
+                          f"ORDER BY a.application_date, a.id", params)
+    # Started while the first statement is still reading, so both see the same snapshot
+    events = _query(_event_factory, f"""
+        SELECT e.id, e.application_id, e.event_type, e.event_date, e.note
+        FROM applications a CROSS JOIN events e ON e.application_id = a.id
+        {where}
+        ORDER BY a.application_date, a.id, e.event_date, e.id
+    """, params)
+    try:
+        yield from _merge_events(_fetch_batches(applications, batch_size),
+                                 _fetch_batches(events, batch_size), same_order=True)
+    finally:
+        applications.close()
+        events.close()
+
+def get_application_table():
+    """
+    Retrieve all applications, ordered by ID, as a compact columnar table.
+
+    Meant for large read-only views (exports, statistics): the result set is
+    kept as one array per column and Applications are only built on access.
+
+    Returns:
+        ColumnarTable: The applications, without events.
+    """
+    cursor = get_connection().execute(f"SELECT {APPLICATION_COLUMNS} {APPLICATION_JOINS} ORDER BY a.id")
+    return ColumnarTable(Application, APPLICATION_FIELDS, cursor, {"id": "q", "event_count": "q"})
+
+def get_application(app_id):
+    """
+    Retrieve a single application with its company name and location.
+    Args:
+        app_id (int): The application ID.
+    Returns:
+        Application: The application, or None if it does not exist.
+    """
+    cursor = _query(_application_factory, f"SELECT {APPLICATION_COLUMNS} {APPLICATION_JOINS} WHERE a.id = ?", (app_id,))
+    return cursor.fetchone()
+
+def get_applications(filter_mode=c.FilterMode.ALL, search=None, limit=None, offset=0,
+                     date_from=None, date_to=None):
+    """
+    Retrieve the applications matching a filter mode, search text and date range, newest first.
+
+    The filter mode becomes an indexed `status IN (...)` clause, the date range
+    an indexed range on application_date, and the total number of matches is
+    computed by the same query, so callers never need to load the full list
+    just to count it.
+
+    Args:
+        filter_mode (FilterMode): Which statuses to include
+        search (str): Case-insensitive text matched against company and job title
+        limit (int): Maximum number of applications to return, None for all
+        offset (int): Number of matching applications to skip
+        date_from (str): Earliest application date to include ("yyyy-MM-dd"), None for no limit
+        date_to (str): Latest application date to include ("yyyy-MM-dd"), None for no limit
+
+    Returns:
+        tuple: (list of Application objects, total number of matches)
+    """
+    statuses = c.FILTER_MODE_STATUSES[filter_mode]
+    clauses = []
+    params = []
+    if statuses is not None:
+        clauses.append(f"a.status IN ({', '.join('?' * len(statuses))})")
+        params.extend(statuses)
+    if search:
+        clauses.append("(c.name LIKE ? ESCAPE '\\' OR a.job_title LIKE ? ESCAPE '\\')")
+        pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        params.extend((pattern, pattern))
+    if date_from:
+        clauses.append("a.application_date >= ?")
+        params.append(date_from)
+    if date_to:
+        clauses.append("a.application_date <= ?")
+        params.append(date_to)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    query = (f"SELECT {APPLICATION_COLUMNS}, COUNT(*) OVER () {APPLICATION_JOINS} {where} "
+             f"ORDER BY a.application_date DESC, a.id DESC")
+    if limit is not None:
+        query += " LIMIT ? OFFSET ?"
+        params.extend((limit, offset))
+
+    rows = get_connection().execute(query, params).fetchall()
+    if rows:
+        return [Application(*row[:-1]) for row in rows], rows[0][-1]
+    if limit is None or offset == 0:
+        return [], 0
+
+    # Paged past the end: the window count is unavailable, so count directly
+    cursor = get_connection().execute(f"SELECT COUNT(*) {APPLICATION_JOINS} {where}", params[:-2])
+    return [], cursor.fetchone()[0]
+
+# ORDER BY expression of each application table column. Nullable columns sort
+# as "" so keyset comparisons never meet a NULL; the others match an index.
+SORT_EXPRESSIONS = {
+    c.TABLE_COLUMN_COMPANY: "c.name",
+    c.TABLE_COLUMN_JOB_TITLE: "a.job_title COLLATE NOCASE",
+    c.TABLE_COLUMN_DATE_APPLIED: "a.application_date",
+    c.TABLE_COLUMN_STATUS: "a.status",
+    c.TABLE_COLUMN_EVENT_COUNT: "a.event_count",
+    c.TABLE_COLUMN_LAST_EVENT: "IFNULL(a.last_event_type, '')",
+    c.TABLE_COLUMN_LAST_EVENT_DATE: "IFNULL(a.last_event_date, '')",
+    c.TABLE_COLUMN_LOCATION: "IFNULL(l.city, '')",
+}
+
+# Sorting by company walks companies in name order, so let the planner put them first
+COMPANY_FIRST_JOINS = """
+    FROM companies c
+    JOIN applications a ON a.company_id = c.id
+    LEFT JOIN locations l ON a.location_id = l.id
+"""
+
+PAGE_SIZE = 200
+
+def _application_filter(filter_mode, ids):
+    """Build the WHERE clauses and parameters for a filter mode and an optional set of application IDs."""
+    clauses = []
+    params = []
+    statuses = c.FILTER_MODE_STATUSES[filter_mode]
+    if statuses is not None:
+        clauses.append(f"a.status IN ({', '.join('?' * len(statuses))})")
+        params.extend(statuses)
+    if ids is not None:
+        clauses.append("a.id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(sorted(ids)))
+    return clauses, params
+
+def get_application_page(sort_keys, filter_mode=c.FilterMode.ALL, ids=None, after=None, limit=PAGE_SIZE):
+    """
+    Retrieve one page of applications in a multi-column sort order, using keyset pagination.
+
+    The order is an ORDER BY over SORT_EXPRESSIONS with the application ID as
+    the final tie-breaker. Instead of an OFFSET, the next page starts after the
+    sort key of the previous page's last row, and the leading key also becomes
+    a plain range condition, so the index on it is entered at that position
+    rather than scanned from the start. Fetching any page costs the same
+    regardless of how many rows come before it.
+
+    Args:
+        sort_keys (list): (table column, descending) pairs, most significant first
+        filter_mode (FilterMode): Which statuses to include
+        ids (set): Only include these application IDs, None for no restriction
+        after (tuple): Sort key of the last row of the previous page, None for the first page
+        limit (int): Maximum number of applications to return, None for all remaining
+
+    Returns:
+        list: (Application, sort key) pairs; pass the last sort key as `after` to get the next page
+    """
+    keys = [(SORT_EXPRESSIONS[column], descending) for column, descending in sort_keys]
+    keys.append(("a.id", keys[0][1] if keys else False))
+
+    clauses, params = _application_filter(filter_mode, ids)
+    if after is not None:
+        leading, descending = keys[0]
+        clauses.append(f"{leading} {'<=' if descending else '>='} ?")
+        params.append(after[0])
+        # (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ..., with < for descending keys
+        alternatives = []
+        for i, (expression, descending) in enumerate(keys):
+            terms = [f"{previous} = ?" for previous, _ in keys[:i]]
+            terms.append(f"{expression} {'<' if descending else '>'} ?")
+            alternatives.append(f"({' AND '.join(terms)})")
+            params.extend(after[:i + 1])
+        clauses.append(f"({' OR '.join(alternatives)})")
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    joins = COMPANY_FIRST_JOINS if sort_keys and sort_keys[0][0] == c.TABLE_COLUMN_COMPANY else APPLICATION_JOINS
+    order = ", ".join(f"{expression} {'DESC' if descending else 'ASC'}" for expression, descending in keys)
+    query = (f"SELECT {APPLICATION_COLUMNS}, {', '.join(expression for expression, _ in keys)} "
+             f"{joins} {where} ORDER BY {order}")
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    width = len(APPLICATION_FIELDS)
+    return [(Application(*row[:width]), row[width:]) for row in get_connection().execute(query, params)]
+
+def count_applications(filter_mode=c.FilterMode.ALL, ids=None):
+    """
+    Count the applications matching a filter mode and an optional set of application IDs.
+    Returns:
+        int: The number of matching applications.
+    """
+    clauses, params = _application_filter(filter_mode, ids)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return get_connection().execute(f"SELECT COUNT(*) FROM applications a {where}", params).fetchone()[0]
+
+# bm25 column weights for company, job_title, location, notes
+SEARCH_WEIGHTS = (10.0, 8.0, 4.0, 1.0)
+
+def build_search_query(text):
+    """
+    Turn free text into an FTS5 query matching every word as a prefix.
+    Args:
+        text (str): Text typed by the user.
+    Returns:
+        str: The MATCH expression, or None if the text has no searchable words.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " AND ".join(f'"{word}"*' for word in words)
+
+def search_applications(text, limit=None):
+    """
+    Find applications whose company, job title, location or event notes match text.
+    Args:
+        text (str): Words to look for; each word matches as a prefix.
+        limit (int): Maximum number of IDs to return, None for all.
+    Returns:
+        List[int]: Matching application IDs, best bm25 match first.
+    """
+    query = build_search_query(text)
+    if query is None:
+        return []
+    weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+    sql = f"""
+        SELECT rowid FROM application_search
+        WHERE application_search MATCH ?
+        ORDER BY bm25(application_search, {weights})
+    """
+    params = [query]
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return [row[0] for row in get_connection().execute(sql, params)]
+
+# Condition matching the applications found by a full-text MATCH expression
+_MATCH_SQL = "a.id IN (SELECT rowid FROM application_search WHERE application_search MATCH ?)"
+
+def _search_match(field, words):
+    # FTS5 expression for words as a phrase, the last word as a prefix, optionally in one column
+    phrase = '"' + " ".join(words) + '"*'
+    return phrase if field is None else f"{field} : {phrase}"
+
+def _is_text_term(node):
+    return isinstance(node, search_query.Term) and (node.field is None or node.field in search_query.TEXT_FIELDS)
+
+def compile_search_query(node):
+    """
+    Compile a parsed search query into a condition on the applications table (alias a).
+
+    Text terms become rowid lookups in the full-text index (the text terms of
+    one AND share a single MATCH, so the index intersects them), status and
+    dates become comparisons served by the status and date indexes, and has:
+    terms look up events by type through their index.
+    Args:
+        node: Root of a tree returned by search_query.parse_query.
+    Returns:
+        Tuple[str, List]: The SQL condition and its parameters.
+    """
+    if isinstance(node, search_query.And):
+        text = [child for child in node.children if _is_text_term(child)]
+        parts = [compile_search_query(child) for child in node.children if not _is_text_term(child)]
+        if text:
+            parts.insert(0, (_MATCH_SQL, [" AND ".join(_search_match(field, words) for field, words in text)]))
+        return _join_conditions(" AND ", parts)
+    if isinstance(node, search_query.Or):
+        return _join_conditions(" OR ", [compile_search_query(child) for child in node.children])
+    if isinstance(node, search_query.Not):
+        sql, params = compile_search_query(node.child)
+        return f"NOT {sql}", params
+
+    field, value = node
+    if field is None or field in search_query.TEXT_FIELDS:
+        return _MATCH_SQL, [_search_match(field, value)]
+    if field == "status":
+        return "a.status = ?", [value]
+    if field == "after":
+        return "a.application_date >= ?", [value]
+    if field == "before":
+        return "a.application_date < ?", [value]
+    if value == "location":
+        return "a.location_id IS NOT NULL", []
+    if value == "events":
+        return "a.event_count > 0", []
+    return "a.id IN (SELECT application_id FROM events WHERE event_type = ?)", [value]
+
+def _join_conditions(operator, parts):
+    if len(parts) == 1:
+        return parts[0]
+    return f"({operator.join(sql for sql, _ in parts)})", [param for _, params in parts for param in params]
+
+def query_applications(node):
+    """
+    Find the applications matching a parsed search query.
+    Args:
+        node: Root of a tree returned by search_query.parse_query.
+    Returns:
+        List[int]: Matching application IDs.
+    """
+    condition, params = compile_search_query(node)
+    return [row[0] for row in get_connection().execute(f"SELECT a.id FROM applications a WHERE {condition}", params)]
+
 def get_all_company_names():
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM companies ORDER BY name")
-    companies = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return companies
+    cursor = get_connection().execute("SELECT name FROM companies ORDER BY name")
+    return [row[0] for row in cursor.fetchall()]
 
 def get_or_create_company(company_name):
-    conn = connect_db()
-    cursor = conn.cursor()
+    with transaction() as cursor:
+        return _upsert_company(cursor, company_name)
+
+def _upsert_company(cursor, company_name):
+    """Return the company's ID, inserting it first if needed, inside the caller's transaction."""
+    cursor.execute(
+        "INSERT INTO companies (name) VALUES (?) ON CONFLICT DO NOTHING RETURNING id",
+        (company_name,)
+    )
+    row = cursor.fetchone()
+    if row:
+        return row[0]
     cursor.execute("SELECT id FROM companies WHERE name = ?", (company_name,))
+    return cursor.fetchone()[0]
+
+def _upsert_location(cursor, city):
+    """
+    Return the location's ID inside the caller's transaction.
+
+    New cities take their coordinates from the geocode cache when it has an
+    answer for the same normalized query, then from the offline gazetteer;
+    otherwise they are stored without coordinates (pending) and geocoded in
+    the background by geocoding.worker.GeocodingQueue.
+
+    Args:
+        cursor: Cursor of the open transaction
+        city (str): City name, may be None
+
+    Returns:
+        int: The location ID, or None if no city was given
+    """
+    if not city:
+        return None
+    cursor.execute("SELECT id FROM locations WHERE city = ?", (city,))
     row = cursor.fetchone()
     if row:
-        company_id = row[0]
-    else:
-        cursor.execute("INSERT INTO companies (name) VALUES (?)", (company_name,))
-        # Get ID using SELECT last_insert_rowid()
-        cursor.execute("SELECT last_insert_rowid()")
-        company_id = cursor.fetchone()[0]
-    conn.commit()
-    conn.close()
-    return company_id
+        return row[0]
+
+    # A live cached answer for the same normalized query saves the background lookup
+    cursor.execute("""
+        SELECT latitude, longitude FROM geocode_cache
+        WHERE query_key = ? AND status = 'ok' AND (expires_at IS NULL OR expires_at > ?)
+    """, (normalize_query(city), int(time.time())))
+    lat, lng = cursor.fetchone() or (None, None)
+    gazetteer = get_gazetteer()
+    if lat is None and gazetteer is not None:
+        lat, lng = gazetteer.geocode(city) or (None, None)
+    cursor.execute(
+        "INSERT INTO locations (city, latitude, longitude) VALUES (?, ?, ?) "
+        "ON CONFLICT DO NOTHING RETURNING id",
+        (city, lat, lng))
+    row = cursor.fetchone()
+    if row:
+        return row[0]
+    cursor.execute("SELECT id FROM locations WHERE city = ?", (city,))
+    return cursor.fetchone()[0]
 
 
 def insert_application(company, job_title, apply_date, status, location=None):
-    """Insert a new application into the database."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    
-    try:
-        # Get or create company
-        company_id = get_or_create_company(company)
-        
-        # Get or create location if provided
-        location_id = get_or_create_location(location) if location else None
-        
+    """Insert a new application ("yyyy-MM-dd" apply_date), its company and its location in one transaction. Returns the new ID."""
+    with transaction() as cursor:
+        company_id = _upsert_company(cursor, company)
+        location_id = _upsert_location(cursor, location)
         cursor.execute("""
             INSERT INTO applications 
             (company_id, job_title, application_date, status, location_id) 
             VALUES (?, ?, ?, ?, ?)
         """, (company_id, job_title, apply_date, status, location_id))
-        
-        conn.commit()
-    finally:
-        conn.close()
+        return cursor.lastrowid
 
-def update_application(app_id, company, job_title, apply_date, status, location=None):
-    """Update an existing application."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    
-    try:
-        # Get or create company
-        company_id = get_or_create_company(company)
-        
-        # Get or create location if provided
-        location_id = get_or_create_location(location) if location else None
-        
+def update_application(app_id, company, job_title, apply_date, location=None):
+    """
+    Update an existing application, its company and its location in one transaction.
+
+    The status is left alone: the event summary triggers derive it from the events.
+    """
+    with transaction() as cursor:
+        company_id = _upsert_company(cursor, company)
+        location_id = _upsert_location(cursor, location)
         cursor.execute("""
             UPDATE applications 
             SET company_id = ?, 
                 job_title = ?, 
                 application_date = ?, 
-                status = ?,
                 location_id = ?
             WHERE id = ?
-        """, (company_id, job_title, apply_date, status, location_id, app_id))
-        
-        conn.commit()
-    finally:
-        conn.close()
+        """, (company_id, job_title, apply_date, location_id, app_id))
+
+def get_company_ids():
+    """Return a dict mapping every company name to its ID."""
+    return dict(get_connection().execute("SELECT name, id FROM companies"))
+
+def get_location_ids():
+    """Return a dict mapping every location's city to its ID."""
+    return dict(get_connection().execute("SELECT city, id FROM locations"))
+
+def _next_id(cursor, table):
+    # First ID of an AUTOINCREMENT table that was never handed out, for inserting with explicit IDs
+    cursor.execute(f"""
+        SELECT MAX(IFNULL((SELECT seq FROM sqlite_sequence WHERE name = ?), 0),
+                   IFNULL((SELECT MAX(id) FROM {table}), 0)) + 1
+    """, (table,))
+    return cursor.fetchone()[0]
+
+# Per-row insert triggers replaced by set-based statements during bulk inserts
+BULK_INSERT_TRIGGERS = ("event_summary_ai", "search_applications_ai", "search_events_ai")
+
+def summarize_events(events):
+    """
+    Compute an application's event summary the way the event triggers maintain it.
+    Args:
+        events (list): Tuples starting with (event_type, event_date), oldest first.
+    Returns:
+        tuple: (event_count, status, last_event_type, last_event_date)
+    """
+    if not events:
+        return 0, c.STATUS_PENDING, None, None
+    status = c.STATUS_CLOSED if any(event[0] == "Rejection" for event in events) else c.STATUS_ACTIVE
+    return len(events), status, events[-1][0], events[-1][1]
+
+def insert_application_batch(applications, company_ids, location_ids):
+    """
+    Insert many applications and their events in one transaction.
+
+    Applications, events and new companies are written with one executemany
+    each. IDs are assigned up front, inside the transaction, so events can
+    reference their application without a round trip per row. The per-row
+    insert triggers are dropped for the duration of the transaction (and
+    recreated from their stored SQL before it commits): event summaries are
+    computed here instead, and the batch is added to the search index with a
+    single statement.
+
+    Args:
+        applications (list): (company, job_title, application_date, location, events) tuples,
+            where events is a sequence of (event_type, event_date, note) tuples, oldest first
+        company_ids (dict): Company name to ID map; new companies are added to it on success
+        location_ids (dict): City to ID map; new locations are added to it on success
+    Returns:
+        tuple: (applications inserted, events inserted)
+    """
+    with transaction() as cursor:
+        cursor.execute(
+            f"SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+            f"AND name IN ({', '.join('?' * len(BULK_INSERT_TRIGGERS))})", BULK_INSERT_TRIGGERS)
+        triggers = cursor.fetchall()
+        for name, _ in triggers:
+            cursor.execute(f"DROP TRIGGER {name}")
+
+        new_companies = list(dict.fromkeys(
+            app[0] for app in applications if app[0] not in company_ids))
+        company_rows = list(enumerate(new_companies, _next_id(cursor, "companies")))
+        cursor.executemany("INSERT INTO companies (id, name) VALUES (?, ?)", company_rows)
+        companies = {**company_ids, **{name: company_id for company_id, name in company_rows}}
+
+        # New cities are rare next to applications; each may need a cache or gazetteer lookup
+        new_locations = {city: _upsert_location(cursor, city) for city in dict.fromkeys(
+            app[3] for app in applications if app[3] and app[3] not in location_ids)}
+
+        first_id = _next_id(cursor, "applications")
+        cursor.executemany("""
+            INSERT INTO applications
+            (id, company_id, job_title, application_date, location_id,
+             event_count, status, last_event_type, last_event_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, ((app_id, companies[company], job_title, apply_date,
+               location_ids.get(location) or new_locations.get(location), *summarize_events(events))
+              for app_id, (company, job_title, apply_date, location, events) in enumerate(applications, first_id)))
+
+        events = [(app_id, event_type, event_date, note)
+                  for app_id, app in enumerate(applications, first_id)
+                  for event_type, event_date, note in app[4]]
+        cursor.executemany("INSERT INTO events (application_id, event_type, event_date, note) VALUES (?, ?, ?, ?)",
+                           events)
+
+        cursor.execute("""
+            INSERT INTO application_search (rowid, company, job_title, location, notes)
+            SELECT a.id, c.name, a.job_title, l.city,
+                   (SELECT group_concat(e.note, ' ') FROM events e WHERE e.application_id = a.id)
+            FROM applications a
+            CROSS JOIN companies c ON c.id = a.company_id
+            LEFT JOIN locations l ON l.id = a.location_id
+            WHERE a.id >= ?
+        """, (first_id,))
+
+        for _, sql in triggers:
+            cursor.execute(sql)
+
+    company_ids.update(companies)
+    location_ids.update(new_locations)
+    return len(applications), len(events)
 
 def delete_application(app_id):
     """
@@ -132,31 +635,24 @@ def delete_application(app_id):
     Args:
         app_id (int): The application ID.
     """
-    conn = connect_db()
-    cursor = conn.cursor()
-
-    cursor.execute("DELETE FROM events WHERE application_id = ?", (app_id,))
-    cursor.execute("DELETE FROM applications WHERE id = ?", (app_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as cursor:
+        # Application first, so the event triggers have no summary left to recompute
+        cursor.execute("DELETE FROM applications WHERE id = ?", (app_id,))
+        cursor.execute("DELETE FROM events WHERE application_id = ?", (app_id,))
 
 def get_events(app_id):
     """
-    Retrieve all events associated with a given application ID.
+    Retrieve all events associated with a given application ID, oldest first.
     Args:
         app_id (int): The application ID.
     Returns:
         List[Event]: A list of Event objects.
     """
-    conn = connect_db()
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT id, application_id, event_type, event_date, note FROM events WHERE application_id = ?", (app_id,))
-    rows = cursor.fetchall()
-
-    events = [Event(row[0], row[1], row[2], row[3], row[4]) for row in rows]
-    conn.close()
-    return events
+    cursor = _query(_event_factory,
+                    "SELECT id, application_id, event_type, event_date, note FROM events "
+                    "WHERE application_id = ? ORDER BY event_date, id",
+                    (app_id,))
+    return cursor.fetchall()
 
 def insert_event(app_id, event_type, event_date, note=None):
     """
@@ -164,15 +660,11 @@ def insert_event(app_id, event_type, event_date, note=None):
     Args:
         app_id (int): The application ID.
         event_type (str): The event type.
-        event_date (str): The event date.
+        event_date (str): The event date ("yyyy-MM-dd").
     """
-    conn = connect_db()
-    cursor = conn.cursor()
-
-    cursor.execute("INSERT INTO events (application_id, event_type, event_date, note) VALUES (?, ?, ?, ?)",
-                   (app_id, event_type, event_date, note))
-    conn.commit()
-    conn.close()
+    with transaction() as cursor:
+        cursor.execute("INSERT INTO events (application_id, event_type, event_date, note) VALUES (?, ?, ?, ?)",
+                       (app_id, event_type, event_date, note))
 
 def delete_event(event_id):
     """
@@ -180,103 +672,105 @@ def delete_event(event_id):
     Args:
         event_id (int): The event ID.
     """
-    conn = connect_db()
-    cursor = conn.cursor()
+    with transaction() as cursor:
+        cursor.execute("DELETE FROM events WHERE id = ?", (event_id,))
 
-    cursor.execute("DELETE FROM events WHERE id = ?", (event_id,))
-    conn.commit()
-    conn.close()
+def get_or_create_location(city):
+    """Get location ID, storing the city as a pending (not yet geocoded) location if it is new."""
+    if not city:
+        return None
+    
+    try:
+        with transaction() as cursor:
+            return _upsert_location(cursor, city)
+        
+    except Exception as e:
+        print(f"Error in get_or_create_location: {str(e)}")
+        return None
 
-def update_application_status(app_id):
+def get_pending_locations():
     """
-    Update the status of an application based on the latest event date.
-    Args:
-        app_id (int): The application ID.
+    Retrieve the cities that have not been geocoded yet.
     Returns:
-        str: The updated application status.
+        List[str]: City names whose coordinates are missing.
     """
-    conn = connect_db()
-    cursor = conn.cursor()
+    cursor = get_connection().execute(
+        "SELECT city FROM locations WHERE latitude IS NULL OR longitude IS NULL ORDER BY id")
+    return [row[0] for row in cursor.fetchall()]
 
-    # Fetch associated events
-    cursor.execute("SELECT event_type FROM events WHERE application_id = ?", (app_id,))
-    events = [event[0] for event in cursor.fetchall()]
+def set_location_coordinates(city, latitude, longitude):
+    """
+    Store the coordinates of a geocoded city.
+    Args:
+        city (str): The city name.
+        latitude (float): The latitude.
+        longitude (float): The longitude.
+    """
+    with transaction() as cursor:
+        cursor.execute("UPDATE locations SET latitude = ?, longitude = ? WHERE city = ?",
+                       (latitude, longitude, city))
 
-    # Determine new status
-    if not events:
-        new_status = c.STATUS_PENDING
-    elif "Rejection" in events:
-        new_status = c.STATUS_CLOSED
-    else:
-        new_status = c.STATUS_ACTIVE
+def set_locations_coordinates(coordinates):
+    """
+    Store the coordinates of many geocoded cities in one transaction.
+    Args:
+        coordinates (list): (city, latitude, longitude) tuples.
+    """
+    with transaction() as cursor:
+        cursor.executemany("UPDATE locations SET latitude = ?, longitude = ? WHERE city = ?",
+                           ((lat, lng, city) for city, lat, lng in coordinates))
 
-    # Update status in the database
-    cursor.execute("UPDATE applications SET status = ? WHERE id = ?", (new_status, app_id))
-    conn.commit()
-    conn.close()
-    return new_status
+def get_cached_geocode(query_key, now):
+    """
+    Look up a live geocode cache entry.
+    Args:
+        query_key (str): Normalized query (see geocoding.normalize_query).
+        now (int): Current Unix time; expired entries are ignored.
+    Returns:
+        tuple: (status, latitude, longitude), or None on a miss.
+    """
+    cursor = get_connection().execute("""
+        SELECT status, latitude, longitude FROM geocode_cache
+        WHERE query_key = ? AND (expires_at IS NULL OR expires_at > ?)
+    """, (query_key, now))
+    return cursor.fetchone()
 
-def geocode_city(city):
+def put_cached_geocode(query_key, query, status, latitude, longitude, provider, created_at, expires_at):
     """
-    Geocode city name to get coordinates using Google's Geocoding API.
-    Returns (latitude, longitude) tuple.
+    Insert or replace a geocode cache entry.
+    Args:
+        query_key (str): Normalized query.
+        query (str): Query text as it was sent to the provider.
+        status (str): "ok" or "not_found".
+        latitude (float): Latitude, None for negative entries.
+        longitude (float): Longitude, None for negative entries.
+        provider (str): Name of the provider that answered.
+        created_at (int): Unix time the answer was received.
+        expires_at (int): Unix time the entry expires, None for never.
     """
-    try:
-        # Construct the geocoding URL
-        base_url = "https://maps.googleapis.com/maps/api/geocode/json"
-        params = {
-            "address": city,
-            "key": GOOGLE_MAPS_API_KEY
-        }
-        
-        # Make the request
-        response = requests.get(base_url, params=params)
-        data = response.json()
-        
-        # Check if we got results
-        if data["status"] == "OK" and data["results"]:
-            location = data["results"][0]["geometry"]["location"]
-            return location["lat"], location["lng"]
-        else:
-            print(f"Geocoding failed for {city}: {data['status']}")
-            return None, None
-            
-    except Exception as e:
-        print(f"Error geocoding {city}: {str(e)}")
-        return None, None
+    with transaction() as cursor:
+        cursor.execute("""
+            INSERT INTO geocode_cache
+            (query_key, query, status, latitude, longitude, provider, created_at, expires_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (query_key) DO UPDATE SET
+                query = excluded.query,
+                status = excluded.status,
+                latitude = excluded.latitude,
+                longitude = excluded.longitude,
+                provider = excluded.provider,
+                created_at = excluded.created_at,
+                expires_at = excluded.expires_at
+        """, (query_key, query, status, latitude, longitude, provider, created_at, expires_at))
 
-def get_or_create_location(city):
-    """Get location ID or create new location using geocoding"""
-    if not city:
-        return None
-        
-    conn = connect_db()
-    cursor = conn.cursor()
-    
-    try:
-        # Check if location already exists
-        cursor.execute("SELECT id, latitude, longitude FROM locations WHERE city = ?", (city,))
-        result = cursor.fetchone()
-        
-        if result:
-            location_id = result[0]
-        else:
-            # Get coordinates for new city
-            lat, lng = geocode_city(city)
-            if lat is not None and lng is not None:
-                cursor.execute(
-                    "INSERT INTO locations (city, latitude, longitude) VALUES (?, ?, ?)",
-                    (city, lat, lng)
-                )
-                location_id = cursor.lastrowid
-            else:
-                location_id = None
-        
-        conn.commit()
-        return location_id
-        
-    except Exception as e:
-        print(f"Error in get_or_create_location: {str(e)}")
-        return None
-    finally:
-        conn.close()
+def purge_expired_geocodes(now):
+    """
+    Delete expired geocode cache entries.
+    Args:
+        now (int): Current Unix time.
+    Returns:
+        int: Number of entries deleted.
+    """
+    with transaction() as cursor:
+        cursor.execute("DELETE FROM geocode_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        return cursor.rowcount
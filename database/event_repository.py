@@ -0,0 +1,131 @@
+"""
+Job Application Tracker - Event Repository
+
+Caches the events of recently viewed applications so moving through the
+application table does not query the database on every selection change.
+The cache is a small LRU keyed by application ID; after every event write
+the ApplicationStore puts the expected events in the cache straight away and
+refreshes them from the database once the write has committed. Events of the
+rows around the selection are prefetched on a background thread, so the next
+arrow-key step is normally a cache hit.
+
+Classes:
+    EventRepository: LRU cache and background prefetcher for application events
+"""
+import sqlite3
+from collections import OrderedDict
+from PyQt6 import QtCore
+from database import db_helper
+
+
+class _PrefetchSignals(QtCore.QObject):
+    loaded = QtCore.pyqtSignal(int, int, object)
+
+
+class _PrefetchTask(QtCore.QRunnable):
+    # Loads the events of one application on a worker thread (which has its own SQLite connection)
+    def __init__(self, app_id, version, signals):
+        super().__init__()
+        self.app_id = app_id
+        self.version = version
+        self.signals = signals
+
+    def run(self):
+        try:
+            events = db_helper.get_events(self.app_id)
+        except sqlite3.Error as e:
+            print(f"Error prefetching events for application {self.app_id}: {e}")
+            events = None
+        self.signals.loaded.emit(self.app_id, self.version, events)
+
+
+class EventRepository(QtCore.QObject):
+    """
+    Cache of Event lists keyed by application ID, filled in the background by prefetch().
+
+    Signals:
+        events_changed (int): The cached events of this application ID were replaced
+
+    Args:
+        capacity (int): Number of applications whose events are kept
+    """
+    events_changed = QtCore.pyqtSignal(int)
+
+    def __init__(self, capacity=256, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self._cache = OrderedDict()
+        # Application ID -> version of the prefetch in flight
+        self._in_flight = {}
+        # Bumped on every invalidation so prefetches started earlier are discarded
+        self._versions = {}
+
+        # One long-lived worker so it keeps its SQLite connection between prefetches
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._pool.setExpiryTimeout(-1)
+
+        self._signals = _PrefetchSignals(self)
+        self._signals.loaded.connect(self._prefetched)
+
+    def cached(self, app_id):
+        """Return the cached events of an application, or None without querying the database."""
+        events = self._cache.get(app_id)
+        if events is not None:
+            self._cache.move_to_end(app_id)
+        return events
+
+    def prefetch(self, app_ids):
+        """Load the events of the given applications in the background unless already cached."""
+        for app_id in app_ids:
+            version = self._versions.get(app_id, 0)
+            if app_id is None or app_id in self._cache or self._in_flight.get(app_id) == version:
+                continue
+            self._in_flight[app_id] = version
+            self._pool.start(_PrefetchTask(app_id, version, self._signals))
+
+    def put(self, app_id, events):
+        """Cache the given events of an application, e.g. the expected result of a pending write."""
+        self._versions[app_id] = self._versions.get(app_id, 0) + 1
+        self._store(app_id, list(events))
+        self.events_changed.emit(app_id)
+
+    def refresh(self, app_id):
+        """Re-read the events of an application in the background if they are cached."""
+        cached = app_id in self._cache
+        self.invalidate(app_id)
+        if cached:
+            self.prefetch([app_id])
+
+    def invalidate(self, app_id):
+        """Drop the cached events of one application."""
+        self._cache.pop(app_id, None)
+        self._versions[app_id] = self._versions.get(app_id, 0) + 1
+
+    def clear(self):
+        """Drop every cached event list."""
+        for app_id in set(self._cache) | set(self._in_flight):
+            self._versions[app_id] = self._versions.get(app_id, 0) + 1
+        self._cache.clear()
+
+    def cancel(self):
+        """Drop the prefetches not started yet (used on shutdown)."""
+        self._pool.clear()
+        self._in_flight.clear()
+
+    def wait_for_done(self, msecs=-1):
+        """Block until every prefetch has finished (used on shutdown and in scripts)."""
+        return self._pool.waitForDone(msecs)
+
+    def _store(self, app_id, events):
+        self._cache[app_id] = events
+        self._cache.move_to_end(app_id)
+        while len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+
+    def _prefetched(self, app_id, version, events):
+        if self._in_flight.get(app_id) == version:
+            del self._in_flight[app_id]
+        if events is not None and version == self._versions.get(app_id, 0) and app_id not in self._cache:
+            self._store(app_id, events)
+            self.events_changed.emit(app_id)
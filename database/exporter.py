@@ -0,0 +1,226 @@
+"""
+Job Application Tracker - Export
+
+Writes the tracker's applications and their events to CSV, JSON Lines or
+iCalendar files, e.g. for nightly backups. Applications are streamed from the
+database (db_helper.iter_applications_with_events) and written one at a time,
+so memory use stays flat however large the database is.
+
+CSV and JSON Lines files use the same layout database.importer reads: CSV has
+one row per event (and one row without an event for applications that have
+none), JSON Lines one application per line with an "events" list. iCalendar
+files contain every event as an all-day calendar entry.
+
+Usage:
+    python -m database.exporter OUTPUT [--format csv|jsonl|ics] [--filter all|active|closed]
+                                [--from yyyy-MM-dd] [--to yyyy-MM-dd] [--database PATH]
+
+Key Functions:
+    write_csv(): Write applications to a CSV file, one row per event
+    write_jsonl(): Write applications to a JSON Lines file, one line per application
+    write_ics(): Write the events of applications to an iCalendar file
+    export_applications(): Export the applications matching a filter to a file
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+import constants as c
+from database import connection, db_helper
+
+CSV_FIELDS = ("company", "job_title", "application_date", "status", "location",
+              "event_type", "event_date", "note")
+# Product identifier and UID domain of iCalendar entries
+ICS_PRODUCT_ID = "-//Job Application Tracker//Export//EN"
+ICS_UID_DOMAIN = "job-application-tracker"
+
+
+def write_csv(applications, file):
+    """
+    Write applications to an open CSV file, one row per event.
+
+    Args:
+        applications: Iterable of Applications carrying their events
+        file: Text file opened with newline=""
+
+    Returns:
+        int: Number of applications written
+    """
+    writer = csv.writer(file)
+    writer.writerow(CSV_FIELDS)
+    count = 0
+    for count, app in enumerate(applications, 1):
+        row = (app.company, app.job_title, app.application_date, app.status, app.location or "")
+        if not app.events:
+            writer.writerow(row + ("", "", ""))
+        for event in app.events:
+            writer.writerow(row + (event.event_type, event.event_date, event.note or ""))
+    return count
+
+
+def _application_record(app):
+    return {
+        "company": app.company,
+        "job_title": app.job_title,
+        "application_date": app.application_date,
+        "status": app.status,
+        "location": app.location,
+        "latitude": app.latitude,
+        "longitude": app.longitude,
+        "events": [
+            {"event_type": event.event_type, "event_date": event.event_date, "note": event.note}
+            for event in app.events
+        ],
+    }
+
+
+def write_jsonl(applications, file):
+    """
+    Write applications to an open JSON Lines file, one application per line.
+
+    Args:
+        applications: Iterable of Applications carrying their events
+        file: Text file to write to
+
+    Returns:
+        int: Number of applications written
+    """
+    count = 0
+    for count, app in enumerate(applications, 1):
+        file.write(json.dumps(_application_record(app), ensure_ascii=False))
+        file.write("\n")
+    return count
+
+
+def _ics_text(value):
+    # Escape a TEXT property value (RFC 5545 section 3.3.11)
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _ics_line(line):
+    # Fold a content line into lines of at most 75 octets, continuation lines starting with a space
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def write_ics(applications, file):
+    """
+    Write the events of applications to an open iCalendar file, one all-day entry per event.
+
+    Args:
+        applications: Iterable of Applications carrying their events
+        file: Text file opened with newline="" (lines end in CRLF as iCalendar requires)
+
+    Returns:
+        int: Number of applications written
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    file.write(_ics_line("BEGIN:VCALENDAR") + _ics_line("VERSION:2.0") + _ics_line(f"PRODID:{ICS_PRODUCT_ID}"))
+    count = 0
+    for count, app in enumerate(applications, 1):
+        for event in app.events:
+            day = date.fromisoformat(event.event_date)
+            lines = [
+                "BEGIN:VEVENT",
+                f"UID:event-{event.id}@{ICS_UID_DOMAIN}",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART;VALUE=DATE:{day.strftime('%Y%m%d')}",
+                f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}",
+                f"SUMMARY:{_ics_text(f'{event.event_type}: {app.company} - {app.job_title}')}",
+            ]
+            if app.location:
+                lines.append(f"LOCATION:{_ics_text(app.location)}")
+            if event.note:
+                lines.append(f"DESCRIPTION:{_ics_text(event.note)}")
+            lines.append("END:VEVENT")
+            file.write("".join(map(_ics_line, lines)))
+    file.write(_ics_line("END:VCALENDAR"))
+    return count
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "ics": write_ics}
+
+
+def export_applications(path, file_format=None, filter_mode=c.FilterMode.ALL, date_from=None, date_to=None):
+    """
+    Export the applications matching a filter mode and date range, with their events, to a file.
+
+    Args:
+        path (str): File to write, "-" for standard output
+        file_format (str): "csv", "jsonl" or "ics"; guessed from the file extension if None
+        filter_mode (FilterMode): Which statuses to include
+        date_from (str): Earliest application date to include ("yyyy-MM-dd"), None for no limit
+        date_to (str): Latest application date to include ("yyyy-MM-dd"), None for no limit
+
+    Returns:
+        int: Number of applications exported
+    """
+    if file_format is None:
+        extension = os.path.splitext(path)[1].lower().lstrip(".")
+        file_format = {"ndjson": "jsonl", "ical": "ics"}.get(extension, extension)
+    writer = WRITERS.get(file_format)
+    if writer is None:
+        raise ValueError(f"Unsupported export format: {file_format}")
+
+    applications = db_helper.iter_applications_with_events(filter_mode, date_from, date_to)
+    start = time.perf_counter()
+    if path == "-":
+        count = writer(applications, sys.stdout)
+    else:
+        # Written under a temporary name and renamed, so a failed export never replaces a good one
+        partial = f"{path}.partial"
+        try:
+            with open(partial, "w", newline="", encoding="utf-8") as file:
+                count = writer(applications, file)
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+    elapsed = time.perf_counter() - start
+    print(f"Exported {count} applications to {path} in {elapsed:.2f}s "
+          f"({count / max(elapsed, 1e-9):.0f} rows/s)", file=sys.stderr)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export applications and events to CSV, JSONL or iCalendar.")
+    parser.add_argument("output", help='file to write, "-" for standard output')
+    parser.add_argument("--database", default=connection.DB_PATH, help=f"database file (default: {connection.DB_PATH})")
+    parser.add_argument("--format", choices=sorted(WRITERS), help="file format (default: from the file extension)")
+    parser.add_argument("--filter", choices=[mode.value for mode in c.FilterMode], default=c.FilterMode.ALL.value,
+                        help="statuses to include, as in the main window (default: all)")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="earliest application date (yyyy-MM-dd)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="latest application date (yyyy-MM-dd)")
+    args = parser.parse_args(argv)
+
+    connection.set_database_path(args.database)
+    try:
+        export_applications(args.output, args.format, c.FilterMode(args.filter),
+                            args.date_from and args.date_from.isoformat(), args.date_to and args.date_to.isoformat())
+    except (OSError, ValueError) as e:
+        print(f"Error exporting applications: {e}", file=sys.stderr)
+        return 1
+    finally:
+        connection.close_connections()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
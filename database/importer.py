@@ -0,0 +1,335 @@
+"""
+Job Application Tracker - Bulk Import
+
+Imports applications and their events from CSV or JSON Lines files, e.g. a
+job search history kept in a spreadsheet. Records stream through a generator
+pipeline (read, group, validate, batch), so memory use does not grow with the
+file. Company and location IDs come from in-memory maps seeded from the
+database once, and every batch is written in a single transaction with
+executemany.
+
+CSV files have one row per event. Consecutive rows with the same company, job
+title, application date and location are one application, and rows without
+an event type add an application with no events. JSON Lines files have one
+application per line, with its events in an "events" list:
+
+    {"company": "Acme", "job_title": "Engineer", "application_date": "2024-03-01",
+     "location": "London", "events": [{"event_type": "Interview", "event_date": "2024-03-08"}]}
+
+Dates may be "yyyy-MM-dd" or "dd/MM/yyyy". Statuses are not imported; they
+follow from the events like for applications entered in the app.
+
+Usage:
+    python -m database.importer FILE [FILE ...] [--database PATH] [--batch-size N]
+
+Classes:
+    ImportResult: Counts and timing of one import
+    BatchError: A batch could not be written and stopped the import
+
+Key Functions:
+    read_records(): Stream application records from a CSV or JSONL file
+    import_records(): Validate and insert application records in batches
+    import_file(): Import one file and report progress
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import date
+from itertools import groupby, islice
+from typing import NamedTuple
+import constants as c
+from database import connection, db_helper
+from database.migrations import MigrationError, migrate
+
+# Header spellings accepted for each field (after lowercasing and replacing spaces with underscores)
+FIELD_ALIASES = {
+    "title": "job_title",
+    "apply_date": "application_date",
+    "date_applied": "application_date",
+    "city": "location",
+    "type": "event_type",
+    "date": "event_date",
+}
+APPLICATION_KEY_FIELDS = ("company", "job_title", "application_date", "location")
+EVENT_TYPES = {event_type.lower(): event_type for event_type in c.EVENT_TYPES}
+# Rejected records printed in full; the rest are only counted
+MAX_REPORTED_REJECTS = 20
+
+
+class ImportResult(NamedTuple):
+    applications: int
+    events: int
+    rejected: int
+    seconds: float
+
+
+class BatchError(Exception):
+    """
+    A batch failed to write and was rolled back, stopping the import.
+
+    Attributes:
+        first_line (int): Line of the first record in the batch
+        last_line (int): Line of the last record in the batch
+        result (ImportResult): What was imported by the batches before it
+    """
+
+    def __init__(self, first_line, last_line, error, result):
+        lines = f"line {first_line} was" if first_line == last_line else f"lines {first_line}-{last_line} were"
+        super().__init__(f"{lines} not imported: {error}")
+        self.first_line = first_line
+        self.last_line = last_line
+        self.result = result
+
+
+class _Reject(ValueError):
+    # Raised while validating a record; the message is reported with the record's line number
+    pass
+
+
+def _field_name(header):
+    name = header.strip().lower().replace(" ", "_").replace("-", "_")
+    return FIELD_ALIASES.get(name, name)
+
+
+def _read_csv(file):
+    reader = csv.DictReader(file)
+    reader.fieldnames = [_field_name(header) for header in reader.fieldnames or ()]
+
+    def application_key(numbered_row):
+        row = numbered_row[1]
+        return tuple((row.get(field) or "").strip() for field in APPLICATION_KEY_FIELDS)
+
+    # Rows are numbered by reader.line_num, the line they end on (their only line unless a field spans lines)
+    rows = ((reader.line_num, row) for row in reader)
+    for _, group in groupby(rows, key=application_key):
+        group = list(group)
+        line, record = group[0]
+        record = dict(record)
+        record["events"] = [
+            {field: row.get(field) for field in ("event_type", "event_date", "note")}
+            for _, row in group if (row.get("event_type") or "").strip()
+        ]
+        yield line, record
+
+
+def _read_jsonl(file):
+    for line, text in enumerate(file, 1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            yield line, _Reject(f"invalid JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield line, _Reject("expected a JSON object")
+            continue
+        yield line, {_field_name(key): value for key, value in record.items()}
+
+
+def read_records(file, file_format):
+    """
+    Stream application records from an open text file.
+
+    Args:
+        file: File object opened in text mode (with newline="" for CSV)
+        file_format (str): "csv" or "jsonl"
+
+    Returns:
+        Iterator of (line number, record dict) pairs; unreadable records are
+        yielded as (line number, exception) instead
+    """
+    if file_format == "csv":
+        return _read_csv(file)
+    if file_format == "jsonl":
+        return _read_jsonl(file)
+    raise ValueError(f"Unsupported import format: {file_format}")
+
+
+def _text(record, field, required=True):
+    value = record.get(field)
+    value = str(value).strip() if value is not None else ""
+    if not value and required:
+        raise _Reject(f"missing {field}")
+    return value or None
+
+
+def _iso_date(value, field):
+    if value is None:
+        raise _Reject(f"missing {field}")
+    iso_value = value
+    # "dd/MM/yyyy" is the format the app displays, and likely what a spreadsheet holds
+    if len(value) == 10 and value[2] == "/" and value[5] == "/":
+        iso_value = f"{value[6:10]}-{value[3:5]}-{value[0:2]}"
+    try:
+        return date.fromisoformat(iso_value).isoformat()
+    except ValueError:
+        raise _Reject(f"invalid {field}: {value!r}") from None
+
+
+def _parse_event(event):
+    if not isinstance(event, dict):
+        raise _Reject("expected events to be objects")
+    event = {_field_name(key): value for key, value in event.items()}
+    event_type = _text(event, "event_type")
+    canonical = EVENT_TYPES.get(event_type.lower())
+    if canonical is None:
+        raise _Reject(f"unknown event_type: {event_type!r}")
+    return canonical, _iso_date(_text(event, "event_date"), "event_date"), _text(event, "note", required=False)
+
+
+def parse_record(record):
+    """
+    Validate one record and convert it to the tuple db_helper.insert_application_batch takes.
+
+    Args:
+        record (dict): Fields of one application, with its events under "events"
+
+    Returns:
+        tuple: (company, job_title, application_date, location, events)
+
+    Raises:
+        ValueError: If a required field is missing or invalid
+    """
+    events = record.get("events") or ()
+    if not isinstance(events, (list, tuple)):
+        raise _Reject("expected events to be a list")
+    return (
+        _text(record, "company"),
+        _text(record, "job_title"),
+        _iso_date(_text(record, "application_date"), "application_date"),
+        _text(record, "location", required=False),
+        # Oldest first, like events added one by one in the app
+        tuple(sorted((_parse_event(event) for event in events), key=lambda event: event[1])),
+    )
+
+
+def _validated(records, rejects):
+    # Yield (line, parsed application) pairs, appending (line, reason) to rejects for the rest
+    for line, record in records:
+        try:
+            if isinstance(record, Exception):
+                raise record
+            yield line, parse_record(record)
+        except _Reject as e:
+            rejects.append((line, str(e)))
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def import_records(records, batch_size=5000, progress=None):
+    """
+    Validate records and insert them, batch_size applications per transaction.
+
+    A failing batch is rolled back and stops the import; batches written
+    before it stay imported.
+
+    Args:
+        records: Iterable of (line number, record dict) pairs, e.g. from read_records()
+        batch_size (int): Applications written per transaction
+        progress: Called as progress(applications, events, rejected, seconds) after every batch
+
+    Returns:
+        tuple: (ImportResult, list of (line number, reason) for rejected records)
+
+    Raises:
+        BatchError: If a batch cannot be written, e.g. a company name taken since the import started
+    """
+    company_ids = db_helper.get_company_ids()
+    location_ids = db_helper.get_location_ids()
+    rejects = []
+    applications = events = 0
+
+    start = time.perf_counter()
+    for batch in _batches(_validated(records, rejects), batch_size):
+        try:
+            inserted_applications, inserted_events = db_helper.insert_application_batch(
+                [application for _, application in batch], company_ids, location_ids)
+        except sqlite3.Error as e:
+            result = ImportResult(applications, events, len(rejects), time.perf_counter() - start)
+            raise BatchError(batch[0][0], batch[-1][0], e, result) from e
+        applications += inserted_applications
+        events += inserted_events
+        if progress is not None:
+            progress(applications, events, len(rejects), time.perf_counter() - start)
+
+    return ImportResult(applications, events, len(rejects), time.perf_counter() - start), rejects
+
+
+def _print_progress(applications, events, rejected, seconds):
+    print(f"{applications} applications, {events} events imported, {rejected} rejected "
+          f"({applications / max(seconds, 1e-9):.0f} rows/s)")
+
+
+def import_file(path, file_format=None, batch_size=5000):
+    """
+    Import a CSV or JSONL file, printing progress and rejected records.
+
+    Args:
+        path (str): File to import
+        file_format (str): "csv" or "jsonl"; guessed from the file extension if None
+        batch_size (int): Applications written per transaction
+
+    Returns:
+        ImportResult: What was imported and how long it took
+
+    Raises:
+        BatchError: If a batch cannot be written; the batches before it stay imported
+    """
+    if file_format is None:
+        extension = os.path.splitext(path)[1].lower()
+        file_format = "jsonl" if extension in (".jsonl", ".ndjson") else "csv"
+
+    print(f"Importing {path}")
+    with open(path, newline="" if file_format == "csv" else None, encoding="utf-8-sig") as file:
+        try:
+            result, rejects = import_records(read_records(file, file_format), batch_size, _print_progress)
+        except BatchError as e:
+            print(f"Import of {path} stopped, {e}")
+            print(f"Imported {e.result.applications} applications and {e.result.events} events before that")
+            raise
+
+    for line, reason in rejects[:MAX_REPORTED_REJECTS]:
+        print(f"Rejected line {line}: {reason}")
+    if len(rejects) > MAX_REPORTED_REJECTS:
+        print(f"... and {len(rejects) - MAX_REPORTED_REJECTS} more rejected records")
+    print(f"Imported {result.applications} applications and {result.events} events in {result.seconds:.2f}s "
+          f"({result.applications / max(result.seconds, 1e-9):.0f} rows/s), {result.rejected} rejected")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import applications and events from CSV or JSONL files.")
+    parser.add_argument("files", nargs="+", help="CSV or JSONL files to import")
+    parser.add_argument("--database", default=connection.DB_PATH, help=f"database file (default: {connection.DB_PATH})")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="file format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="applications written per transaction (default: 5000)")
+    args = parser.parse_args(argv)
+
+    try:
+        migrate(args.database)
+    except MigrationError as e:
+        print(f"Could not upgrade the database {args.database}: {e}")
+        return 1
+    connection.set_database_path(args.database)
+    rejected = 0
+    try:
+        for path in args.files:
+            rejected += import_file(path, args.format, args.batch_size).rejected
+    except BatchError:
+        return 1
+    finally:
+        connection.close_connections()
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,401 @@
+"""
+Job Application Tracker - Schema Migrations
+
+This module upgrades the database schema to the latest version. The schema
+version is stored in SQLite's PRAGMA user_version, so an up-to-date database
+costs a single integer read at startup.
+
+Each entry in MIGRATIONS is a (version, description, step) tuple, where step is
+either an SQL script or a function taking a cursor. Pending migrations run in
+version order, each inside its own transaction together with the user_version
+bump, so a failed step leaves the database at the last good version.
+
+Usage:
+    python -m database.migrations [--db PATH] [--dry-run]
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+
+DEFAULT_DB_PATH = os.path.join("Data", "job_tracker.db")
+
+
+class MigrationError(Exception):
+    """A migration step failed; the database was left at the last version that applied."""
+
+
+def _table_exists(cursor, name):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+    return cursor.fetchone() is not None
+
+
+def _add_locations(cursor):
+    # Databases upgraded by the old ad-hoc schema check already have the table
+    if _table_exists(cursor, "locations"):
+        return
+    cursor.execute("""
+        CREATE TABLE locations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            city TEXT UNIQUE NOT NULL,
+            latitude REAL,
+            longitude REAL
+        )
+    """)
+    cursor.execute("""
+        ALTER TABLE applications
+        ADD COLUMN location_id INTEGER
+        REFERENCES locations(id)
+    """)
+
+
+def _unique_company_names(cursor):
+    # Merge companies sharing a name into the one with the lowest ID before the name becomes unique
+    cursor.execute("""
+        UPDATE applications
+        SET company_id = (SELECT min(keep.id) FROM companies keep JOIN companies dup ON dup.name = keep.name
+                          WHERE dup.id = applications.company_id)
+        WHERE company_id IN (SELECT id FROM companies
+                             WHERE id > (SELECT min(id) FROM companies first WHERE first.name = companies.name))
+    """)
+    cursor.execute("""
+        DELETE FROM companies
+        WHERE id > (SELECT min(id) FROM companies first WHERE first.name = companies.name)
+    """)
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_companies_name ON companies(name)")
+
+
+def _search_reindex(where):
+    # Rebuild the search rows of every application matching `where` (an expression on alias a)
+    return f"""
+        DELETE FROM application_search WHERE rowid IN (SELECT a.id FROM applications a WHERE {where});
+        INSERT INTO application_search (rowid, company, job_title, location, notes)
+        SELECT a.id, c.name, a.job_title, l.city,
+               (SELECT group_concat(e.note, ' ') FROM events e WHERE e.application_id = a.id)
+        FROM applications a
+        JOIN companies c ON c.id = a.company_id
+        LEFT JOIN locations l ON l.id = a.location_id
+        WHERE {where};
+    """
+
+
+def _add_search_index(cursor):
+    cursor.execute("""
+        CREATE VIRTUAL TABLE application_search USING fts5(
+            company, job_title, location, notes,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    triggers = {
+        "search_applications_ai": ("AFTER INSERT ON applications", _search_reindex("a.id = new.id")),
+        "search_applications_au": (
+            "AFTER UPDATE OF company_id, job_title, location_id ON applications",
+            "DELETE FROM application_search WHERE rowid = old.id;" + _search_reindex("a.id = new.id")),
+        "search_applications_ad": (
+            "AFTER DELETE ON applications", "DELETE FROM application_search WHERE rowid = old.id;"),
+        "search_companies_au": ("AFTER UPDATE OF name ON companies", _search_reindex("a.company_id = new.id")),
+        "search_locations_au": ("AFTER UPDATE OF city ON locations", _search_reindex("a.location_id = new.id")),
+        "search_events_ai": ("AFTER INSERT ON events", _search_reindex("a.id = new.application_id")),
+        "search_events_au": (
+            "AFTER UPDATE OF application_id, note ON events",
+            _search_reindex("a.id IN (old.application_id, new.application_id)")),
+        "search_events_ad": ("AFTER DELETE ON events", _search_reindex("a.id = old.application_id")),
+    }
+    for name, (timing, body) in triggers.items():
+        cursor.execute(f"CREATE TRIGGER {name} {timing} BEGIN {body} END")
+
+    # Backfill existing applications
+    for statement in _statements(_search_reindex("1")):
+        cursor.execute(statement)
+
+
+def _add_geocode_cache(cursor):
+    cursor.execute("""
+        CREATE TABLE geocode_cache (
+            query_key TEXT PRIMARY KEY,
+            query TEXT NOT NULL,
+            status TEXT NOT NULL,
+            latitude REAL,
+            longitude REAL,
+            provider TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            expires_at INTEGER
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX idx_geocode_cache_expires_at ON geocode_cache(expires_at)")
+
+    # Seed the cache with every location geocoded so far
+    from geocoding.normalize import normalize_query
+    now = int(time.time())
+    cursor.execute("SELECT city, latitude, longitude FROM locations WHERE latitude IS NOT NULL AND longitude IS NOT NULL")
+    rows = [(normalize_query(city), city, lat, lng, now) for city, lat, lng in cursor.fetchall()]
+    cursor.executemany("""
+        INSERT OR IGNORE INTO geocode_cache
+        (query_key, query, status, latitude, longitude, provider, created_at, expires_at)
+        VALUES (?, ?, 'ok', ?, ?, 'google', ?, NULL)
+    """, [row for row in rows if row[0]])
+
+
+def _event_date_key(column):
+    # "dd/MM/yyyy" event dates as a sortable "yyyyMMdd" string
+    return f"substr({column}, 7, 4) || substr({column}, 4, 2) || substr({column}, 1, 2)"
+
+
+def _iso_date_key(column):
+    # ISO dates already sort correctly
+    return column
+
+
+def _event_summary_refresh(app_id, where=None, date_key=_event_date_key):
+    # Recompute the event summary of the application app_id (an SQL expression) from its events.
+    # Status rules: no events -> Pending, any Rejection -> Closed, otherwise Active.
+    where = where or f"id = {app_id}"
+    return f"""
+        UPDATE applications SET
+            event_count = (SELECT COUNT(*) FROM events WHERE application_id = {app_id}),
+            status = CASE
+                WHEN NOT EXISTS (SELECT 1 FROM events WHERE application_id = {app_id}) THEN 'Pending'
+                WHEN EXISTS (SELECT 1 FROM events WHERE application_id = {app_id} AND event_type = 'Rejection')
+                    THEN 'Closed'
+                ELSE 'Active'
+            END,
+            (last_event_type, last_event_date) = (
+                SELECT event_type, event_date FROM events WHERE application_id = {app_id}
+                ORDER BY {date_key("event_date")} DESC, id DESC LIMIT 1
+            )
+        WHERE {where};
+    """
+
+
+def _create_event_summary_triggers(cursor, date_key):
+    new_is_latest = f"last_event_date IS NULL OR {date_key('new.event_date')} >= {date_key('last_event_date')}"
+    triggers = {
+        # Inserts are the common case and can be applied incrementally
+        "event_summary_ai": ("AFTER INSERT ON events", f"""
+            UPDATE applications SET
+                event_count = event_count + 1,
+                status = CASE
+                    WHEN new.event_type = 'Rejection' OR (status = 'Closed' AND event_count > 0) THEN 'Closed'
+                    ELSE 'Active'
+                END,
+                last_event_type = CASE WHEN {new_is_latest} THEN new.event_type ELSE last_event_type END,
+                last_event_date = CASE WHEN {new_is_latest} THEN new.event_date ELSE last_event_date END
+            WHERE id = new.application_id;
+        """),
+        "event_summary_au": (
+            "AFTER UPDATE OF application_id, event_type, event_date ON events",
+            _event_summary_refresh("old.application_id", date_key=date_key)
+            + _event_summary_refresh("new.application_id", date_key=date_key)),
+        "event_summary_ad": (
+            "AFTER DELETE ON events", _event_summary_refresh("old.application_id", date_key=date_key)),
+    }
+    for name, (timing, body) in triggers.items():
+        cursor.execute(f"CREATE TRIGGER {name} {timing} BEGIN {body} END")
+
+
+def _add_event_summary(cursor):
+    cursor.execute("ALTER TABLE applications ADD COLUMN event_count INTEGER NOT NULL DEFAULT 0")
+    cursor.execute("ALTER TABLE applications ADD COLUMN last_event_type TEXT")
+    cursor.execute("ALTER TABLE applications ADD COLUMN last_event_date TEXT")
+    _create_event_summary_triggers(cursor, _event_date_key)
+
+    # Backfill existing applications
+    cursor.execute(_event_summary_refresh("applications.id", where="1"))
+
+
+# Rows converted per UPDATE when rewriting dates
+DATE_BATCH_SIZE = 5000
+
+
+def _convert_dates(cursor, table, column):
+    # Rewrite "dd/MM/yyyy" values as "yyyy-MM-dd", one rowid range at a time
+    cursor.execute(f"SELECT max(rowid) FROM {table}")
+    last = cursor.fetchone()[0] or 0
+    for start in range(0, last + 1, DATE_BATCH_SIZE):
+        cursor.execute(f"""
+            UPDATE {table}
+            SET {column} = substr({column}, 7, 4) || '-' || substr({column}, 4, 2) || '-' || substr({column}, 1, 2)
+            WHERE rowid BETWEEN ? AND ?
+              AND {column} GLOB '[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]'
+        """, (start, start + DATE_BATCH_SIZE - 1))
+
+
+def _iso_dates(cursor):
+    # The summary triggers compare dd/MM/yyyy keys; drop them so the rewrite does not fire them per row
+    for name in ("event_summary_ai", "event_summary_au", "event_summary_ad"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    _convert_dates(cursor, "applications", "application_date")
+    _convert_dates(cursor, "applications", "last_event_date")
+    _convert_dates(cursor, "events", "event_date")
+    _create_event_summary_triggers(cursor, _iso_date_key)
+
+    cursor.execute("CREATE INDEX idx_applications_application_date ON applications(application_date)")
+    # Serves per-application lookups as well as returning each application's events in date order
+    cursor.execute("DROP INDEX IF EXISTS idx_events_application_id")
+    cursor.execute("CREATE INDEX idx_events_application_date ON events(application_id, event_date)")
+
+
+MIGRATIONS = [
+    (1, "Add locations table and applications.location_id", _add_locations),
+    (2, "Unique index on company names", _unique_company_names),
+    (3, "Indexes for event, company, location and status lookups", """
+        CREATE INDEX IF NOT EXISTS idx_events_application_id ON events(application_id);
+        CREATE INDEX IF NOT EXISTS idx_applications_company_id ON applications(company_id);
+        CREATE INDEX IF NOT EXISTS idx_applications_location_id ON applications(location_id);
+        CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status);
+    """),
+    (4, "Full-text search index over companies, job titles, locations and event notes", _add_search_index),
+    (5, "Geocode cache keyed by normalized query", _add_geocode_cache),
+    (6, "Event count, last event and status maintained by triggers on events", _add_event_summary),
+    (7, "ISO 8601 application and event dates, indexed", _iso_dates),
+    (8, "Composite indexes for sorting the application table", """
+        DROP INDEX IF EXISTS idx_applications_status;
+        CREATE INDEX idx_applications_status_date ON applications(status, application_date);
+        CREATE INDEX idx_applications_job_title ON applications(job_title COLLATE NOCASE);
+        CREATE INDEX idx_applications_event_count ON applications(event_count);
+    """),
+    (9, "Index for finding applications by event type", """
+        CREATE INDEX idx_events_type ON events(event_type, application_id);
+    """),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """
+    Read the schema version of an open database.
+
+    Args:
+        conn (sqlite3.Connection): Open database connection
+
+    Returns:
+        int: The current PRAGMA user_version
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(version):
+    """
+    List the migrations newer than the given schema version.
+
+    Args:
+        version (int): Current schema version
+
+    Returns:
+        list: (version, description, step) tuples in the order they will run
+    """
+    return [migration for migration in MIGRATIONS if migration[0] > version]
+
+
+def _statements(script):
+    # Split on ";" but keep trigger bodies, which contain ";" themselves, whole
+    buffer = ""
+    for part in script.split(";"):
+        buffer += part + ";"
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip(" \t\n;"):
+                yield buffer
+            buffer = ""
+
+
+def _apply(cursor, version, step):
+    if callable(step):
+        step(cursor)
+    else:
+        for statement in _statements(step):
+            cursor.execute(statement)
+    cursor.execute(f"PRAGMA user_version = {int(version)}")
+
+
+def migrate(db_path=DEFAULT_DB_PATH, dry_run=False):
+    """
+    Upgrade the database at db_path to LATEST_VERSION.
+
+    With dry_run, every pending migration is executed inside one transaction
+    that is rolled back afterwards, so the report shows exactly what would be
+    applied and whether it succeeds without touching the file.
+
+    Args:
+        db_path (str): Path to the database file
+        dry_run (bool): Report pending migrations instead of applying them
+
+    Returns:
+        list: (version, description) tuples that were applied (or would be)
+
+    Raises:
+        MigrationError: If a migration fails; the ones before it stay applied
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    applied = []
+    try:
+        current = get_schema_version(conn)
+        pending = pending_migrations(current)
+        if not pending:
+            return applied
+
+        cursor = conn.cursor()
+        if dry_run:
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                for version, description, step in pending:
+                    _apply(cursor, version, step)
+                    applied.append((version, description))
+            finally:
+                conn.rollback()
+            return applied
+
+        for version, description, step in pending:
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                _apply(cursor, version, step)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise MigrationError(f"Migration {version} ({description}) failed: {e}") from e
+            applied.append((version, description))
+            print(f"Database schema migrated to version {version}: {description}")
+        return applied
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Upgrade the job tracker database schema.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to the database file")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Show pending migrations and check they apply, without changing the file")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Database not found: {args.db}")
+        return 1
+
+    conn = sqlite3.connect(args.db)
+    try:
+        current = get_schema_version(conn)
+    finally:
+        conn.close()
+
+    print(f"Schema version: {current} (latest: {LATEST_VERSION})")
+    if current >= LATEST_VERSION:
+        print("Nothing to do.")
+        return 0
+
+    try:
+        applied = migrate(args.db, dry_run=args.dry_run)
+    except Exception as e:
+        print(f"Dry run failed: {e}" if args.dry_run else str(e))
+        return 1
+
+    if args.dry_run:
+        for version, description in applied:
+            print(f"  Would apply {version}: {description}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
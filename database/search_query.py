@@ -0,0 +1,255 @@
+"""
+Job Application Tracker - Search Query Language
+
+Parses what is typed into the search box into a small syntax tree, which
+db_helper.compile_search_query turns into a parameterized SQL condition.
+
+Syntax:
+    backend engineer        Both words, as prefixes, anywhere (company, job title, location, notes)
+    "backend engineer"      The phrase, anywhere
+    company:acme            Company name contains a word starting with "acme"
+    title:engineer          Job title (also job:)
+    city:berlin             Location (also location:)
+    note:recruiter          Event notes (also notes:)
+    status:active           Status is Pending, Active or Closed
+    after:2024-01-01        Applied on or after the date
+    before:2024-07-01       Applied before the date
+    has:interview           Has an event of this type, or has:location / has:events
+    -term                   Negation
+    a OR b                  Either; terms next to each other must all match
+    (a OR b) c              Grouping
+
+Values with spaces are quoted: company:"big corp". A word whose prefix is not
+a known field (e.g. "c++:") is searched as plain text.
+
+Classes:
+    Term: A single condition
+    Not, And, Or: Combinations of conditions
+    QuerySyntaxError: Raised for queries that cannot be parsed
+
+Key Functions:
+    parse_query(): Parse search box text into a syntax tree
+    is_plain(): Whether a query is nothing but bare words
+"""
+import re
+from datetime import date
+from typing import NamedTuple
+import constants as c
+
+# Field names typed by the user -> canonical field
+FIELD_ALIASES = {
+    "company": "company",
+    "title": "job_title",
+    "job": "job_title",
+    "city": "location",
+    "location": "location",
+    "note": "notes",
+    "notes": "notes",
+    "status": "status",
+    "after": "after",
+    "before": "before",
+    "has": "has",
+}
+# Fields matched through the full-text index (the columns of application_search)
+TEXT_FIELDS = ("company", "job_title", "location", "notes")
+STATUSES = {status.lower(): status for status in (c.STATUS_PENDING, c.STATUS_ACTIVE, c.STATUS_CLOSED)}
+# has: values besides the event types
+HAS_VALUES = ("location", "events")
+
+TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<lparen>\() |
+        (?P<rparen>\)) |
+        (?P<minus>-)(?=[^\s)-]) |
+        (?P<field>[A-Za-z]+):(?P<value>"[^"]*"?|[^\s()"]*) |
+        (?P<phrase>"[^"]*"?) |
+        (?P<word>[^\s()"]+)
+    )""", re.VERBOSE)
+
+
+class QuerySyntaxError(ValueError):
+    """A search query that cannot be parsed, e.g. an unknown status or an invalid date."""
+
+
+class Term(NamedTuple):
+    """
+    A single condition.
+
+    field is None for text searched in every column, one of TEXT_FIELDS,
+    or "status", "after", "before" or "has". For text, value is the tuple of
+    words (matched as a phrase, the last word as a prefix); otherwise it is the
+    normalized value (status name, ISO date, event type).
+    """
+    field: str
+    value: object
+
+
+class Not(NamedTuple):
+    child: object
+
+
+class And(NamedTuple):
+    children: tuple
+
+
+class Or(NamedTuple):
+    children: tuple
+
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        position = match.end()
+        kind = match.lastgroup
+        if kind == "value":
+            tokens.append(("field", match.group("field"), _unquote(match.group("value"))))
+        else:
+            token = match.group(kind)
+            if kind == "phrase":
+                token = _unquote(token)
+            elif kind == "word" and token in ("OR", "AND"):
+                kind = token
+            tokens.append((kind, token, None))
+    return tokens
+
+
+def _unquote(value):
+    # A missing closing quote is tolerated, the user may still be typing
+    if value.startswith('"'):
+        value = value[1:]
+        if value.endswith('"'):
+            value = value[:-1]
+    return value
+
+
+def _words(text):
+    return re.findall(r"\w+", text)
+
+
+class _Parser:
+    # Recursive descent: or_expr := and_expr ("OR" and_expr)*, and_expr := unary+, unary := "-"* atom
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def next(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        node = self.or_expr()
+        if self.peek() is not None:
+            raise QuerySyntaxError('Unmatched ")" in search')
+        return node
+
+    def or_expr(self):
+        children = [self.and_expr()]
+        while self.peek() == "OR":
+            self.next()
+            children.append(self.and_expr())
+        return _combine(Or, children)
+
+    def and_expr(self):
+        children = []
+        while self.peek() not in (None, "OR", "rparen"):
+            if self.peek() == "AND":
+                self.next()
+                continue
+            children.append(self.unary())
+        return _combine(And, children)
+
+    def unary(self):
+        if self.peek() == "minus":
+            self.next()
+            child = self.unary()
+            return None if child is None else Not(child)
+        return self.atom()
+
+    def atom(self):
+        kind, token, value = self.next()
+        if kind == "lparen":
+            node = self.or_expr()
+            # A missing ")" at the end is tolerated, the user may still be typing
+            if self.peek() == "rparen":
+                self.next()
+            return node
+        if kind == "rparen":
+            raise QuerySyntaxError('Unmatched ")" in search')
+        if kind == "field":
+            field = FIELD_ALIASES.get(token.lower())
+            if field is None:
+                return _text_term(f"{token}:{value}")
+            return _field_term(field, token, value)
+        return _text_term(token)
+
+
+def _combine(node_type, children):
+    children = [child for child in children if child is not None]
+    if not children:
+        return None
+    if len(children) == 1:
+        return children[0]
+    return node_type(tuple(children))
+
+
+def _text_term(text, field=None):
+    words = _words(text)
+    return Term(field, tuple(words)) if words else None
+
+
+def _field_term(field, name, value):
+    value = value.strip()
+    if not value:
+        # Nothing typed after the colon yet
+        return None
+    if field in TEXT_FIELDS:
+        return _text_term(value, field)
+    if field == "status":
+        status = STATUSES.get(value.lower())
+        if status is None:
+            raise QuerySyntaxError(f"Unknown status {value!r}; use {', '.join(STATUSES)}")
+        return Term(field, status)
+    if field in ("after", "before"):
+        try:
+            return Term(field, date.fromisoformat(value).isoformat())
+        except ValueError:
+            raise QuerySyntaxError(f"{name}: needs a date as yyyy-MM-dd, not {value!r}") from None
+    # has:
+    event_types = {event_type.lower(): event_type for event_type in c.EVENT_TYPES}
+    if value.lower() in event_types:
+        return Term(field, event_types[value.lower()])
+    if value.lower() in HAS_VALUES:
+        return Term(field, value.lower())
+    raise QuerySyntaxError(f"Unknown has: value {value!r}; use {', '.join([*event_types, *HAS_VALUES])}")
+
+
+def parse_query(text):
+    """
+    Parse search box text into a syntax tree.
+
+    Args:
+        text (str): The query as typed
+
+    Returns:
+        Term, Not, And or Or: Root of the tree, or None if the text has nothing to search for
+
+    Raises:
+        QuerySyntaxError: If the text cannot be parsed
+    """
+    return _Parser(_tokenize(text)).parse()
+
+
+def is_plain(node):
+    """Return whether a parsed query is only bare words, with no fields, phrases or operators."""
+    if isinstance(node, Term):
+        return node.field is None and len(node.value) == 1
+    if isinstance(node, And):
+        return all(is_plain(child) for child in node.children)
+    return node is None
@@ -2,6 +2,8 @@ from PyQt6.QtWidgets import QDialog, QMessageBox, QCompleter
 from PyQt6 import QtCore
 from UI.edit_dialog import Ui_editDetailsPopup
 from database import db_helper
+from geocoding.gazetteer import get_gazetteer
+from helpers.date_helper import to_qdate
 
 class EditDetailsPopup(QDialog, Ui_editDetailsPopup):
     def __init__(self, app=None, mode="edit"):
@@ -15,10 +17,20 @@ class EditDetailsPopup(QDialog, Ui_editDetailsPopup):
         completer.setFilterMode(QtCore.Qt.MatchFlag.MatchContains)  # Match anywhere in the string
         self.companyLineEdit.setCompleter(completer)
 
+        # Set up location autocomplete from the offline gazetteer, if one has been built
+        self.gazetteer = get_gazetteer()
+        if self.gazetteer is not None:
+            self.location_suggestions = QtCore.QStringListModel(self)
+            location_completer = QCompleter(self.location_suggestions, self)
+            # Suggestions are already matched (accent-insensitively) and ranked by the gazetteer
+            location_completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+            self.locationLineEdit.setCompleter(location_completer)
+            self.locationLineEdit.textEdited.connect(self.suggest_locations)
+
         if mode == "edit" and app:
             self.companyLineEdit.setText(app.company)
             self.jobTitleLineEdit.setText(app.job_title)
-            self.applyDateDateEdit.setDate(QtCore.QDate.fromString(app.application_date, "dd/MM/yyyy"))
+            self.applyDateDateEdit.setDate(to_qdate(app.application_date))
             self.locationLineEdit.setText(app.location if app.location else "")
         else:
             self.companyLineEdit.setText("")
@@ -34,6 +46,12 @@ class EditDetailsPopup(QDialog, Ui_editDetailsPopup):
         self.saveButton.clicked.connect(self.accept_changes)
         self.cancelButton.clicked.connect(self.reject)
 
+    def suggest_locations(self, text):
+        suggestions = self.gazetteer.complete(text) if len(text.strip()) >= 2 else []
+        self.location_suggestions.setStringList(suggestions)
+        if suggestions:
+            self.locationLineEdit.completer().complete()
+
     def accept_changes(self):
         company_name = self.companyLineEdit.text().strip()
         job_title = self.jobTitleLineEdit.text().strip()
@@ -4,13 +4,15 @@ from PyQt6.QtCore import QUrl
 from UI.map_dialog import Ui_mapDialog
 import json
 from constants import STATUS_PENDING, STATUS_ACTIVE, STATUS_CLOSED
+from helpers.date_helper import display_date
 from config import GOOGLE_MAPS_API_KEY
 import math
 
 class MapDialog(QDialog, Ui_mapDialog):
-    def __init__(self, applications):
+    def __init__(self, applications, store=None):
         super().__init__()
         self.setupUi(self)
+        self._shown_ids = {app.id for app in applications if app.latitude and app.longitude}
         
         # Create web view and set size before loading content
         self.web_view = QWebEngineView()
@@ -21,6 +23,27 @@ class MapDialog(QDialog, Ui_mapDialog):
         html = self.create_map_html(applications)
         self.web_view.setHtml(html)
 
+        # Add markers for locations that finish geocoding while the map is open
+        if store is not None:
+            store.application_changed.connect(self.application_changed)
+            self.finished.connect(lambda: store.application_changed.disconnect(self.application_changed))
+
+    def application_changed(self, app):
+        """Add a marker for an application whose coordinates just arrived."""
+        if app.id in self._shown_ids or app.status == STATUS_CLOSED:
+            return
+        if not (app.location and app.latitude and app.longitude):
+            return
+        self._shown_ids.add(app.id)
+        marker = {
+            'lat': app.latitude,
+            'lng': app.longitude,
+            'title': app.company,
+            'color': self.get_status_color(app.status),
+            'info': self.create_info_window_content(app),
+        }
+        self.web_view.page().runJavaScript(f"addMarker({json.dumps(marker)});")
+
     def create_map_html(self, applications):
         """
         Create the HTML content for the map display.
@@ -78,7 +101,7 @@ class MapDialog(QDialog, Ui_mapDialog):
                             <p style='margin: 4px 0'><b>Job:</b> {app.job_title}</p>
                             <p style='margin: 4px 0'><b>Location:</b> {app.location}</p>
                             <p style='margin: 4px 0'><b>Status:</b> {app.status}</p>
-                            <p style='margin: 4px 0'><b>Applied:</b> {app.application_date}</p>
+                            <p style='margin: 4px 0'><b>Applied:</b> {display_date(app.application_date)}</p>
                         </div>
                     """
                 })
@@ -120,6 +143,39 @@ class MapDialog(QDialog, Ui_mapDialog):
                         }});
                     }}
                     
+                    function createMarker(marker) {{
+                        const mapMarker = new google.maps.Marker({{
+                            position: new google.maps.LatLng(marker.lat, marker.lng),
+                            map: map,
+                            title: marker.title,
+                            icon: {{
+                                path: google.maps.SymbolPath.CIRCLE,
+                                scale: 8,
+                                fillColor: marker.color,
+                                fillOpacity: 0.8,
+                                strokeWeight: 1
+                            }}
+                        }});
+                        
+                        activeMarkers.push(mapMarker);
+                        
+                        const infoWindow = new google.maps.InfoWindow({{
+                            content: marker.info
+                        }});
+                        
+                        mapMarker.addListener('click', () => {{
+                            infoWindow.open(map, mapMarker);
+                        }});
+                    }}
+                    
+                    // Called from Python when a location finishes geocoding
+                    function addMarker(marker) {{
+                        markers.push(marker);
+                        if (map) {{
+                            createMarker(marker);
+                        }}
+                    }}
+                    
                     function initMap() {{
                         map = new google.maps.Map(document.getElementById('map'));
                         const bounds = new google.maps.LatLngBounds(
@@ -127,30 +183,7 @@ class MapDialog(QDialog, Ui_mapDialog):
                             new google.maps.LatLng(mapBounds.north, mapBounds.east)
                         );
                         
-                        markers.forEach((marker, i) => {{
-                            const mapMarker = new google.maps.Marker({{
-                                position: new google.maps.LatLng(marker.lat, marker.lng),
-                                map: map,
-                                title: marker.title,
-                                icon: {{
-                                    path: google.maps.SymbolPath.CIRCLE,
-                                    scale: 8,
-                                    fillColor: marker.color,
-                                    fillOpacity: 0.8,
-                                    strokeWeight: 1
-                                }}
-                            }});
-                            
-                            activeMarkers.push(mapMarker);
-                            
-                            const infoWindow = new google.maps.InfoWindow({{
-                                content: marker.info
-                            }});
-                            
-                            mapMarker.addListener('click', () => {{
-                                infoWindow.open(map, mapMarker);
-                            }});
-                        }});
+                        markers.forEach(createMarker);
                         
                         map.fitBounds(bounds);
                         
@@ -195,6 +228,6 @@ class MapDialog(QDialog, Ui_mapDialog):
                 <p style='margin: 4px 0'><b>Job:</b> {app.job_title}</p>
                 <p style='margin: 4px 0'><b>Location:</b> {app.location}</p>
                 <p style='margin: 4px 0'><b>Status:</b> {app.status}</p>
-                <p style='margin: 4px 0'><b>Applied:</b> {app.application_date}</p>
+                <p style='margin: 4px 0'><b>Applied:</b> {display_date(app.application_date)}</p>
             </div>
         """
@@ -0,0 +1,3 @@
+from .providers import (GeocodingError, GoogleGeocoder, FallbackGeocoder, geocode_with_retry,
+                        get_default_geocoder, set_default_geocoder)
+from .normalize import normalize_query
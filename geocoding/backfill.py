@@ -0,0 +1,168 @@
+"""
+Job Application Tracker - Geocoding Backfill
+
+Resolves every location still missing coordinates in one run, e.g. after a
+long offline stretch or an API outage left many cities pending. Cities are
+geocoded concurrently over one keep-alive HTTP session, throttled by a shared
+rate limit, and the results are written back in batched transactions.
+
+Usage:
+    python -m geocoding.backfill [--database PATH] [--workers N] [--rate N]
+
+Classes:
+    RateLimiter: Thread-safe wrapper around a ratelim limiter
+
+Key Functions:
+    backfill_locations(): Geocode all pending locations and store their coordinates
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import ratelim
+import requests
+from requests.adapters import HTTPAdapter
+from database import connection, db_helper
+from geocoding.cache import CachedGeocoder
+from geocoding.gazetteer import get_gazetteer
+from geocoding.providers import FallbackGeocoder, GoogleGeocoder, geocode_with_retry
+
+
+class RateLimiter:
+    """
+    Allows at most max_calls calls per period across all threads.
+
+    ratelim keeps its counters unlocked, so ticks are serialized here; only
+    the (cheap) tick is under the lock, not the request it guards.
+
+    Args:
+        max_calls (int): Calls allowed per period
+        period (float): Length of the period in seconds
+    """
+
+    def __init__(self, max_calls, period=1):
+        self._lock = threading.Lock()
+        self._tick = ratelim.greedy(max_calls, period)(lambda: None)
+
+    def wait(self):
+        """Block until another call is allowed."""
+        with self._lock:
+            self._tick()
+
+
+class _RateLimitedGeocoder:
+    # Waits for the rate limiter before every request to the wrapped provider
+    def __init__(self, provider, limiter):
+        self.provider = provider
+        self.name = provider.name
+        self.limiter = limiter
+
+    def geocode(self, city):
+        self.limiter.wait()
+        return self.provider.geocode(city)
+
+
+def build_backfill_geocoder(workers, rate):
+    """
+    Build the geocoder chain used for backfills.
+
+    The Google provider shares one session whose connection pool has a slot
+    per worker, so every worker keeps its connection alive between requests.
+    Only requests that reach the API are rate limited; cache and gazetteer
+    hits are not.
+
+    Args:
+        workers (int): Number of concurrent workers
+        rate (int): Maximum API requests per second
+
+    Returns:
+        CachedGeocoder: Cache, then gazetteer, then rate-limited Google
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    provider = _RateLimitedGeocoder(GoogleGeocoder(session=session), RateLimiter(rate))
+    gazetteer = get_gazetteer()
+    if gazetteer is not None:
+        provider = FallbackGeocoder([gazetteer, provider])
+    return CachedGeocoder(provider)
+
+
+def backfill_locations(geocoder=None, workers=8, rate=25, batch_size=100, attempts=3, backoff=1.0):
+    """
+    Geocode every location without coordinates and store the results.
+
+    Args:
+        geocoder: Provider to use; defaults to build_backfill_geocoder(workers, rate)
+        workers (int): Number of concurrent requests
+        rate (int): Maximum API requests per second for the default geocoder
+        batch_size (int): Coordinates written per transaction
+        attempts (int): Tries per city before giving up
+        backoff (float): Seconds to wait before the first retry, doubled each retry
+
+    Returns:
+        tuple: (number of locations resolved, number that could not be resolved)
+    """
+    cities = db_helper.get_pending_locations()
+    if not cities:
+        print("No locations need geocoding")
+        return 0, 0
+
+    geocoder = geocoder or build_backfill_geocoder(workers, rate)
+    total = len(cities)
+    print(f"Geocoding {total} locations with {workers} workers")
+
+    start = time.perf_counter()
+    batch = []
+    resolved = failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(geocode_with_retry, geocoder, city, attempts, backoff): city
+                   for city in cities}
+        for done, future in enumerate(as_completed(futures), 1):
+            city = futures[future]
+            try:
+                coordinates = future.result()
+            except Exception as e:
+                print(f"Error geocoding {city}: {e}")
+                coordinates = None
+
+            if coordinates is None:
+                failed += 1
+            else:
+                resolved += 1
+                batch.append((city, *coordinates))
+
+            if len(batch) >= batch_size or done == total:
+                if batch:
+                    db_helper.set_locations_coordinates(batch)
+                    batch = []
+                elapsed = time.perf_counter() - start
+                print(f"{done}/{total} locations, {resolved} resolved, {failed} failed "
+                      f"({done / elapsed:.1f} locations/s)")
+
+    return resolved, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Geocode every location that is missing coordinates.")
+    parser.add_argument("--database", default=connection.DB_PATH, help=f"database file (default: {connection.DB_PATH})")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent requests (default: 8)")
+    parser.add_argument("--rate", type=int, default=25, help="maximum API requests per second (default: 25)")
+    parser.add_argument("--batch-size", type=int, default=100, help="coordinates written per transaction (default: 100)")
+    parser.add_argument("--attempts", type=int, default=3, help="tries per city before giving up (default: 3)")
+    args = parser.parse_args(argv)
+
+    connection.set_database_path(args.database)
+    try:
+        _, failed = backfill_locations(workers=args.workers, rate=args.rate,
+                                       batch_size=args.batch_size, attempts=args.attempts)
+    finally:
+        connection.close_connections()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Job Application Tracker - Persistent Geocode Cache
+
+CachedGeocoder wraps any geocoding provider with the geocode_cache table.
+Entries are keyed by the normalized query (see geocoding.normalize), record
+the provider that answered and expire after a TTL. Cities the provider could
+not find are cached too (negative entries) with a much shorter TTL, so a
+misspelled city is not paid for again on every save but is retried eventually.
+Transient errors are never cached.
+"""
+import time
+from database import db_helper
+from geocoding.normalize import normalize_query
+
+STATUS_OK = "ok"
+STATUS_NOT_FOUND = "not_found"
+
+DAY = 24 * 60 * 60
+
+
+class CachedGeocoder:
+    """
+    Geocoder that answers from the geocode cache before asking its provider.
+
+    Args:
+        provider: Wrapped geocoder (see geocoding.providers)
+        ttl (int): Seconds a found location stays cached, None to keep it forever
+        negative_ttl (int): Seconds a "not found" answer stays cached
+    """
+
+    def __init__(self, provider, ttl=180 * DAY, negative_ttl=7 * DAY):
+        self.provider = provider
+        self.name = provider.name
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    def geocode(self, city):
+        """
+        Geocode a city, using the cache when it has a live entry.
+
+        Returns:
+            tuple: (latitude, longitude), or None if the city is known not to exist
+
+        Raises:
+            GeocodingError: Propagated from the provider on a cache miss
+        """
+        key = normalize_query(city)
+        if not key:
+            return None
+
+        now = int(time.time())
+        cached = db_helper.get_cached_geocode(key, now)
+        if cached is not None:
+            status, lat, lng = cached
+            return (lat, lng) if status == STATUS_OK else None
+
+        coordinates = self.provider.geocode(city)
+        if coordinates is None:
+            db_helper.put_cached_geocode(key, city, STATUS_NOT_FOUND, None, None,
+                                         self.provider.name, now, now + self.negative_ttl)
+            return None
+
+        lat, lng = coordinates
+        expires_at = now + self.ttl if self.ttl is not None else None
+        db_helper.put_cached_geocode(key, city, STATUS_OK, lat, lng, self.provider.name, now, expires_at)
+        return coordinates
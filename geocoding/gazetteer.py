@@ -0,0 +1,284 @@
+"""
+Job Application Tracker - Offline Gazetteer
+
+Offline geocoding from a GeoNames cities dump (e.g. cities15000.zip from
+https://download.geonames.org/export/dump/). The dump is compiled once into a
+compact binary index which is memory-mapped at runtime, so lookups read only
+the few pages they touch and take microseconds instead of an HTTP round trip.
+
+Every city is indexed under its name, ASCII name and alternate names, each
+folded like the geocode cache keys (see geocoding.normalize) and also with a
+", <country code>" suffix, so "Munchen", "München, Germany" and "munich, de"
+all find Munich. Entries sharing a key are ordered by population, so an
+ambiguous name resolves to its largest city.
+
+Index layout (little-endian):
+    header:  8-byte magic, uint32 entry count, uint32 reserved
+    offsets: uint32 per entry, sorted by (key, -population)
+    records: float32 lat, float32 lng, uint32 population, uint8 key length,
+             2-byte country code, uint8 name length, key bytes, name bytes
+
+Build an index with:
+    python -m geocoding.gazetteer cities15000.zip [--output Data/gazetteer.idx]
+
+Classes:
+    Gazetteer: Geocoding provider and autocomplete over a compiled index
+
+Key Functions:
+    build_index(): Compile a GeoNames dump into an index file
+    get_gazetteer(): The shared Gazetteer for GAZETTEER_PATH, or None if not built
+"""
+import argparse
+import io
+import mmap
+import os
+import struct
+import sys
+import time
+import zipfile
+from contextlib import contextmanager
+from geocoding.normalize import fold_text, normalize_query
+
+GAZETTEER_PATH = os.path.join("Data", "gazetteer.idx")
+
+MAGIC = b"JTGAZ\x00\x01\x00"
+HEADER = struct.Struct("<8sII")
+OFFSET = struct.Struct("<I")
+RECORD = struct.Struct("<ffIB2sB")
+
+# GeoNames "geoname" table columns
+COLUMN_NAME = 1
+COLUMN_ASCII_NAME = 2
+COLUMN_ALTERNATE_NAMES = 3
+COLUMN_LATITUDE = 4
+COLUMN_LONGITUDE = 5
+COLUMN_COUNTRY_CODE = 8
+COLUMN_POPULATION = 14
+
+
+class Gazetteer:
+    """
+    Memory-mapped city index usable as a geocoding provider.
+
+    Args:
+        path (str): Index file written by build_index()
+    """
+    name = "gazetteer"
+
+    # Entries scanned per autocomplete request; bounds the cost of short prefixes
+    COMPLETE_SCAN_LIMIT = 2000
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a gazetteer index")
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        """Unmap the index file."""
+        self._map.close()
+
+    def geocode(self, city):
+        """
+        Geocode a city from the index.
+
+        Returns:
+            tuple: (latitude, longitude) of the most populous match, or None on a miss
+        """
+        match = self.lookup(city)
+        return (match[0], match[1]) if match else None
+
+    def lookup(self, city):
+        """
+        Find the most populous city matching a query.
+
+        Returns:
+            tuple: (latitude, longitude, name, country_code), or None on a miss
+        """
+        key = normalize_query(city).encode("utf-8")
+        if not key:
+            return None
+        position = self._lower_bound(key)
+        if position == self._count:
+            return None
+        record_key, lat, lng, _, country, name = self._record(position)
+        if record_key != key:
+            return None
+        # Stored as float32; GeoNames coordinates have five decimals
+        return round(lat, 5), round(lng, 5), name, country
+
+    def complete(self, prefix, limit=10):
+        """
+        Suggest cities whose name starts with prefix, most populous first.
+
+        Args:
+            prefix (str): Text typed so far
+            limit (int): Maximum number of suggestions
+
+        Returns:
+            list: Suggestions formatted as "Name, CC"
+        """
+        key = normalize_query(prefix).encode("utf-8")
+        if not key:
+            return []
+
+        matches = {}
+        start = self._lower_bound(key)
+        for position in range(start, min(start + self.COMPLETE_SCAN_LIMIT, self._count)):
+            record_key, lat, lng, population, country, name = self._record(position)
+            if not record_key.startswith(key):
+                break
+            matches.setdefault((name, country, lat, lng), population)
+
+        ranked = sorted(matches.items(), key=lambda item: -item[1])
+        suggestions = []
+        for (name, country, _, _), _ in ranked:
+            suggestion = f"{name}, {country}"
+            if suggestion not in suggestions:
+                suggestions.append(suggestion)
+                if len(suggestions) == limit:
+                    break
+        return suggestions
+
+    def _record(self, position):
+        offset, = OFFSET.unpack_from(self._map, HEADER.size + position * OFFSET.size)
+        lat, lng, population, key_length, country, name_length = RECORD.unpack_from(self._map, offset)
+        start = offset + RECORD.size
+        key = self._map[start:start + key_length]
+        name = self._map[start + key_length:start + key_length + name_length].decode("utf-8")
+        return key, lat, lng, population, country.decode("ascii"), name
+
+    def _key(self, position):
+        offset, = OFFSET.unpack_from(self._map, HEADER.size + position * OFFSET.size)
+        key_length = self._map[offset + 12]
+        start = offset + RECORD.size
+        return self._map[start:start + key_length]
+
+    def _lower_bound(self, key):
+        # First position whose key is >= key; equal keys are stored most populous first
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+def _city_keys(row):
+    # Every folded name of a city, bare and qualified with its country code
+    country = row[COLUMN_COUNTRY_CODE].lower()
+    names = [row[COLUMN_NAME], row[COLUMN_ASCII_NAME]] + row[COLUMN_ALTERNATE_NAMES].split(",")
+    keys = set()
+    for name in names:
+        folded = fold_text(name)
+        if folded:
+            keys.add(folded)
+            if country:
+                keys.add(f"{folded}, {country}")
+    return keys
+
+
+@contextmanager
+def _open_dump(source):
+    # Read a GeoNames dump either as a .txt file or straight from its .zip
+    if not zipfile.is_zipfile(source):
+        with open(source, encoding="utf-8") as dump:
+            yield dump
+        return
+    with zipfile.ZipFile(source) as archive:
+        member = next((name for name in archive.namelist() if name.endswith(".txt")), None)
+        if member is None:
+            raise ValueError(f"{source} has no GeoNames dump (.txt file) in it")
+        with io.TextIOWrapper(archive.open(member), encoding="utf-8") as dump:
+            yield dump
+
+
+def build_index(source, output=GAZETTEER_PATH, min_population=0):
+    """
+    Compile a GeoNames cities dump into a gazetteer index.
+
+    Args:
+        source (str): Path of a GeoNames dump (.txt or .zip)
+        output (str): Path of the index file to write
+        min_population (int): Skip cities smaller than this
+
+    Returns:
+        int: Number of index entries written
+    """
+    records = bytearray()
+    entries = []
+    with _open_dump(source) as dump:
+        for line in dump:
+            row = line.rstrip("\n").split("\t")
+            if len(row) <= COLUMN_POPULATION:
+                continue
+            population = int(row[COLUMN_POPULATION] or 0)
+            if population < min_population:
+                continue
+            lat, lng = float(row[COLUMN_LATITUDE]), float(row[COLUMN_LONGITUDE])
+            country = row[COLUMN_COUNTRY_CODE].encode("ascii", "replace")[:2].ljust(2)
+            name = row[COLUMN_NAME].encode("utf-8")[:255]
+            for key in _city_keys(row):
+                key = key.encode("utf-8")
+                if len(key) > 255:
+                    continue
+                entries.append((key, -population, len(records)))
+                records += RECORD.pack(lat, lng, min(population, 0xFFFFFFFF), len(key), country, len(name))
+                records += key + name
+
+    entries.sort()
+    base = HEADER.size + OFFSET.size * len(entries)
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    temporary = output + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(entries), 0))
+        f.write(b"".join(OFFSET.pack(base + offset) for _, _, offset in entries))
+        f.write(records)
+    os.replace(temporary, output)
+    return len(entries)
+
+
+_gazetteer = None
+_gazetteer_checked = False
+
+
+def get_gazetteer():
+    """Return the shared Gazetteer for GAZETTEER_PATH, or None if no index has been built."""
+    global _gazetteer, _gazetteer_checked
+    if not _gazetteer_checked:
+        _gazetteer_checked = True
+        if os.path.exists(GAZETTEER_PATH):
+            try:
+                _gazetteer = Gazetteer(GAZETTEER_PATH)
+            except (OSError, ValueError) as e:
+                print(f"Error opening gazetteer {GAZETTEER_PATH}: {e}")
+    return _gazetteer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the offline gazetteer index from a GeoNames dump.")
+    parser.add_argument("source", help="GeoNames cities dump, e.g. cities15000.zip")
+    parser.add_argument("--output", default=GAZETTEER_PATH, help=f"index file to write (default: {GAZETTEER_PATH})")
+    parser.add_argument("--min-population", type=int, default=0, help="skip cities smaller than this")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        count = build_index(args.source, args.output, args.min_population)
+    except ValueError as e:
+        print(e)
+        return 1
+    print(f"Wrote {count} entries to {args.output} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Job Application Tracker - Geocode Query Normalization
+
+Turns the city text a user typed into the key used by the geocode cache, so
+that trivially different spellings ("London", "london ", "LONDON") share one
+entry instead of each costing an API request.
+"""
+import re
+import unicodedata
+
+# Country qualifiers that mean the same place, mapped to one canonical code
+COUNTRY_ALIASES = {
+    "uk": "gb", "u k": "gb", "united kingdom": "gb", "great britain": "gb", "england": "gb", "gb": "gb",
+    "us": "us", "u s": "us", "usa": "us", "u s a": "us", "united states": "us",
+    "united states of america": "us",
+    "de": "de", "germany": "de", "deutschland": "de",
+    "fr": "fr", "france": "fr",
+    "nl": "nl", "netherlands": "nl", "the netherlands": "nl", "holland": "nl",
+    "ie": "ie", "ireland": "ie",
+    "es": "es", "spain": "es", "espana": "es",
+    "it": "it", "italy": "it", "italia": "it",
+    "ca": "ca", "canada": "ca",
+    "ch": "ch", "switzerland": "ch", "schweiz": "ch",
+    "ae": "ae", "uae": "ae", "united arab emirates": "ae",
+}
+
+
+def fold_text(text):
+    """Lowercase text, strip accents and collapse punctuation and whitespace to single spaces."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^\w]+", " ", text.casefold())
+    return " ".join(text.split())
+
+
+def normalize_query(city):
+    """
+    Build the cache key for a city query.
+
+    Each comma-separated part is case- and accent-folded with punctuation and
+    repeated whitespace removed, and a trailing country qualifier is mapped to
+    a canonical code ("London, UK" and "london, United Kingdom" both become
+    "london, gb"). A bare city and a qualified one stay distinct because the
+    qualifier can change the answer ("London" vs "London, Ontario").
+
+    Args:
+        city (str): City text as typed
+
+    Returns:
+        str: The normalized key, or "" if nothing searchable remains
+    """
+    parts = [fold_text(part) for part in city.split(",")]
+    parts = [part for part in parts if part]
+    if len(parts) > 1 and parts[-1] in COUNTRY_ALIASES:
+        parts[-1] = COUNTRY_ALIASES[parts[-1]]
+    return ", ".join(parts)
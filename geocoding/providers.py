@@ -0,0 +1,158 @@
+"""
+Job Application Tracker - Geocoding Providers
+
+A geocoder is any object with a `name` attribute and a `geocode(city)` method
+returning a (latitude, longitude) tuple, or None when the place does not exist.
+Transient problems (network errors, timeouts, rate limits) raise GeocodingError
+so callers can retry them.
+
+The default provider tries the offline gazetteer (geocoding.gazetteer), when
+an index has been built, before the Google Geocoding API, all behind the
+persistent geocode cache (geocoding.cache). It can be replaced with
+set_default_geocoder(), e.g. to point the application at a local stub server.
+"""
+import sys
+import time
+import requests
+try:
+    from config import GOOGLE_MAPS_API_KEY
+except ImportError:
+    # On stderr, so it never ends up in data streamed to stdout (e.g. `database.exporter -`)
+    print("Please create a config.py file with your API key (see config_template.py)", file=sys.stderr)
+    GOOGLE_MAPS_API_KEY = None
+
+
+class GeocodingError(Exception):
+    """A transient geocoding failure that is worth retrying."""
+
+
+class GoogleGeocoder:
+    """
+    Geocoder backed by Google's Geocoding API.
+
+    Args:
+        api_key (str): Google Maps API key
+        base_url (str): Endpoint to query; override to use a local stub server
+        timeout (tuple): (connect, read) timeouts in seconds
+        session (requests.Session): Session to reuse connections, created if omitted
+    """
+    name = "google"
+    BASE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+    RETRYABLE_STATUSES = ("OVER_QUERY_LIMIT", "UNKNOWN_ERROR")
+
+    def __init__(self, api_key=GOOGLE_MAPS_API_KEY, base_url=BASE_URL, timeout=(3.05, 10), session=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def geocode(self, city):
+        """
+        Geocode a city name.
+
+        Returns:
+            tuple: (latitude, longitude), or None if the city was not found
+
+        Raises:
+            GeocodingError: On network errors, timeouts and retryable API statuses
+        """
+        try:
+            response = self.session.get(
+                self.base_url,
+                params={"address": city, "key": self.api_key},
+                timeout=self.timeout,
+            )
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise GeocodingError(f"Error geocoding {city}: {e}") from e
+
+        status = data.get("status")
+        if status == "OK" and data.get("results"):
+            location = data["results"][0]["geometry"]["location"]
+            return location["lat"], location["lng"]
+        if status in self.RETRYABLE_STATUSES:
+            raise GeocodingError(f"Geocoding failed for {city}: {status}")
+
+        print(f"Geocoding failed for {city}: {status}")
+        return None
+
+
+class FallbackGeocoder:
+    """
+    Geocoder that asks each of its providers in turn until one finds the city.
+
+    Args:
+        providers (list): Geocoders to try, cheapest first
+    """
+    name = "fallback"
+
+    def __init__(self, providers):
+        self.providers = list(providers)
+
+    def geocode(self, city):
+        """
+        Geocode a city with the first provider that finds it.
+
+        Returns:
+            tuple: (latitude, longitude), or None if no provider found the city
+
+        Raises:
+            GeocodingError: From a provider asked after every earlier one missed
+        """
+        for provider in self.providers:
+            coordinates = provider.geocode(city)
+            if coordinates is not None:
+                return coordinates
+        return None
+
+
+def geocode_with_retry(geocoder, city, attempts=3, backoff=1.0, stop=None):
+    """
+    Geocode a city, retrying transient failures with exponential backoff.
+
+    Args:
+        geocoder: Provider to ask
+        city (str): City to geocode
+        attempts (int): Tries before giving up
+        backoff (float): Seconds to wait before the first retry, doubled each retry
+        stop (threading.Event): When set, give up instead of waiting for the next retry
+
+    Returns:
+        tuple: (latitude, longitude), or None if the city was not found or every attempt failed
+    """
+    for attempt in range(attempts):
+        try:
+            return geocoder.geocode(city)
+        except GeocodingError as e:
+            if attempt + 1 == attempts:
+                print(f"Giving up on {city} after {attempts} attempts: {e}")
+            elif stop is not None:
+                if stop.wait(backoff * 2 ** attempt):
+                    return None
+            else:
+                time.sleep(backoff * 2 ** attempt)
+    return None
+
+
+_default_geocoder = None
+
+
+def get_default_geocoder():
+    """Return the geocoder used when none is passed explicitly."""
+    global _default_geocoder
+    if _default_geocoder is None:
+        # Imported here because the cache depends on the database package
+        from geocoding.cache import CachedGeocoder
+        from geocoding.gazetteer import get_gazetteer
+        gazetteer = get_gazetteer()
+        provider = GoogleGeocoder()
+        if gazetteer is not None:
+            provider = FallbackGeocoder([gazetteer, provider])
+        _default_geocoder = CachedGeocoder(provider)
+    return _default_geocoder
+
+
+def set_default_geocoder(geocoder):
+    """Replace the default geocoder, e.g. with a stub for tests."""
+    global _default_geocoder
+    _default_geocoder = geocoder
@@ -0,0 +1,117 @@
+"""
+Job Application Tracker - Background Geocoding
+
+Applications are saved immediately with a pending location (a locations row
+without coordinates). GeocodingQueue resolves pending cities on a small worker
+pool, retrying transient failures with exponential backoff, writes the
+coordinates back to the locations table, and signals the UI once they arrive.
+
+Classes:
+    GeocodingQueue: Resolves pending locations off the GUI thread
+"""
+import sqlite3
+import threading
+from PyQt6 import QtCore
+from database import db_helper
+from geocoding.providers import geocode_with_retry, get_default_geocoder
+
+
+class _GeocodeSignals(QtCore.QObject):
+    resolved = QtCore.pyqtSignal(str, float, float)
+    failed = QtCore.pyqtSignal(str)
+
+
+class _GeocodeTask(QtCore.QRunnable):
+    def __init__(self, city, geocoder, signals, attempts, backoff, stop):
+        super().__init__()
+        self.city = city
+        self.geocoder = geocoder
+        self.signals = signals
+        self.attempts = attempts
+        self.backoff = backoff
+        self.stop = stop
+
+    def run(self):
+        coordinates = geocode_with_retry(self.geocoder, self.city, self.attempts, self.backoff, self.stop)
+        if coordinates is None:
+            self.signals.failed.emit(self.city)
+            return
+
+        lat, lng = coordinates
+        try:
+            db_helper.set_location_coordinates(self.city, lat, lng)
+        except sqlite3.Error as e:
+            print(f"Error saving coordinates for {self.city}: {e}")
+            self.signals.failed.emit(self.city)
+            return
+        self.signals.resolved.emit(self.city, lat, lng)
+
+
+class GeocodingQueue(QtCore.QObject):
+    """
+    Geocodes cities on a background thread pool.
+
+    Each city is queued at most once at a time. The geocoder can be swapped
+    for any provider (see geocoding.providers), e.g. one pointed at a local
+    stub server in tests.
+
+    Signals:
+        location_resolved (str, float, float): City and its stored latitude and longitude
+        location_failed (str): City that could not be geocoded
+
+    Args:
+        geocoder: Provider to use; defaults to geocoding.get_default_geocoder()
+        max_workers (int): Number of concurrent requests
+        attempts (int): Tries per city before giving up
+        backoff (float): Seconds to wait before the first retry, doubled each retry
+    """
+    location_resolved = QtCore.pyqtSignal(str, float, float)
+    location_failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, geocoder=None, max_workers=2, attempts=3, backoff=1.0, parent=None):
+        super().__init__(parent)
+        self.geocoder = geocoder
+        self.attempts = attempts
+        self.backoff = backoff
+        self._queued = set()
+        # Set by cancel(); running tasks stop retrying
+        self._stop = threading.Event()
+
+        # Long-lived workers keep their SQLite connection between tasks
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(max_workers)
+        self._pool.setExpiryTimeout(-1)
+
+        self._signals = _GeocodeSignals(self)
+        self._signals.resolved.connect(self._resolved)
+        self._signals.failed.connect(self._failed)
+
+    def enqueue(self, city):
+        """Queue a city for geocoding unless it is already queued."""
+        if not city or city in self._queued:
+            return
+        self._queued.add(city)
+        geocoder = self.geocoder or get_default_geocoder()
+        self._pool.start(_GeocodeTask(city, geocoder, self._signals, self.attempts, self.backoff, self._stop))
+
+    def pending(self):
+        """Return the number of cities queued or in flight."""
+        return len(self._queued)
+
+    def cancel(self):
+        """Drop the cities not started yet and stop retrying the ones in flight (used on shutdown)."""
+        self._stop.set()
+        self._pool.clear()
+        self._queued.clear()
+
+    def wait_for_done(self, msecs=-1):
+        """Block until every queued task has finished (used on shutdown and in scripts)."""
+        return self._pool.waitForDone(msecs)
+
+    def _resolved(self, city, lat, lng):
+        self._queued.discard(city)
+        self.location_resolved.emit(city, lat, lng)
+
+    def _failed(self, city):
+        self._queued.discard(city)
+        self.location_failed.emit(city)
@@ -1,5 +1,4 @@
 import constants as c
-from PyQt6 import QtCore
 
 def update_buttons(main_window, app=None, has_events=False):
     is_selected = app is not None
@@ -7,14 +6,28 @@ def update_buttons(main_window, app=None, has_events=False):
     main_window.deleteApplicationButton.setEnabled(is_selected)
     main_window.newEventButton.setEnabled(is_selected and app and app.status != c.STATUS_CLOSED)
     
-    selected_event = main_window.eventsTable.currentRow()
+    selected_event = main_window.eventsTable.currentIndex().row()
     is_event_selected = selected_event >= 0
 
     if is_event_selected:
-        note_item = main_window.eventsTable.item(selected_event, 0)
-        event_note = note_item.data(QtCore.Qt.ItemDataRole.UserRole + 1)
-        main_window.viewNoteButton.setEnabled(bool(event_note))
+        event = main_window.eventsTable.model().event_at(selected_event)
+        main_window.viewNoteButton.setEnabled(bool(event and event.note))
     else:
         main_window.viewNoteButton.setEnabled(False)
 
-    main_window.deleteEventButton.setEnabled(has_events and is_event_selected)
\ No newline at end of file
+    main_window.deleteEventButton.setEnabled(has_events and is_event_selected)
+
+def update_filter_buttons(main_window, counts):
+    """
+    Show the number of applications each filter button selects.
+
+    Args:
+        main_window: MainWindow whose btn_0 (All), btn_2 (Open) and btn_1 (Closed) are labelled
+        counts (dict): Status -> number of applications, as from ApplicationStore.status_counts
+    """
+    pending = counts.get(c.STATUS_PENDING, 0)
+    active = counts.get(c.STATUS_ACTIVE, 0)
+    main_window.btn_0.setText(f"All ({sum(counts.values())})")
+    # Open selects both Pending and Active applications, so it shows each count
+    main_window.btn_2.setText(f"Open ({pending + active})\nActive {active} \u00b7 Pending {pending}")
+    main_window.btn_1.setText(f"Closed ({counts.get(c.STATUS_CLOSED, 0)})")
@@ -0,0 +1,21 @@
+from PyQt6 import QtCore
+
+# Dates are stored as ISO 8601 "yyyy-MM-dd" text and only formatted for display
+DISPLAY_FORMAT = "dd/MM/yyyy"
+
+def display_date(iso_date):
+    """
+    Format a stored "yyyy-MM-dd" date for display as "dd/MM/yyyy".
+    Values that are not ISO dates are returned unchanged.
+    """
+    if not iso_date or len(iso_date) != 10 or iso_date[4] != "-":
+        return iso_date
+    return f"{iso_date[8:10]}/{iso_date[5:7]}/{iso_date[0:4]}"
+
+def to_qdate(iso_date):
+    # QDate for a stored "yyyy-MM-dd" date, for date edit widgets
+    return QtCore.QDate.fromString(iso_date or "", QtCore.Qt.DateFormat.ISODate)
+
+def from_qdate(qdate):
+    # Stored "yyyy-MM-dd" form of a QDate
+    return qdate.toString(QtCore.Qt.DateFormat.ISODate)
@@ -1,11 +1,9 @@
 import constants as c
 
 def filter_applications(applications, filter_mode):
-    if filter_mode == c.FilterMode.ALL:
+    if filter_mode not in c.FILTER_MODE_STATUSES:
+        raise ValueError(f"Unknown filter mode: {filter_mode}")
+    statuses = c.FILTER_MODE_STATUSES[filter_mode]
+    if statuses is None:
         return applications
-    elif filter_mode == c.FilterMode.ACTIVE:
-        return [app for app in applications if app.status in (c.STATUS_PENDING, c.STATUS_ACTIVE)]
-    elif filter_mode == c.FilterMode.CLOSED:
-        return [app for app in applications if app.status == c.STATUS_CLOSED]
-    else:
-        raise ValueError(f"Unknown filter mode: {filter_mode}")
\ No newline at end of file
+    return [app for app in applications if app.status in statuses]
\ No newline at end of file
@@ -0,0 +1,193 @@
+import sqlite3
+import threading
+from PyQt6 import QtCore
+from database import db_helper
+from database.connection import get_connection
+from database.search_query import QuerySyntaxError, is_plain, parse_query
+from geocoding.normalize import fold_text
+from helpers.trigram_index import TrigramIndex
+
+class _SearchSignals(QtCore.QObject):
+    finished = QtCore.pyqtSignal(int, object)
+
+class _SearchTask(QtCore.QRunnable):
+    # Runs one search query, func(*args), on a worker thread (which has its own SQLite connection)
+    def __init__(self, generation, func, args, signals):
+        super().__init__()
+        self.generation = generation
+        self.func = func
+        self.args = args
+        self.signals = signals
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._connection = None
+
+    def cancel(self):
+        """Stop the query if it is running, or keep it from starting."""
+        with self._lock:
+            self._cancelled = True
+            if self._connection is not None:
+                self._connection.interrupt()
+
+    def run(self):
+        with self._lock:
+            if self._cancelled:
+                return
+            self._connection = get_connection()
+        try:
+            ids = set(self.func(*self.args))
+        except sqlite3.Error as e:
+            if self._cancelled:
+                return
+            print(f"Error running search {self.func.__name__}: {e}")
+            ids = set()
+        finally:
+            with self._lock:
+                self._connection = None
+        self.signals.finished.emit(self.generation, ids)
+
+class SearchController(QtCore.QObject):
+    """
+    Debounces search box input and answers it from an in-memory trigram index.
+
+    Every keystroke restarts the debounce timer; only the last text typed is
+    searched. Company, job title and location matches come from the
+    TrigramIndex straight away, and when the text extends the previous query
+    only the previous matches are checked again. The full-text query (which
+    also covers event notes) runs off the GUI thread and adds its matches
+    when it finishes; a newer query interrupts it.
+
+    Text using the query language of database.search_query (fields such as
+    status:active or company:acme, quoted phrases, -negation, OR) is compiled
+    to SQL instead (db_helper.query_applications) and runs on the same worker.
+
+    Signals:
+        results_ready (object): Set of matching application IDs, or None when the search is cleared
+        query_failed (str): The text could not be parsed; the message to show
+
+    Args:
+        store (ApplicationStore): Store whose applications are indexed, kept in sync through its signals
+    """
+    results_ready = QtCore.pyqtSignal(object)
+    query_failed = QtCore.pyqtSignal(str)
+
+    DEBOUNCE_MS = 200
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self._text = ""
+        self._generation = 0
+        self._task = None
+        # Last query answered from the index, and its matches, for narrowing
+        self._previous_text = None
+        self._previous_ids = None
+        self._results = None
+
+        self.index = TrigramIndex()
+        if store is not None:
+            store.reset.connect(self._index_reset)
+            store.applications_loaded.connect(self._index_applications)
+            store.application_added.connect(lambda app: self._index_applications([app]))
+            store.application_changed.connect(lambda app: self._index_applications([app]))
+            store.application_removed.connect(self._index_removed)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self._start_query)
+
+        # One long-lived worker so it keeps its SQLite connection between queries
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._pool.setExpiryTimeout(-1)
+
+        self._signals = _SearchSignals(self)
+        self._signals.finished.connect(self._query_finished)
+
+    def set_text(self, text):
+        """Schedule a search for text, or clear the search immediately if it is blank."""
+        self._text = text.strip()
+        self._generation += 1
+        if not self._text:
+            self._timer.stop()
+            self._cancel_query()
+            self._results = None
+            self.results_ready.emit(None)
+            return
+        self._timer.start()
+
+    def refresh(self):
+        """Re-run the current search, e.g. after the underlying data changed."""
+        # Matches of the previous query may be out of date, so do not narrow from them
+        self._previous_text = None
+        if self._text:
+            self._generation += 1
+            self._timer.start()
+
+    def cancel(self):
+        """Stop the pending and running queries without publishing results (used on shutdown)."""
+        self._timer.stop()
+        self._generation += 1
+        self._cancel_query()
+
+    def wait_for_done(self, msecs=-1):
+        """Block until the running query has returned (used on shutdown and in scripts)."""
+        return self._pool.waitForDone(msecs)
+
+    def _index_reset(self):
+        self.index.clear()
+        self.refresh()
+
+    def _index_applications(self, applications):
+        for app in applications:
+            self.index.add(app)
+        self.refresh()
+
+    def _index_removed(self, app_id):
+        self.index.remove(app_id)
+        self.refresh()
+
+    def _start_query(self):
+        try:
+            query = parse_query(self._text)
+        except QuerySyntaxError as e:
+            # Keep showing the last results until the text can be parsed again
+            self.query_failed.emit(str(e))
+            return
+        if query is not None and not is_plain(query):
+            self._previous_text = self._previous_ids = None
+            self._run_query(db_helper.query_applications, query)
+            return
+
+        text = fold_text(self._text)
+        within = None
+        if self._previous_text is not None and text.startswith(self._previous_text):
+            # Every word of the previous query is part of a word of this one
+            within = self._previous_ids
+        ids = self.index.search(text, within)
+        self._previous_text, self._previous_ids = text, ids
+        self._publish(ids)
+        self._run_query(db_helper.search_applications, self._text)
+
+    def _run_query(self, func, *args):
+        # Drop queued queries that have not started yet and interrupt the running one; they are stale
+        self._cancel_query()
+        self._task = _SearchTask(self._generation, func, args, self._signals)
+        self._pool.start(self._task)
+
+    def _cancel_query(self):
+        self._pool.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _query_finished(self, generation, ids):
+        if generation == self._generation:
+            self._task = None
+            # Plain text: add the full-text matches to those found in the index
+            self._publish(ids if self._previous_ids is None else self._previous_ids | ids)
+
+    def _publish(self, ids):
+        if ids != self._results:
+            self._results = ids
+            self.results_ready.emit(ids)
@@ -0,0 +1,100 @@
+"""
+Job Application Tracker - Trigram Index
+
+In-memory substring index over the company, job title and location of every
+application, so search-as-you-type never scans the table or waits for the
+database. Texts are case- and accent-folded and split into trigrams (all
+three-character substrings). The candidates for a query word are the
+applications holding every trigram of the word, and only those are checked
+for the word itself.
+
+Classes:
+    TrigramIndex: Incrementally maintained trigram index of applications
+"""
+from geocoding.normalize import fold_text
+
+
+def trigrams(text):
+    """Return the set of three-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Maps trigrams of folded company, job title and location text to application IDs.
+
+    add() and remove() keep the index in step with the stored applications one
+    application at a time; re-adding a changed application replaces its entry.
+    """
+
+    def __init__(self):
+        self._postings = {}  # trigram -> set of application IDs
+        self._texts = {}     # application ID -> folded fields, one per line
+
+    def __len__(self):
+        return len(self._texts)
+
+    def clear(self):
+        """Remove every application."""
+        self._postings.clear()
+        self._texts.clear()
+
+    def add(self, app):
+        """Index an application, replacing its previous entry if it was indexed before."""
+        text = "\n".join(fold_text(value or "") for value in (app.company, app.job_title, app.location))
+        if self._texts.get(app.id) == text:
+            return
+        self.remove(app.id)
+        self._texts[app.id] = text
+        for gram in self._field_trigrams(text):
+            self._postings.setdefault(gram, set()).add(app.id)
+
+    def remove(self, app_id):
+        """Drop an application from the index (no-op if it is not indexed)."""
+        text = self._texts.pop(app_id, None)
+        if text is None:
+            return
+        for gram in self._field_trigrams(text):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(app_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def search(self, text, within=None):
+        """
+        Find the applications whose company, job title or location contain every word of text.
+
+        Args:
+            text (str): Words to look for; each matches anywhere inside a field
+            within (set): Only consider these application IDs, e.g. the results
+                of a query this one extends; None to consider all
+
+        Returns:
+            set: Matching application IDs (every indexed ID if text has no words)
+        """
+        words = fold_text(text).split()
+        candidates = set(within) if within is not None else None
+        for word in words:
+            # Rarest trigram first, so the candidate set shrinks as fast as possible
+            for gram in sorted(trigrams(word), key=lambda gram: len(self._postings.get(gram, ()))):
+                ids = self._postings.get(gram)
+                if not ids:
+                    return set()
+                candidates = set(ids) if candidates is None else candidates & ids
+                if not candidates:
+                    return set()
+        if candidates is None:
+            # Only words too short for trigrams: every application is a candidate
+            candidates = self._texts.keys()
+        texts = self._texts
+        return {app_id for app_id in candidates
+                if app_id in texts and all(word in texts[app_id] for word in words)}
+
+    @staticmethod
+    def _field_trigrams(text):
+        # Trigrams of each field separately, so none spans two fields
+        grams = set()
+        for field in text.split("\n"):
+            grams |= trigrams(field)
+        return grams
@@ -1,21 +1,36 @@
-class Application:
-    def __init__(self, id, company, job_title, application_date, status, location=None, latitude=None, longitude=None):
-        self.id = id
-        self.company = company
-        self.job_title = job_title
-        self.application_date = application_date
-        self.status = status
-        self.location = location
-        self.latitude = latitude
-        self.longitude = longitude
-        self.events = []  # List of associated events
+from typing import NamedTuple, Optional
+
+
+class Application(NamedTuple):
+    """
+    One job application as read from the database.
+
+    Applications are immutable tuples without a per-instance __dict__; the
+    fields are in the same order as db_helper.APPLICATION_COLUMNS, so a query
+    row maps onto an Application directly. Use _replace() to derive a changed copy.
+    """
+    id: int
+    company: str
+    job_title: str
+    application_date: str
+    status: str
+    location: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    # Event summary, maintained by triggers on the events table
+    event_count: int = 0
+    last_event_type: Optional[str] = None
+    last_event_date: Optional[str] = None
+    # Associated events, only filled by get_all_applications(with_events=True)
+    events: tuple = ()
+
+    def with_events(self, events):
+        """Return a copy of the application carrying the given events."""
+        return self._replace(events=tuple(events))
 
-    def add_event(self, event):
-        self.events.append(event)
-        
     def __repr__(self):
         return (
             f"Application(id={self.id}, company='{self.company}', "
             f"job_title='{self.job_title}', application_date='{self.application_date}', "
             f"status='{self.status}')"
-        )
\ No newline at end of file
+        )
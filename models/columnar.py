@@ -0,0 +1,52 @@
+import sys
+from array import array
+
+
+class ColumnarTable:
+    """
+    Read-only result set stored as one array per column instead of one object per row.
+
+    Integer and float columns that can never be NULL are kept in typed arrays
+    (8 bytes per value); other columns are plain lists, with repeated strings
+    (company names, statuses, cities) interned so equal values share one object.
+    Rows are materialized as row_type tuples only when accessed.
+
+    Args:
+        row_type: NamedTuple class rows are returned as (e.g. Application)
+        fields (tuple): Names of the row_type fields the query returns, in column order
+        rows: Iterable of query rows, consumed once
+        typecodes (dict): array typecodes for NOT NULL numeric fields, e.g. {"id": "q"}
+    """
+    __slots__ = ("row_type", "fields", "_columns", "_length")
+
+    def __init__(self, row_type, fields, rows, typecodes=None):
+        typecodes = typecodes or {}
+        self.row_type = row_type
+        self.fields = tuple(fields)
+        self._columns = [array(typecodes[field]) if field in typecodes else [] for field in self.fields]
+        self._length = 0
+
+        appends = [column.append for column in self._columns]
+        intern = sys.intern
+        for row in rows:
+            for append, value in zip(appends, row):
+                append(intern(value) if type(value) is str else value)
+            self._length += 1
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ColumnarTable index out of range")
+        return self.row_type(*(column[index] for column in self._columns))
+
+    def __iter__(self):
+        for values in zip(*self._columns):
+            yield self.row_type(*values)
+
+    def column(self, field):
+        """Return the values of one column as an array or list (do not modify it)."""
+        return self._columns[self.fields.index(field)]
@@ -1,7 +1,10 @@
-class Event:
-    def __init__(self, id, application_id, event_type, event_date, note=None):
-        self.id = id
-        self.application_id = application_id
-        self.event_type = event_type
-        self.event_date = event_date
-        self.note = note
+from typing import NamedTuple, Optional
+
+
+class Event(NamedTuple):
+    """One event of an application, as an immutable tuple in the column order of the events table."""
+    id: int
+    application_id: int
+    event_type: str
+    event_date: str
+    note: Optional[str] = None
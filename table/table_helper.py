@@ -1,42 +1,38 @@
-from PyQt6.QtWidgets import QTableWidgetItem
-from PyQt6 import QtCore, QtGui
+from PyQt6 import QtCore
 import constants as c
+from table.table_models import ApplicationTableModel, EventTableModel, ID_ROLE
 
-def create_table_item(text, data=None):
-    # Create a QTableWidgetItem with the given text and data
-    item = QTableWidgetItem(text)
-    if data:
-        item.setData(QtCore.Qt.ItemDataRole.UserRole, data)
-    return item
+def setup_application_table(table, store=None):
+    # Attach a paged application model, sorted and filtered in SQL, to the given QTableView
+    model = ApplicationTableModel(store, table)
+    table.setModel(model)
+    table.setSortingEnabled(True)
+    # Newest applications first
+    table.sortByColumn(c.TABLE_COLUMN_DATE_APPLIED, QtCore.Qt.SortOrder.DescendingOrder)
+    return model
+
+def setup_events_table(table):
+    # Attach an event model to the given QTableView
+    model = EventTableModel(table)
+    table.setModel(model)
+    return model
 
 def get_selected_row_item(table, column):
-    selected_row = table.currentRow()
+    selected_row = table.currentIndex().row()
     if selected_row < 0:
         return None
-    
-    item = table.item(selected_row, column)
-    return item.data(QtCore.Qt.ItemDataRole.UserRole) if item else None
 
-def populate_application_table(table, applications):
-    # Populate the given QTableWidget with the given applications
-    table.setRowCount(0)
-    applications = list(applications)
-    applications.sort(key=lambda app: QtCore.QDate.fromString(app.application_date, "dd/MM/yyyy"), reverse=True)
+    return table.model().index(selected_row, column).data(ID_ROLE)
 
-    for app in applications:
-        row = table.rowCount()
-        table.insertRow(row)
-        table.setItem(row, c.TABLE_COLUMN_COMPANY, create_table_item(app.company, app.id))
-        table.setItem(row, c.TABLE_COLUMN_JOB_TITLE, create_table_item(app.job_title))
-        sortable_date = QtCore.QDate.fromString(app.application_date, "dd/MM/yyyy")
-        table.setItem(row, c.TABLE_COLUMN_DATE_APPLIED, create_table_item(app.application_date, sortable_date))
+def select_application(table, app_id):
+    # Select the row showing the given application, returns False if it is not shown
+    row = table.model().row_for_id(app_id)
+    if row < 0:
+        return False
+    table.selectRow(row)
+    return True
 
-        # Create and style status item
-        status_item = create_table_item(app.status)
-        if app.status == c.STATUS_PENDING:
-            status_item.setBackground(QtGui.QColor(255, 255, 0, 50))
-        elif app.status == c.STATUS_CLOSED:
-            status_item.setBackground(QtGui.QColor(255, 0, 0, 50))
-        elif app.status == c.STATUS_ACTIVE:
-            status_item.setBackground(QtGui.QColor(0, 255, 0, 50))
-        table.setItem(row, c.TABLE_COLUMN_STATUS, status_item)
\ No newline at end of file
+def visible_applications(table, on_result, on_error=None):
+    # Pass the applications matching the given QTableView's filter, in display order
+    # (including rows not loaded yet), to on_result once they are read, or the exception to on_error
+    table.model().all_applications(on_result, on_error)
@@ -0,0 +1,468 @@
+"""
+Job Application Tracker - Table Models
+
+Item models backing the application and event tables. The views only ask the
+models for the cells they are about to paint, so no per-cell Qt objects are
+created. A refresh after the data changed is applied as a row diff, touching
+only the rows that were added, removed, moved or changed.
+
+Classes:
+    ApplicationTableModel: Sorted, filtered and paged applications shown in the main table
+    EventTableModel: Events of the selected application
+"""
+from PyQt6 import QtCore, QtGui
+from functools import partial
+import constants as c
+from database import db_helper
+from database.data_service import DataService
+from helpers.date_helper import display_date
+
+ID_ROLE = QtCore.Qt.ItemDataRole.UserRole
+NOTE_ROLE = QtCore.Qt.ItemDataRole.UserRole + 1
+SORT_ROLE = QtCore.Qt.ItemDataRole.UserRole + 2
+
+# Shared brushes, created once instead of once per cell
+STATUS_BRUSHES = {
+    c.STATUS_PENDING: QtGui.QBrush(QtGui.QColor(255, 255, 0, 50)),
+    c.STATUS_CLOSED: QtGui.QBrush(QtGui.QColor(255, 0, 0, 50)),
+    c.STATUS_ACTIVE: QtGui.QBrush(QtGui.QColor(0, 255, 0, 50)),
+}
+NOTE_BACKGROUND_BRUSH = QtGui.QBrush(QtGui.QColor("#1e282c"))  # Darker background for events with notes
+NOTE_TEXT_BRUSH = QtGui.QBrush(QtGui.QColor("#e5c07b"))        # Soft yellow text for events with notes
+
+
+def _load_page(sort_keys, filter_mode, ids, after, limit):
+    # Runs on the data service: one page of rows, plus the total count when loading the first page.
+    # The count is its own query: a COUNT(*) OVER () on the page query (as db_helper.get_applications
+    # does) builds every matching row before the LIMIT applies, about 50x slower at 100,000 rows.
+    page = db_helper.get_application_page(sort_keys, filter_mode, ids, after=after, limit=limit)
+    total = db_helper.count_applications(filter_mode, ids) if after is None else None
+    return page, total
+
+
+def _runs(rows):
+    # Group ascending row numbers into (first, last) ranges of consecutive rows
+    runs = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    return runs
+
+
+class ApplicationTableModel(QtCore.QAbstractTableModel):
+    """
+    Table model over the applications matching the current filter, in a
+    user-selected multi-column sort order.
+
+    Sorting, filtering and counting run in SQL (db_helper.get_application_page),
+    and rows are fetched a page at a time as the view scrolls, continuing after
+    the sort key of the last loaded row. The queries run on the store's
+    DataService, so the view keeps the rows it has until the new ones arrive.
+    Clicking a header sorts by that column; Ctrl+click adds it as the next sort
+    key, or flips its direction if it is already one. When given an
+    ApplicationStore, the model follows its signals and repaints or removes
+    single rows where the order cannot change.
+
+    Signals:
+        page_loaded: Rows of a query arrived (after the reset or row insertion they caused)
+    """
+    page_loaded = QtCore.pyqtSignal()
+
+    HEADERS = {
+        c.TABLE_COLUMN_COMPANY: "Company",
+        c.TABLE_COLUMN_JOB_TITLE: "Job Title",
+        c.TABLE_COLUMN_DATE_APPLIED: "Apply Date",
+        c.TABLE_COLUMN_STATUS: "Status",
+        c.TABLE_COLUMN_EVENT_COUNT: "Events",
+        c.TABLE_COLUMN_LAST_EVENT: "Last Event",
+        c.TABLE_COLUMN_LAST_EVENT_DATE: "Last Event Date",
+        c.TABLE_COLUMN_LOCATION: "Location",
+    }
+    # Application field each sortable column orders by
+    SORT_FIELDS = {
+        c.TABLE_COLUMN_COMPANY: "company",
+        c.TABLE_COLUMN_JOB_TITLE: "job_title",
+        c.TABLE_COLUMN_DATE_APPLIED: "application_date",
+        c.TABLE_COLUMN_STATUS: "status",
+        c.TABLE_COLUMN_EVENT_COUNT: "event_count",
+        c.TABLE_COLUMN_LAST_EVENT: "last_event_type",
+        c.TABLE_COLUMN_LAST_EVENT_DATE: "last_event_date",
+        c.TABLE_COLUMN_LOCATION: "location",
+    }
+
+    def __init__(self, store=None, parent=None, page_size=db_helper.PAGE_SIZE):
+        super().__init__(parent)
+        self.page_size = page_size
+        self._applications = []
+        self._keys = []
+        self._rows_by_id = {}
+        self._total = 0
+        self._exhausted = True
+        self._sort_keys = [(c.TABLE_COLUMN_DATE_APPLIED, True)]
+        self._filter_mode = c.FilterMode.ALL
+        self._search_ids = None
+        # Bumped by every reload, so pages of superseded queries are dropped
+        self._generation = 0
+        self._loading = False
+        # Set when the data changed while a query was running; it is re-run once that query returns
+        self._stale = False
+        # Nothing is queried until the data is known to be there (first reload)
+        self._active = store is None
+        self._service = store.service if store is not None else DataService(self)
+
+        if store is not None:
+            store.reset.connect(self._store_reset)
+            store.application_added.connect(lambda app: self.reload())
+            store.application_changed.connect(self.update_application)
+            store.application_removed.connect(self.remove_application)
+
+    def _store_reset(self):
+        self._active = True
+        self.reload()
+
+    def reload(self, keep_loaded=True):
+        """
+        Re-run the query, keeping as many rows loaded as before when keep_loaded is set.
+
+        With keep_loaded the new rows are applied as a diff (see _apply_rows), so
+        views keep their selection and scroll position, and changes arriving while
+        a query runs are coalesced into a single re-run once it returns.
+
+        Args:
+            keep_loaded (bool): Refresh the rows shown now, e.g. after the data
+                changed; otherwise the query itself changed and only its first
+                page is loaded, replacing the rows
+        """
+        if not self._active:
+            return
+        if keep_loaded and self._loading:
+            # The running query may have read the data before this change
+            self._stale = True
+            return
+        limit = max(len(self._applications), self.page_size) if keep_loaded else self.page_size
+        self._generation += 1
+        self._loading = True
+        self._stale = False
+        self._service.read(_load_page, self._sort_keys, self._filter_mode, self._search_ids, None, limit,
+                           on_result=partial(self._page_loaded, self._generation, limit,
+                                             self._apply_rows if keep_loaded else self._reset_rows))
+
+    def _page_loaded(self, generation, limit, apply, result):
+        if generation != self._generation:
+            return
+        page, total = result
+        self._loading = False
+        if self._stale and apply == self._apply_rows:
+            # Outdated refresh: the rows shown are no older, run it again
+            self.reload()
+            return
+        self._exhausted = len(page) < limit
+        if apply is not None:
+            # Set first, so views counting rows on the signals apply emits see the new total
+            self._total = total
+            apply(page)
+        elif page:
+            first = len(self._applications)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(page) - 1)
+            for row, (app, key) in enumerate(page, first):
+                self._applications.append(app)
+                self._keys.append(key)
+                self._rows_by_id[app.id] = row
+            self.endInsertRows()
+        self.page_loaded.emit()
+        if self._stale:
+            self.reload()
+
+    def _set_rows(self, page):
+        self._applications = [app for app, _ in page]
+        self._keys = [key for _, key in page]
+        self._rows_by_id = {app.id: row for row, app in enumerate(self._applications)}
+
+    def _reset_rows(self, page):
+        self.beginResetModel()
+        self._set_rows(page)
+        self.endResetModel()
+
+    def _apply_rows(self, page):
+        """
+        Turn the loaded rows into the rows of page with the smallest model changes.
+
+        Rows that left the query are removed, new ones inserted, moved rows are
+        reordered through a layout change that carries persistent indexes (and so
+        the view's selection) along, and only rows whose application changed are
+        repainted. The view is never reset, so it keeps its scroll position.
+        """
+        previous = {app.id: app for app in self._applications}
+        new_ids = {app.id for app, _ in page}
+        removed = [row for row, app in enumerate(self._applications) if app.id not in new_ids]
+        for first, last in reversed(_runs(removed)):
+            self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+            del self._applications[first:last + 1]
+            del self._keys[first:last + 1]
+            self.endRemoveRows()
+
+        added = [(app, key) for app, key in page if app.id not in previous]
+        if added:
+            first = len(self._applications)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(added) - 1)
+            self._applications.extend(app for app, _ in added)
+            self._keys.extend(key for _, key in added)
+            self.endInsertRows()
+
+        rows = {app.id: row for row, app in enumerate(self._applications)}
+        new_rows = {rows[app.id]: row for row, (app, _) in enumerate(page)}
+        if any(old != new for old, new in new_rows.items()):
+            self.layoutAboutToBeChanged.emit()
+            persistent = self.persistentIndexList()
+            self.changePersistentIndexList(
+                persistent, [self.index(new_rows[index.row()], index.column()) for index in persistent])
+            self._set_rows(page)
+            self.layoutChanged.emit()
+        else:
+            self._set_rows(page)
+
+        changed = [row for row, app in enumerate(self._applications)
+                   if app.id in previous and previous[app.id] != app]
+        for first, last in _runs(changed):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.HEADERS) - 1))
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        after = self._keys[-1] if self._keys else None
+        self._loading = True
+        self._service.read(_load_page, self._sort_keys, self._filter_mode, self._search_ids, after, self.page_size,
+                           on_result=partial(self._page_loaded, self._generation, self.page_size, None))
+
+    def is_loading(self):
+        """Return whether a query for this model is still running."""
+        return self._loading
+
+    def sort(self, column, order=QtCore.Qt.SortOrder.AscendingOrder):
+        """Sort by a column; with Ctrl held, add the column as the next sort key instead."""
+        if column not in self.SORT_FIELDS:
+            return
+        descending = order == QtCore.Qt.SortOrder.DescendingOrder
+        modifiers = QtGui.QGuiApplication.keyboardModifiers()
+        if modifiers & QtCore.Qt.KeyboardModifier.ControlModifier and self._sort_keys:
+            keys = [(key, desc) for key, desc in self._sort_keys if key != column]
+            if len(keys) < len(self._sort_keys):
+                # Already a sort key: flip its direction in place
+                keys = [(key, not desc if key == column else desc) for key, desc in self._sort_keys]
+            else:
+                keys.append((column, descending))
+        else:
+            keys = [(column, descending)]
+        self.set_sort_keys(keys)
+
+    def set_sort_keys(self, sort_keys):
+        """Order rows by (column, descending) pairs, most significant first."""
+        sort_keys = list(sort_keys)
+        if sort_keys == self._sort_keys:
+            return
+        self._sort_keys = sort_keys
+        self.reload(keep_loaded=False)
+        self.headerDataChanged.emit(QtCore.Qt.Orientation.Horizontal, 0, len(self.HEADERS) - 1)
+
+    def sort_keys(self):
+        """Return the current (column, descending) sort keys."""
+        return list(self._sort_keys)
+
+    def set_filter_mode(self, filter_mode):
+        """Show only applications whose status belongs to the given FilterMode."""
+        if filter_mode != self._filter_mode:
+            self._filter_mode = filter_mode
+            self.reload(keep_loaded=False)
+
+    def set_search_ids(self, ids):
+        """Show only the applications whose IDs are in ids, or all of them if ids is None."""
+        if ids != self._search_ids:
+            self._search_ids = ids
+            self.reload(keep_loaded=False)
+
+    def update_application(self, app):
+        """Repaint the row showing app.id, or re-query if the change can move or hide it."""
+        row = self._rows_by_id.get(app.id)
+        statuses = c.FILTER_MODE_STATUSES[self._filter_mode]
+        if row is None or (statuses is not None and app.status not in statuses):
+            self.reload()
+            return
+        previous = self._applications[row]
+        if any(getattr(previous, self.SORT_FIELDS[column]) != getattr(app, self.SORT_FIELDS[column])
+               for column, _ in self._sort_keys):
+            self.reload()
+            return
+        self._applications[row] = app
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+        self._requery_if_loading()
+
+    def remove_application(self, app_id):
+        """Remove the row showing the given application ID."""
+        row = self._rows_by_id.pop(app_id, None)
+        if row is None:
+            # Not loaded, but it may still have been counted
+            self.reload()
+            return
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self._applications[row]
+        del self._keys[row]
+        for shifted_row in range(row, len(self._applications)):
+            self._rows_by_id[self._applications[shifted_row].id] = shifted_row
+        self._total -= 1
+        self.endRemoveRows()
+        self._requery_if_loading()
+
+    def _requery_if_loading(self):
+        # A query started before this change may return the old row; replace it with one that runs after the write
+        if self._loading:
+            self.reload()
+
+    def applications(self):
+        """Return the loaded applications in model order."""
+        return list(self._applications)
+
+    def all_applications(self, on_result, on_error=None):
+        """
+        Pass every application matching the current filter, loaded or not, in model order to on_result.
+
+        Rows not loaded yet are queried in the background; on_result, or on_error
+        with the exception if the query fails, is called on the GUI thread.
+        """
+        if self._exhausted:
+            on_result(list(self._applications))
+            return
+        self._service.read(db_helper.get_application_page, self._sort_keys, self._filter_mode, self._search_ids,
+                           None, None, on_result=lambda page: on_result([app for app, _ in page]),
+                           on_error=on_error)
+
+    def total_count(self):
+        """Return the number of applications matching the current filter, loaded or not."""
+        return self._total
+
+    def application_at(self, row):
+        """Return the Application at a row, or None if out of range."""
+        if 0 <= row < len(self._applications):
+            return self._applications[row]
+        return None
+
+    def row_for_id(self, app_id):
+        """Return the row of an application ID, or -1 if not loaded."""
+        return self._rows_by_id.get(app_id, -1)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._applications)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if orientation == QtCore.Qt.Orientation.Horizontal and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            header = self.HEADERS.get(section)
+            if len(self._sort_keys) > 1:
+                # Show the priority and direction of every sort key
+                for priority, (column, descending) in enumerate(self._sort_keys, 1):
+                    if column == section:
+                        arrow = "\u25bc" if descending else "\u25b2"
+                        return f"{header} {priority}{arrow}"
+            return header
+        return None
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        app = self._applications[index.row()]
+        column = index.column()
+
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return self._display_text(app, column)
+        if role == ID_ROLE:
+            return app.id
+        if role == QtCore.Qt.ItemDataRole.BackgroundRole and column == c.TABLE_COLUMN_STATUS:
+            return STATUS_BRUSHES.get(app.status)
+        return None
+
+    @staticmethod
+    def _display_text(app, column):
+        if column == c.TABLE_COLUMN_COMPANY:
+            return app.company
+        if column == c.TABLE_COLUMN_JOB_TITLE:
+            return app.job_title
+        if column == c.TABLE_COLUMN_DATE_APPLIED:
+            return display_date(app.application_date)
+        if column == c.TABLE_COLUMN_STATUS:
+            return app.status
+        if column == c.TABLE_COLUMN_EVENT_COUNT:
+            return str(app.event_count)
+        if column == c.TABLE_COLUMN_LAST_EVENT:
+            return app.last_event_type
+        if column == c.TABLE_COLUMN_LAST_EVENT_DATE:
+            return display_date(app.last_event_date)
+        if column == c.TABLE_COLUMN_LOCATION:
+            return app.location
+        return None
+
+
+class EventTableModel(QtCore.QAbstractTableModel):
+    """Table model over the Event objects of one application."""
+    HEADERS = ("Type", "Date")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._events = []
+
+    def set_events(self, events):
+        """
+        Replace the model contents with the given events.
+
+        Returns:
+            bool: False if they equal the events shown, which are then kept as they are
+        """
+        events = list(events)
+        if events == self._events:
+            return False
+        self.beginResetModel()
+        self._events = events
+        self.endResetModel()
+        return True
+
+    def event_at(self, row):
+        """Return the Event at a row, or None if out of range."""
+        if 0 <= row < len(self._events):
+            return self._events[row]
+        return None
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._events)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if orientation == QtCore.Qt.Orientation.Horizontal and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        event = self._events[index.row()]
+
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return event.event_type if index.column() == 0 else display_date(event.event_date)
+        if role == ID_ROLE:
+            return event.id
+        if role == NOTE_ROLE:
+            return event.note
+        if role == SORT_ROLE:
+            return event.event_type if index.column() == 0 else event.event_date
+        if event.note:
+            if role == QtCore.Qt.ItemDataRole.BackgroundRole:
+                return NOTE_BACKGROUND_BRUSH
+            if role == QtCore.Qt.ItemDataRole.ForegroundRole:
+                return NOTE_TEXT_BRUSH
+        return None
@@ -0,0 +1,110 @@
+"""
+Shared fixtures: throwaway databases at the latest schema version, seeded with
+generated applications and events, and an offscreen QApplication for the
+item model tests.
+"""
+import os
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from database import connection
+from database.migrations import migrate
+
+# Tables of Data/job_tracker_template.db, before any migration
+BASE_SCHEMA = """
+    CREATE TABLE companies (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL);
+    CREATE TABLE applications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_id INTEGER NOT NULL REFERENCES companies(id),
+        job_title TEXT NOT NULL,
+        application_date TEXT NOT NULL,
+        status TEXT NOT NULL
+    );
+    CREATE TABLE events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        application_id INTEGER NOT NULL REFERENCES applications(id),
+        event_type TEXT NOT NULL,
+        event_date TEXT NOT NULL,
+        note TEXT
+    );
+"""
+
+
+def _create_database(db_path, rows):
+    # Template schema, migrated to the latest version, with `rows` applications;
+    # non-pending ones get three events each
+    conn = sqlite3.connect(db_path)
+    conn.executescript(BASE_SCHEMA)
+    conn.close()
+    migrate(db_path)
+
+    companies = max(rows // 20, 10)
+    cities = max(rows // 100, 10)
+    start = date(2023, 1, 1)
+
+    def day(n):
+        # Application and event dates spread over two years
+        return (start + timedelta(days=n % 730)).isoformat()
+
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany("INSERT INTO companies (name) VALUES (?)",
+                         ((f"Company {i}",) for i in range(companies)))
+        conn.executemany("INSERT INTO locations (city, latitude, longitude) VALUES (?, ?, ?)",
+                         ((f"City {i}", 50.0, 0.0) for i in range(cities)))
+        conn.executemany(
+            "INSERT INTO applications (company_id, job_title, application_date, status, location_id) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ((i % companies + 1, f"Job {i}", day(i), "Pending", i % cities + 1)
+             for i in range(rows)))
+        # Statuses follow from the events (via triggers): a third of the applications
+        # stay Pending without events, a third get a Rejection and are Closed
+        conn.executemany(
+            "INSERT INTO events (application_id, event_type, event_date, note) VALUES (?, ?, ?, ?)",
+            ((app_id, "Rejection" if app_id % 3 == 0 and n == 2 else "Interview", day(app_id + 7 * n), None)
+             for app_id in range(1, rows + 1) if app_id % 3 != 1 for n in range(3)))
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+def _use_database(db_path):
+    # Point db_helper at db_path until the generator is resumed
+    original_path = connection.DB_PATH
+    connection.set_database_path(str(db_path))
+    try:
+        yield connection.get_connection()
+    finally:
+        connection.set_database_path(original_path)
+
+
+@pytest.fixture(scope="session")
+def create_database():
+    """Function creating a database at the latest schema version: create_database(path, rows)."""
+    return _create_database
+
+
+@pytest.fixture(scope="module")
+def seeded_database(tmp_path_factory):
+    """Connection to a database with 600 generated applications, shared by a test module."""
+    db_path = tmp_path_factory.mktemp("seeded") / "seeded.db"
+    _create_database(str(db_path), 600)
+    yield from _use_database(db_path)
+
+
+@pytest.fixture
+def empty_database(tmp_path):
+    """Connection to a database at the latest schema version without applications."""
+    db_path = tmp_path / "empty.db"
+    _create_database(str(db_path), 0)
+    yield from _use_database(db_path)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The QApplication, created offscreen once for every test needing Qt."""
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
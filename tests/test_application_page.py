@@ -0,0 +1,67 @@
+import pytest
+
+import constants as c
+from database import db_helper
+from table.table_models import ApplicationTableModel
+
+SORT_ORDERS = [
+    [(c.TABLE_COLUMN_DATE_APPLIED, True)],
+    [(c.TABLE_COLUMN_DATE_APPLIED, False)],
+    [(c.TABLE_COLUMN_COMPANY, False), (c.TABLE_COLUMN_DATE_APPLIED, True)],
+    [(c.TABLE_COLUMN_JOB_TITLE, True)],
+    [(c.TABLE_COLUMN_STATUS, False), (c.TABLE_COLUMN_EVENT_COUNT, True)],
+    [(c.TABLE_COLUMN_LAST_EVENT_DATE, False), (c.TABLE_COLUMN_LOCATION, True)],
+]
+
+
+def _python_order(applications, sort_keys):
+    # The order get_application_page promises, computed with stable sorts from the least significant key
+    fields = ApplicationTableModel.SORT_FIELDS
+    ordered = sorted(applications, key=lambda app: app.id, reverse=sort_keys[0][1])
+    for column, descending in reversed(sort_keys):
+        def key(app, field=fields[column]):
+            value = getattr(app, field)
+            if value is None:
+                return ""
+            return value.lower() if column == c.TABLE_COLUMN_JOB_TITLE else value
+        ordered.sort(key=key, reverse=descending)
+    return [app.id for app in ordered]
+
+
+def _all_pages(sort_keys, filter_mode=c.FilterMode.ALL, ids=None, limit=37):
+    rows = []
+    after = None
+    while True:
+        page = db_helper.get_application_page(sort_keys, filter_mode, ids, after=after, limit=limit)
+        rows.extend(app.id for app, _ in page)
+        if len(page) < limit:
+            return rows
+        after = page[-1][1]
+
+
+@pytest.mark.parametrize("sort_keys", SORT_ORDERS)
+def test_pages_follow_the_sort_order(seeded_database, sort_keys):
+    applications = list(db_helper.iter_applications())
+    assert _all_pages(sort_keys) == _python_order(applications, sort_keys)
+
+
+@pytest.mark.parametrize("filter_mode", list(c.FilterMode))
+def test_pages_and_count_respect_filter(seeded_database, filter_mode):
+    statuses = c.FILTER_MODE_STATUSES[filter_mode]
+    applications = [app for app in db_helper.iter_applications() if statuses is None or app.status in statuses]
+    sort_keys = SORT_ORDERS[2]
+    assert _all_pages(sort_keys, filter_mode) == _python_order(applications, sort_keys)
+    assert db_helper.count_applications(filter_mode) == len(applications)
+
+
+def test_pages_restricted_to_ids(seeded_database):
+    ids = set(range(5, 600, 7))
+    rows = _all_pages(SORT_ORDERS[0], ids=ids, limit=10)
+    assert sorted(rows) == sorted(ids)
+    assert db_helper.count_applications(ids=ids) == len(ids)
+
+
+def test_page_without_limit_returns_every_remaining_row(seeded_database):
+    first = db_helper.get_application_page(SORT_ORDERS[0], limit=100)
+    rest = db_helper.get_application_page(SORT_ORDERS[0], after=first[-1][1], limit=None)
+    assert len(first) + len(rest) == 600
@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+from database import db_helper
+from database.importer import BatchError, import_records, parse_record, read_records
+
+CSV = """Company,Job Title,Apply Date,City,Type,Date,Note
+Acme,Engineer,01/03/2024,London,Interview,2024-03-08,First round
+Acme,Engineer,01/03/2024,London,Rejection,2024-03-20,
+Globex,Analyst,2024-03-02,,,,
+Initech,,2024-03-03,,,,
+Umbrella,Chemist,2024-02-30,,,,
+Hooli,Engineer,2024-03-04,,Lunch,2024-03-05,
+"""
+
+JSONL = """{"company": "Acme", "title": "Engineer", "application_date": "2024-03-01", "events": [{"type": "interview", "date": "2024-03-08"}]}
+
+not json
+[1, 2]
+{"company": "Globex", "job_title": "Analyst", "application_date": "2024-03-02", "events": "none"}
+"""
+
+
+def _records(text, file_format):
+    return list(read_records(io.StringIO(text, newline=""), file_format))
+
+
+def test_csv_rows_are_grouped_into_applications():
+    records = _records(CSV, "csv")
+    assert [line for line, _ in records] == [2, 4, 5, 6, 7]
+    line, acme = records[0]
+    assert [event["event_type"] for event in acme["events"]] == ["Interview", "Rejection"]
+    assert records[1][1]["events"] == []
+
+
+def test_parse_record_normalizes_fields():
+    assert parse_record({
+        "company": " Acme ", "job_title": "Engineer", "application_date": "01/03/2024", "location": "",
+        "events": [{"event_type": "rejection", "event_date": "2024-03-20"},
+                   {"type": "Interview", "date": "08/03/2024", "note": "First round"}],
+    }) == ("Acme", "Engineer", "2024-03-01", None,
+           (("Interview", "2024-03-08", "First round"), ("Rejection", "2024-03-20", None)))
+
+
+@pytest.mark.parametrize("record, reason", [
+    ({"job_title": "Engineer", "application_date": "2024-03-01"}, "missing company"),
+    ({"company": "Acme", "job_title": "Engineer", "application_date": "2024-02-30"}, "invalid application_date"),
+    ({"company": "Acme", "job_title": "Engineer", "application_date": "2024-03-01",
+      "events": [{"event_type": "Lunch", "event_date": "2024-03-02"}]}, "unknown event_type"),
+    ({"company": "Acme", "job_title": "Engineer", "application_date": "2024-03-01",
+      "events": [{"event_type": "Offer"}]}, "missing event_date"),
+    ({"company": "Acme", "job_title": "Engineer", "application_date": "2024-03-01", "events": "none"},
+     "expected events to be a list"),
+])
+def test_parse_record_rejects_invalid_records(record, reason):
+    with pytest.raises(ValueError, match=reason):
+        parse_record(record)
+
+
+def test_import_csv(empty_database):
+    result, rejects = import_records(_records(CSV, "csv"), batch_size=1)
+    assert (result.applications, result.events, result.rejected) == (2, 2, 3)
+    assert rejects == [(5, "missing job_title"), (6, "invalid application_date: '2024-02-30'"),
+                       (7, "unknown event_type: 'Lunch'")]
+    acme, globex = db_helper.get_all_applications(with_events=True)
+    assert (acme.company, acme.location, acme.status, acme.event_count) == ("Acme", "London", "Closed", 2)
+    assert [event.event_type for event in acme.events] == ["Interview", "Rejection"]
+    assert (globex.status, globex.location, globex.events) == ("Pending", None, ())
+
+
+def test_import_jsonl(empty_database):
+    result, rejects = import_records(_records(JSONL, "jsonl"))
+    assert (result.applications, result.events, result.rejected) == (1, 1, 3)
+    assert [line for line, _ in rejects] == [3, 4, 5]
+    assert rejects[1][1] == "expected a JSON object"
+    (acme,) = db_helper.get_all_applications()
+    assert (acme.job_title, acme.status, acme.last_event_type) == ("Engineer", "Active", "Interview")
+
+
+def test_failed_batch_stops_the_import(empty_database):
+    def records():
+        yield 2, {"company": "Acme", "job_title": "Engineer", "application_date": "2024-03-01"}
+        # Added by someone else after the importer read the company names
+        db_helper.get_or_create_company("Globex")
+        yield 3, {"company": "Globex", "job_title": "Analyst", "application_date": "2024-03-02"}
+        yield 4, {"company": "Initech", "job_title": "Tester", "application_date": "2024-03-03"}
+
+    with pytest.raises(BatchError) as error:
+        import_records(records(), batch_size=2)
+    assert (error.value.first_line, error.value.last_line) == (2, 3)
+    assert error.value.result.applications == 0
+    assert db_helper.get_all_applications() == []
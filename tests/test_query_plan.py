@@ -0,0 +1,124 @@
+"""
+Query plan regression tests.
+
+Guards the indexes added by the schema migrations: every db_helper function
+runs against a database seeded past a threshold size while the statements it
+executes are traced, and EXPLAIN QUERY PLAN of each traced statement must not
+fall back to a full table SCAN, unless the scan is the intended access path
+of a query that lists a whole table.
+"""
+import re
+
+import pytest
+
+import constants as c
+from database import connection, db_helper, search_query
+
+# Table size the plans are checked at
+ROWS = 10000
+
+# Matches "SCAN applications" / "SCAN a" but not "SCAN c USING COVERING INDEX ..."
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+# (label, callable, tables the query is allowed to scan in full)
+WORKLOADS = [
+    ("get_all_applications", lambda: db_helper.get_all_applications(), {"a"}),
+    ("get_all_applications with events", lambda: db_helper.get_all_applications(with_events=True), {"a"}),
+    ("get_applications", lambda: db_helper.get_applications(c.FilterMode.CLOSED, limit=100), set()),
+    ("get_applications by date", lambda: db_helper.get_applications(
+        date_from="2024-03-01", date_to="2024-03-31", limit=100), set()),
+    ("iter_applications", lambda: list(db_helper.iter_applications()), {"a"}),
+    ("get_application_page", lambda: db_helper.get_application_page(
+        [(c.TABLE_COLUMN_DATE_APPLIED, True)], limit=200), set()),
+    ("get_application_page after key", lambda: db_helper.get_application_page(
+        [(c.TABLE_COLUMN_DATE_APPLIED, True)], after=("2024-03-01", 5000), limit=200), set()),
+    ("get_application_page by status", lambda: db_helper.get_application_page(
+        [(c.TABLE_COLUMN_DATE_APPLIED, True)], c.FilterMode.CLOSED, limit=200), set()),
+    ("get_application_page by company", lambda: db_helper.get_application_page(
+        [(c.TABLE_COLUMN_COMPANY, False), (c.TABLE_COLUMN_DATE_APPLIED, True)],
+        after=("Company 3", "2024-03-01", 5000), limit=200), set()),
+    ("get_application_page by job title", lambda: db_helper.get_application_page(
+        [(c.TABLE_COLUMN_JOB_TITLE, False)], after=("Job 5", 5), limit=200), set()),
+    ("get_application_page by events", lambda: db_helper.get_application_page(
+        [(c.TABLE_COLUMN_EVENT_COUNT, True)], after=(3, 5000), limit=200), set()),
+    ("count_applications", lambda: db_helper.count_applications(c.FilterMode.ACTIVE), set()),
+    ("iter_applications_with_events", lambda: list(db_helper.iter_applications_with_events()), set()),
+    ("iter_applications_with_events filtered", lambda: list(db_helper.iter_applications_with_events(
+        c.FilterMode.CLOSED, "2024-03-01", "2024-03-31")), set()),
+    ("search_applications", lambda: db_helper.search_applications("comp job", limit=50), set()),
+    ("query_applications", lambda: db_helper.query_applications(search_query.parse_query(
+        'status:active company:"company 3" after:2024-01-01 city:city has:interview "job"')), set()),
+    ("query_applications by date", lambda: db_helper.query_applications(search_query.parse_query(
+        "after:2024-03-01 before:2024-04-01 -has:rejection")), set()),
+    ("query_applications OR", lambda: db_helper.query_applications(search_query.parse_query(
+        "status:closed OR has:offer")), set()),
+    ("get_all_company_names", lambda: db_helper.get_all_company_names(), set()),
+    ("get_or_create_company", lambda: db_helper.get_or_create_company("Company 7"), set()),
+    ("get_or_create_location", lambda: db_helper.get_or_create_location("City 3"), set()),
+    ("get_pending_locations", lambda: db_helper.get_pending_locations(), {"locations"}),
+    ("set_location_coordinates", lambda: db_helper.set_location_coordinates("City 3", 1.0, 2.0), set()),
+    ("put_cached_geocode", lambda: db_helper.put_cached_geocode(
+        "city 3", "City 3", "ok", 1.0, 2.0, "google", 0, None), set()),
+    ("get_cached_geocode", lambda: db_helper.get_cached_geocode("city 3", 0), set()),
+    ("purge_expired_geocodes", lambda: db_helper.purge_expired_geocodes(0), set()),
+    ("insert_application", lambda: db_helper.insert_application(
+        "Company 3", "Engineer", "2024-01-01", "Pending", "City 3"), set()),
+    ("update_application", lambda: db_helper.update_application(
+        5, "Company 4", "Engineer", "2024-01-02", "City 4"), set()),
+    ("get_company_ids", lambda: db_helper.get_company_ids(), {"companies"}),
+    ("get_location_ids", lambda: db_helper.get_location_ids(), {"locations"}),
+    ("insert_application_batch", lambda: db_helper.insert_application_batch(
+        [("Company 3", "Engineer", "2024-01-01", "City 3", (("Interview", "2024-01-05", "note"),)),
+         ("New Company", "Engineer", "2024-01-02", "New City", ())],
+        {"Company 3": 4}, {"City 3": 4}), {"sqlite_master", "sqlite_sequence"}),
+    ("get_events", lambda: db_helper.get_events(5), set()),
+    ("insert_event", lambda: db_helper.insert_event(5, "Interview", "2024-01-03", "note"), set()),
+    ("delete_event", lambda: db_helper.delete_event(1), set()),
+    ("delete_application", lambda: db_helper.delete_application(6), set()),
+]
+
+
+@pytest.fixture(scope="module")
+def plan_database(tmp_path_factory, create_database):
+    db_path = str(tmp_path_factory.mktemp("query_plan") / "query_plan.db")
+    create_database(db_path, ROWS)
+    original_path = connection.DB_PATH
+    connection.set_database_path(db_path)
+    try:
+        yield connection.get_connection()
+    finally:
+        connection.set_database_path(original_path)
+
+
+def explain(conn, statement):
+    """Return the EXPLAIN QUERY PLAN detail lines for a statement."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}")]
+
+
+def trace_workload(conn, func):
+    """Run func and return the distinct data statements it executed."""
+    traced = []
+    conn.set_trace_callback(traced.append)
+    try:
+        func()
+    finally:
+        conn.set_trace_callback(None)
+
+    statements = []
+    for statement in traced:
+        keyword = statement.lstrip().split(None, 1)[0].upper()
+        if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") and statement not in statements:
+            statements.append(statement)
+    return statements
+
+
+@pytest.mark.parametrize("func, allowed_scans", [workload[1:] for workload in WORKLOADS],
+                         ids=[workload[0] for workload in WORKLOADS])
+def test_statements_use_indexes(plan_database, func, allowed_scans):
+    statements = trace_workload(plan_database, func)
+    assert statements
+    for statement in statements:
+        plan = explain(plan_database, statement)
+        scans = [match.group(1) for match in map(FULL_SCAN.match, plan) if match]
+        regressed = [table for table in scans if table not in allowed_scans]
+        assert not regressed, f"{' '.join(statement.split())}\n" + "\n".join(plan)
@@ -0,0 +1,112 @@
+import pytest
+
+from database import db_helper
+from database.search_query import And, Not, Or, QuerySyntaxError, Term, is_plain, parse_query
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", None),
+    ("   ", None),
+    ("backend", Term(None, ("backend",))),
+    ("backend engineer", And((Term(None, ("backend",)), Term(None, ("engineer",))))),
+    ('"backend engineer"', Term(None, ("backend", "engineer"))),
+    ("company:acme", Term("company", ("acme",))),
+    ('company:"big corp"', Term("company", ("big", "corp"))),
+    ("title:engineer", Term("job_title", ("engineer",))),
+    ("city:berlin", Term("location", ("berlin",))),
+    ("status:ACTIVE", Term("status", "Active")),
+    ("after:2024-01-01", Term("after", "2024-01-01")),
+    ("has:interview", Term("has", "Interview")),
+    ("has:location", Term("has", "location")),
+    ("-status:closed", Not(Term("status", "Closed"))),
+    ("a OR b", Or((Term(None, ("a",)), Term(None, ("b",))))),
+    ("a AND b", And((Term(None, ("a",)), Term(None, ("b",))))),
+    ("(a OR b) c", And((Or((Term(None, ("a",)), Term(None, ("b",)))), Term(None, ("c",))))),
+    ("c++:", Term(None, ("c",))),
+])
+def test_parse_query(text, expected):
+    assert parse_query(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Still being typed: an open quote, an open group, a field without a value
+    ('"backend eng', Term(None, ("backend", "eng"))),
+    ("(a OR b", Or((Term(None, ("a",)), Term(None, ("b",))))),
+    ("backend status:", Term(None, ("backend",))),
+    ("backend -", Term(None, ("backend",))),
+])
+def test_parse_query_tolerates_unfinished_input(text, expected):
+    assert parse_query(text) == expected
+
+
+@pytest.mark.parametrize("text", ["status:open", "after:2024-13-01", "before:yesterday", "has:lunch", "a)"])
+def test_parse_query_rejects_invalid_input(text):
+    with pytest.raises(QuerySyntaxError):
+        parse_query(text)
+
+
+@pytest.mark.parametrize("text, plain", [
+    ("backend", True),
+    ("backend engineer", True),
+    ('"backend engineer"', False),
+    ("company:acme", False),
+    ("a OR b", False),
+    ("-a", False),
+])
+def test_is_plain(text, plain):
+    assert is_plain(parse_query(text)) is plain
+
+
+def test_compile_text_terms_share_one_match():
+    sql, params = db_helper.compile_search_query(parse_query("company:acme engineer status:active"))
+    assert sql.count("MATCH") == 1
+    assert params == ['company : "acme"* AND "engineer"*', "Active"]
+
+
+def test_compile_or_and_not():
+    sql, params = db_helper.compile_search_query(parse_query("status:closed OR -has:offer"))
+    assert sql == "(a.status = ? OR NOT a.id IN (SELECT application_id FROM events WHERE event_type = ?))"
+    assert params == ["Closed", "Offer"]
+
+
+@pytest.mark.parametrize("text", [
+    "job",
+    "status:closed",
+    "status:active -has:rejection",
+    "after:2024-03-01 before:2024-04-01",
+    "status:pending OR has:rejection",
+    'company:"company 3"',
+    "city:city job",
+    "has:events",
+])
+def test_query_applications_matches_python_filter(seeded_database, text):
+    applications = {app.id: app for app in db_helper.iter_applications()}
+    event_types = {}
+    for app in db_helper.iter_applications_with_events():
+        event_types[app.id] = {event.event_type for event in app.events}
+
+    def matches(node, app):
+        if isinstance(node, And):
+            return all(matches(child, app) for child in node.children)
+        if isinstance(node, Or):
+            return any(matches(child, app) for child in node.children)
+        if isinstance(node, Not):
+            return not matches(node.child, app)
+        field, value = node
+        if field is None or field in ("company", "job_title", "location"):
+            fields = [app.company, app.job_title, app.location] if field is None else [getattr(app, field)]
+            return any(" ".join(value).lower() in (text or "").lower() for text in fields)
+        if field == "status":
+            return app.status == value
+        if field == "after":
+            return app.application_date >= value
+        if field == "before":
+            return app.application_date < value
+        if value == "events":
+            return app.event_count > 0
+        return value in event_types[app.id]
+
+    query = parse_query(text)
+    expected = {app_id for app_id, app in applications.items() if matches(query, app)}
+    assert expected
+    assert set(db_helper.query_applications(query)) == expected
@@ -0,0 +1,85 @@
+import pytest
+from PyQt6 import QtCore
+
+from models.application import Application
+from models.event import Event
+from table.table_models import ApplicationTableModel, EventTableModel, _runs
+
+
+def _app(app_id, job_title="Engineer", status="Pending"):
+    return Application(app_id, f"Company {app_id}", job_title, "2024-01-01", status)
+
+
+def _page(*applications):
+    # get_application_page rows; the sort keys are not used by the diff
+    return [(app, (app.id,)) for app in applications]
+
+
+@pytest.fixture
+def model(qapp):
+    model = ApplicationTableModel()
+    model._reset_rows(_page(*(_app(app_id) for app_id in range(1, 6))))
+    signals = []
+    for name in ("modelReset", "rowsInserted", "rowsRemoved", "layoutChanged", "dataChanged"):
+        getattr(model, name).connect(lambda *args, name=name: signals.append((name, args)))
+    model.signals = signals
+    return model
+
+
+def _ids(model):
+    return [app.id for app in model.applications()]
+
+
+def _signal_names(model):
+    return [name for name, _ in model.signals]
+
+
+def test_runs():
+    assert _runs([]) == []
+    assert _runs([1, 2, 3, 5, 7, 8]) == [(1, 3), (5, 5), (7, 8)]
+
+
+def test_unchanged_rows_emit_nothing(model):
+    model._apply_rows(_page(*(_app(app_id) for app_id in range(1, 6))))
+    assert model.signals == []
+
+
+def test_removed_and_added_rows(model):
+    model._apply_rows(_page(_app(1), _app(3), _app(5), _app(6), _app(7)))
+    assert _ids(model) == [1, 3, 5, 6, 7]
+    assert _signal_names(model) == ["rowsRemoved", "rowsRemoved", "rowsInserted"]
+    assert model.row_for_id(6) == 3
+    assert model.row_for_id(2) == -1
+
+
+def test_moved_rows_keep_persistent_indexes(model):
+    selected = QtCore.QPersistentModelIndex(model.index(1, 2))
+    model._apply_rows(_page(_app(5), _app(4), _app(3), _app(2), _app(1)))
+    assert _ids(model) == [5, 4, 3, 2, 1]
+    assert _signal_names(model) == ["layoutChanged"]
+    assert (selected.row(), selected.column()) == (3, 2)
+    assert model.application_at(selected.row()).id == 2
+
+
+def test_changed_rows_are_repainted(model):
+    model._apply_rows(_page(_app(1), _app(2, "Manager"), _app(3, "Manager"), _app(4), _app(5, status="Closed")))
+    assert _signal_names(model) == ["dataChanged", "dataChanged"]
+    (_, (first, last, _)), (_, (single, _, _)) = model.signals
+    assert (first.row(), last.row(), last.column()) == (1, 2, len(model.HEADERS) - 1)
+    assert single.row() == 4
+    assert model.application_at(1).job_title == "Manager"
+
+
+def test_never_resets(model):
+    model._apply_rows(_page(_app(9), _app(4, "Manager"), _app(2)))
+    assert _ids(model) == [9, 4, 2]
+    assert "modelReset" not in _signal_names(model)
+    assert [model.row_for_id(app_id) for app_id in (9, 4, 2)] == [0, 1, 2]
+
+
+def test_event_model_keeps_equal_events(qapp):
+    model = EventTableModel()
+    events = [Event(1, 1, "Interview", "2024-01-02", None)]
+    assert model.set_events(events)
+    assert not model.set_events(list(events))
+    assert model.set_events([])
@@ -0,0 +1,63 @@
+from helpers.trigram_index import TrigramIndex, trigrams
+from models.application import Application
+
+
+def _app(app_id, company, job_title="Engineer", location=None):
+    return Application(app_id, company, job_title, "2024-01-01", "Pending", location)
+
+
+def _index(*applications):
+    index = TrigramIndex()
+    for app in applications:
+        index.add(app)
+    return index
+
+
+def test_trigrams():
+    assert trigrams("acme") == {"acm", "cme"}
+    assert trigrams("ab") == set()
+
+
+def test_search_matches_substrings_of_any_field():
+    index = _index(_app(1, "Acme Corp"), _app(2, "Globex", "Data Scientist"), _app(3, "Initech", location="Zürich"))
+    assert index.search("cme") == {1}
+    assert index.search("scien") == {2}
+    assert index.search("zurich") == {3}
+    assert index.search("ENGINEER") == {1, 3}
+
+
+def test_search_needs_every_word():
+    index = _index(_app(1, "Acme", "Backend Engineer"), _app(2, "Acme", "Frontend Engineer"))
+    assert index.search("acme backend") == {1}
+    assert index.search("acme sales") == set()
+
+
+def test_words_do_not_match_across_fields():
+    index = _index(_app(1, "Acme", "Engineer"))
+    # "e\ne" would span the end of the company and the start of the job title
+    assert index.search("meen") == set()
+
+
+def test_short_words_are_checked_against_every_application():
+    index = _index(_app(1, "Acme"), _app(2, "Globex"))
+    assert index.search("ac") == {1}
+    assert index.search("") == {1, 2}
+
+
+def test_search_within_narrows_previous_results():
+    index = _index(_app(1, "Acme"), _app(2, "Acme Labs"), _app(3, "Labs Inc"))
+    previous = index.search("acme")
+    assert index.search("acme lab", within=previous) == {2}
+    assert index.search("labs", within={1}) == set()
+
+
+def test_add_replaces_and_remove_drops():
+    index = _index(_app(1, "Acme"), _app(2, "Globex"))
+    index.add(_app(1, "Initech"))
+    assert index.search("acme") == set()
+    assert index.search("initech") == {1}
+    index.remove(2)
+    index.remove(42)
+    assert index.search("globex") == set()
+    assert len(index) == 1
+    assert not index._postings.keys() & trigrams("globex")
@@ -21,27 +21,46 @@ from UI.main_window import Ui_MainWindow
 from dialogs.edit_details import EditDetailsPopup
 from dialogs.event_dialog import EventDialog
 import constants as c 
-from database import db_helper, event_manager
+from database.application_store import ApplicationStore
 from models.application import Application
-from table.table_helper import populate_application_table, get_selected_row_item
-from helpers.button_helper import update_buttons
-from helpers.filter_helper import filter_applications as apply_filter
+from table.table_helper import (get_selected_row_item, setup_application_table, setup_events_table,
+                                select_application, visible_applications)
+from helpers.button_helper import update_buttons, update_filter_buttons
+from helpers.search_helper import SearchController
+from helpers.date_helper import to_qdate, from_qdate
 
 class MainWindow(QMainWindow, Ui_MainWindow):
     """
     Main application window handling user interactions and data display.
 
     Attributes:
-        applications (list): List of Application objects
+        store (ApplicationStore): In-memory applications, updated incrementally after each write
         filterMode (FilterMode): Current filter mode for applications
-        events (list): List of Event objects for selected application
+        selectedAppId (int): ID of the selected application, re-selected after the table is re-queried
     """
     def __init__(self):
         """Initialize the main window and set up UI elements."""
         super().__init__()
         self.setupUi(self)
 
-        # Connect filter buttons
+        # Back both tables with item models; the application model follows the store
+        self.store = ApplicationStore(parent=self)
+        self.applicationModel = setup_application_table(self.applicationTable, self.store)
+        self.eventModel = setup_events_table(self.eventsTable)
+        self.applicationModel.rowsInserted.connect(self.update_count_label)
+        self.applicationModel.rowsRemoved.connect(self.update_count_label)
+        self.applicationModel.modelReset.connect(self.update_count_label)
+        self.applicationModel.page_loaded.connect(self.restore_selection)
+        # A refresh whose rows did not change emits no row signals, but the total may still differ
+        self.applicationModel.page_loaded.connect(self.update_count_label)
+        self.store.application_changed.connect(self.application_changed)
+        self.store.events.events_changed.connect(self.events_changed)
+        self.store.write_failed.connect(
+            lambda message: self.show_warning("Error", f"Your last change could not be saved: {message}"))
+        self.selectedAppId = None
+
+        # Connect filter buttons, labelled with live counts from the store
+        self.store.counts_changed.connect(lambda: update_filter_buttons(self, self.store.status_counts()))
         self.btn_0.clicked.connect(lambda: self.filter_applications(c.FilterMode.ALL))
         self.btn_1.clicked.connect(lambda: self.filter_applications(c.FilterMode.CLOSED))
         self.btn_2.clicked.connect(lambda: self.filter_applications(c.FilterMode.ACTIVE))
@@ -59,54 +78,79 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.deleteEventButton.clicked.connect(self.delete_event_btn_event)
         self.viewNoteButton.clicked.connect(self.view_note_btn_event)
 
-        # Connect search box
+        # Connect search box to the debounced incremental search, indexing the store as it changes
+        self.search = SearchController(self.store, self)
+        self.search.results_ready.connect(self.search_results_ready)
+        self.search.query_failed.connect(lambda message: self.statusBar().showMessage(message, 5000))
+        self.searchBox.setToolTip(
+            'Words match anywhere. Narrow down with company:, title:, city:, note:, status:active, '
+            'after:yyyy-MM-dd, before:yyyy-MM-dd, has:interview, "exact phrase", -exclude and OR.')
         self.searchBox.textChanged.connect(self.search_box_text_changed)
 
         # Connect table events
-        self.applicationTable.itemSelectionChanged.connect(self.row_selected_event)
-        self.eventsTable.itemSelectionChanged.connect(self.event_row_selected_event)
+        self.applicationTable.selectionModel().selectionChanged.connect(self.row_selected_event)
+        self.eventsTable.selectionModel().selectionChanged.connect(self.event_row_selected_event)
 
         # Set initial button states
         self.update_button_states()
 
         # Initialize table data
-        self.applications = []
+        self.filterMode = c.FilterMode.ALL
         # Defer loading of applications until after window is shown
         QtCore.QTimer.singleShot(0, self.load_initial_data)
 
     def load_initial_data(self):
-        """Load initial data after window is shown."""
-        self.applications = db_helper.get_all_applications()
-        # Set default filter mode and populate table
+        """Start loading the applications in the background after the window is shown."""
+        self.store.load()
+        # Set default filter mode
         self.filter_applications(c.FilterMode.ALL)
-        self.events = []
-    
-    def populate_table(self):
-        """Populate the applications table with current data."""
-        populate_application_table(self.applicationTable, self.applications)
 
     def search_box_text_changed(self, text):
         """
-        Filter applications based on search text.
+        Schedule a search over companies, job titles, locations and event notes.
+
+        The query is debounced; company, job title and location matches come from
+        an in-memory index, and note matches from a full-text query on a worker
+        thread. Queries with fields (status:, company:, after:, ...) are compiled
+        to SQL and run on the worker. The table is filtered in search_results_ready
+        as results arrive.
         
         Args:
             text (str): Search query text
         """
-        self.applications = db_helper.get_all_applications()
-        self.applications = [app for app in self.applications
-                            if text.lower() in app.company.lower()
-                            or text.lower() in app.job_title.lower()]
-        self.populate_table()
+        self.search.set_text(text)
+
+    def search_results_ready(self, ids):
+        """
+        Show only the applications matching the latest search.
+
+        Args:
+            ids (set): Matching application IDs, or None to show every application
+        """
+        self.statusBar().clearMessage()
+        self.applicationModel.set_search_ids(ids)
+        self.update_count_label()
 
     def map_btn_event(self):
-        """Open the map dialog showing application locations."""
+        """Open the map dialog showing application locations, once the rows not loaded yet were read."""
+        self.mapButton.setEnabled(False)
+        visible_applications(self.applicationTable, self.show_map, self.map_load_failed)
+
+    def show_map(self, applications):
+        """Show the map dialog for the given applications."""
         from dialogs.map_dialog import MapDialog
-        dialog = MapDialog(self.applications)
+        self.mapButton.setEnabled(True)
+        dialog = MapDialog(applications, self.store)
         dialog.exec()
 
+    def map_load_failed(self, error):
+        """Re-enable the map button after its applications could not be read."""
+        self.mapButton.setEnabled(True)
+        self.show_warning("Error", f"The applications for the map could not be loaded: {error}")
+
     def new_event_btn_event(self):
         """Handle creation of new events for selected application."""
-        selected_row = self.applicationTable.currentRow()
+        selected_row = self.applicationTable.currentIndex().row()
         if selected_row < 0:
             self.show_warning("No Selection", "Please select an application to add an event.")
             return
@@ -121,45 +165,32 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         dialog = EventDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             new_event_type = dialog.selected_event_type
-            new_event_date = dialog.selected_event_date.toString("dd/MM/yyyy")
+            new_event_date = from_qdate(dialog.selected_event_date)
             new_event_note = dialog.selected_event_note
 
             if not new_event_type or not new_event_date:
                 self.show_warning("Error", "Please select an event type and date.")
                 return
 
-            try:
-                # Add the event to the database and update the application status
-                event_manager.add_event(app.id, new_event_type, new_event_date, new_event_note)
-                new_status = db_helper.update_application_status(app.id)
-                app.status = new_status
-                self.refresh_application_data(app)
-                self.filter_applications(self.filterMode)
-
-                QMessageBox.information(self, "Success", "Event added successfully.")
-            
-            except Exception as e:
-                self.show_warning("Error", f"An error occurred: {str(e)}")
+            # Queue the event; the table shows it and the new status straight away
+            updated = self.store.add_event(app.id, new_event_type, new_event_date, new_event_note)
+            self.refresh_application_data(updated or app)
 
     def view_note_btn_event(self):
         """
         Display the note associated with the selected event in a message box.
         
         This method is triggered when the view note button is clicked. It retrieves
-        the note text stored in the UserRole+1 data of the first column of the selected
-        event row and displays it in a QMessageBox. If no note exists, displays a
-        warning message.
-
-        The note text is stored as custom data in the table item using Qt's UserRole+1
-        to avoid interfering with the default roles (DisplayRole, UserRole).
+        the note of the Event shown in the selected row of the events model and
+        displays it in a QMessageBox. If no note exists, displays a warning message.
 
         Returns:
             None
         """
-        selected_row = self.eventsTable.currentRow()
+        selected_row = self.eventsTable.currentIndex().row()
         if selected_row >= 0:
-            note_item = self.eventsTable.item(selected_row, 0)
-            note_text = note_item.data(QtCore.Qt.ItemDataRole.UserRole + 1)
+            event = self.eventModel.event_at(selected_row)
+            note_text = event.note if event else None
 
             if note_text:
                 QMessageBox.information(self, "Event Note", note_text)
@@ -172,31 +203,25 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
         This method is triggered when the delete event button is clicked. It performs the following steps:
         1. Validates that an event is selected in the events table
-        2. Retrieves the event ID from the table item's UserRole data
+        2. Retrieves the event ID from the events model
         3. Prompts for user confirmation before deletion
-        4. Deletes the event from the database
-        5. Updates the application's status
-        6. Refreshes the UI to reflect changes
+        4. Queues the delete, which hides the event and updates the status straight away
+        5. Refreshes the UI to reflect changes
 
         The method includes error handling for:
         - No event selected
-        - Invalid event data
-        - Database operation failures
+        - Invalid event data (failed writes are reported by the store's write_failed signal)
 
         Returns:
             None
         """
-        selected_row = self.eventsTable.currentRow()
+        selected_row = self.eventsTable.currentIndex().row()
         if selected_row < 0:
             self.show_warning("No Selection", "Please select an event to delete.")
             return
         
-        event_type_item = self.eventsTable.item(selected_row, 0)
-        if event_type_item is None:
-            self.show_warning("Error", "Could not determine the selected event.")
-            return
-
-        event_id = event_type_item.data(QtCore.Qt.ItemDataRole.UserRole)
+        event = self.eventModel.event_at(selected_row)
+        event_id = event.id if event else None
         if not event_id:
             self.show_warning("Error", "Could not determine the selected event.")
             return
@@ -211,20 +236,14 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         if reply == QMessageBox.StandardButton.No:
             return
 
-        try:
-            event_manager.delete_event(event_id)
-            selected_row = self.applicationTable.currentRow()
-            if selected_row < 0:
-                self.show_warning("No Selection", "Please select an application to delete.")
-                return
-            
-            app = self.get_selected_application()
-            app.status = db_helper.update_application_status(app.id)
-            self.refresh_application_data(app)
-            self.filter_applications(self.filterMode)
-            QMessageBox.information(self, "Success", "Event deleted successfully.")
-        except Exception as e:
-            self.show_warning("Error", f"An error occurred: {str(e)}")
+        selected_row = self.applicationTable.currentIndex().row()
+        if selected_row < 0:
+            self.show_warning("No Selection", "Please select an application to delete.")
+            return
+
+        app = self.get_selected_application()
+        updated = self.store.delete_event(app.id, event_id)
+        self.refresh_application_data(updated or app)
 
     def event_row_selected_event(self):
         """
@@ -236,15 +255,14 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
         Process:
         1. Gets the ID of the currently selected application
-        2. Finds the corresponding application object from the applications list
+        2. Looks up the corresponding application object in the table model
         3. Updates the UI button states based on the application and event selection
 
         Returns:
             None
         """
-        app_id = self.get_selected_app_id()
-        app = next((app for app in self.applications if app.id == app_id), None)
-        self.update_button_states(app, app_id is not None)
+        app = self.applicationModel.application_at(self.applicationTable.currentIndex().row())
+        self.update_button_states(app, app is not None)
 
     def row_selected_event(self):
         """
@@ -258,34 +276,47 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         2. If selected:
            - Retrieves the application data for the selected row
            - Updates the details panel with application information
-           - Updates button states based on application and event data
-           - Populates the events table with related events
+           - Updates button states based on the application's event count
+           - Populates the events table from the event cache
+           - Prefetches the events of the neighbouring rows in the background
         3. If no selection:
            - Disables relevant buttons
            - Resets the details panel to default state
-
-        Note:
-            Uses the TABLE_COLUMN_COMPANY constant from constants.py to identify
-            the correct column for the application ID.
         """
-        select_items = self.applicationTable.selectedItems()
-
-        if select_items:
-            selected_row = self.applicationTable.currentRow()
+        if self.applicationTable.selectionModel().hasSelection():
+            selected_row = self.applicationTable.currentIndex().row()
             if selected_row >= 0:
-                app_id_item = self.applicationTable.item(selected_row, c.TABLE_COLUMN_COMPANY)
-                if app_id_item:
-                    app = self.get_selected_application()
-                    if app:
-                        self.update_details_panel(app)
-                        self.update_button_states(app, len(db_helper.get_events(app.id)) > 0)
-                        event_manager.populate_events_table(self.eventsTable, app.id)
-                    else:
-                        print("Could not find application with ID", app.id)
+                app = self.applicationModel.application_at(selected_row)
+                if app:
+                    self.selectedAppId = app.id
+                    self.update_details_panel(app)
+                    self.update_button_states(app, app.event_count > 0)
+                    self.show_events(app.id)
+                    self.prefetch_adjacent_events(selected_row)
+                else:
+                    print("Could not find application at row", selected_row)
         else:
+            self.selectedAppId = None
             self.update_button_states()
             self.reset_details_panel()
 
+    def restore_selection(self):
+        """Select the previously selected application again after the table was re-queried."""
+        if self.selectedAppId is None or self.applicationTable.selectionModel().hasSelection():
+            return
+        select_application(self.applicationTable, self.selectedAppId)
+
+    def application_changed(self, app):
+        """Show the latest version of the selected application, e.g. after a failed write was rolled back."""
+        if app.id == self.selectedAppId:
+            self.update_details_panel(app)
+            self.update_button_states(app, app.event_count > 0)
+
+    def events_changed(self, app_id):
+        """Show the events of the selected application once they were loaded or changed."""
+        if app_id == self.selectedAppId:
+            self.show_events(app_id)
+
     def update_details_panel(self, app):
         """
         Update the details panel with information from the selected application.
@@ -297,16 +328,16 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             app: Application object containing the following attributes:
                 - company: String name of the company
                 - job_title: String title of the position
-                - application_date: String date in format "dd/MM/yyyy"
+                - application_date: ISO date string ("yyyy-MM-dd")
                 - location: String location (can be None)
 
         Note:
-            The date string is converted to a QDate object for the date edit field.
+            The ISO date string is converted to a QDate object for the date edit field.
             Empty location values are displayed as empty strings.
         """
         self.companyLineEdit.setText(app.company)
         self.jobTitleLineEdit.setText(app.job_title)
-        self.applyDateDateEdit.setDate(QtCore.QDate.fromString(app.application_date, "dd/MM/yyyy"))
+        self.applyDateDateEdit.setDate(to_qdate(app.application_date))
         self.locationLineEdit.setText(app.location if app.location else "")
 
     def reset_details_panel(self):
@@ -329,7 +360,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.jobTitleLineEdit.setText("")
         self.applyDateDateEdit.setDate(QtCore.QDate.currentDate())
         self.locationLineEdit.setText("")
-        self.eventsTable.setRowCount(0)
+        self.eventModel.set_events([])
         self.update_button_states()
 
     def new_application_btn_event(self):
@@ -345,13 +376,12 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         2. If user accepts the dialog:
            - Extracts the entered details (company, job title, date, location)
            - Sets initial status as PENDING
-           - Inserts the new application into the database
-           - Refreshes the application list with current filter
+           - Queues the insert through the store, which adds its row once written
 
         Note:
-            - Application date is converted to string format "dd/MM/yyyy"
+            - Application date is stored as an ISO date string ("yyyy-MM-dd")
             - Initial status is set using constant STATUS_PENDING from constants.py
-            - The application list is refreshed maintaining the current filter mode
+            - The table is re-queried once the insert has committed
         """
         dialog = EditDetailsPopup(mode="add")
         dialog.setWindowTitle("New Application")
@@ -359,15 +389,12 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             # Extract details from dialog
             new_company = dialog.new_company_name
             new_job_title = dialog.new_job_title
-            new_application_date = dialog.new_application_date.toString("dd/MM/yyyy")
+            new_application_date = from_qdate(dialog.new_application_date)
             new_status = c.STATUS_PENDING
             new_location = dialog.new_location
 
-            # Insert the new application into the database
-            db_helper.insert_application(new_company, new_job_title, new_application_date, new_status, new_location)
-
-            # Refresh the application list
-            self.filter_applications(self.filterMode)
+            # Queue the insert; the store adds the row to the table once it is written
+            self.store.add_application(new_company, new_job_title, new_application_date, new_status, new_location)
 
     def delete_application_btn_event(self):
         """
@@ -382,8 +409,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         2. Gets the application ID and verifies it exists
         3. Shows a confirmation dialog
         4. If confirmed:
-           - Deletes the application from the database
-           - Refreshes the application list
+           - Queues the delete through the store, which removes its row straight away
            - Resets the details panel
            - Clears the selection
 
@@ -392,7 +418,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             - No application is selected
             - Cannot determine the selected application
         """
-        selected_row = self.applicationTable.currentRow()
+        selected_row = self.applicationTable.currentIndex().row()
         if selected_row < 0:
             self.show_warning("No Selection", "Please select an application to delete.")
             return
@@ -412,9 +438,8 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         if reply == QMessageBox.StandardButton.No:
             return
         
-        db_helper.delete_application(app_id)
+        self.store.delete_application(app_id)
 
-        self.filter_applications(self.filterMode)
         self.reset_details_panel()
         self.applicationTable.clearSelection()
 
@@ -431,20 +456,19 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         2. Gets the selected application object
         3. Opens EditDetailsPopup dialog with current application data
         4. If changes are accepted:
-           - Updates application object with new values
-           - Saves changes to database
-           - Refreshes the application display
+           - Queues the changes through the store, which repaints the edited row straight away
+           - Refreshes the details panel and events of the application
 
         Args handled by dialog:
             - company: Company name
             - job_title: Position title
-            - application_date: Application date (formatted as "dd/MM/yyyy")
+            - application_date: Application date (stored as "yyyy-MM-dd")
             - location: Job location
 
         Note:
             Silently returns if no application is selected
         """
-        selected_row = self.applicationTable.currentRow()
+        selected_row = self.applicationTable.currentIndex().row()
         if selected_row < 0:
             return
         
@@ -453,44 +477,60 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         dialog = EditDetailsPopup(app)
         dialog.setWindowTitle("Edit Details")
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            app.company = dialog.new_company_name
-            app.job_title = dialog.new_job_title
-            app.application_date = dialog.new_application_date.toString("dd/MM/yyyy")
-            app.location = dialog.new_location
-            db_helper.update_application(app.id, app.company, app.job_title, app.application_date, app.status, app.location)
-            self.refresh_application_data(app)
+            updated = self.store.update_application(
+                app.id,
+                dialog.new_company_name,
+                dialog.new_job_title,
+                from_qdate(dialog.new_application_date),
+                dialog.new_location,
+            )
+            self.refresh_application_data(updated or app)
     
     def refresh_application_data(self, app):
         """
-        Refresh the application table and maintain selection.
+        Show the latest state of an application after it was changed.
 
-        This method updates the application list from the database,
-        repopulates the table, and maintains the selection on the specified
-        application.
+        The store has already updated the application's row, and the table
+        model applies any re-query as a row diff that keeps the selection and
+        scroll position, so this only makes sure the application is selected
+        and shows its details and events.
 
         Args:
             app: Application object whose selection should be maintained after refresh
 
         Process:
-        1. Reloads all applications from database
-        2. Repopulates the table
-        3. Finds and selects the specified application in the table
-        4. Updates the events table for the selected application
-        """
-        self.applications = db_helper.get_all_applications()
-        self.populate_table()
-
-        row_count = self.applicationTable.rowCount()
-        for row in range(row_count):
-            item = self.applicationTable.item(row, c.TABLE_COLUMN_COMPANY)
-            if not item:
-                continue
-            table_app_id = item.data(QtCore.Qt.ItemDataRole.UserRole)
-            if table_app_id == app.id:
-                self.applicationTable.selectRow(row)
-                break
-
-        event_manager.populate_events_table(self.eventsTable, app.id)
+        1. Selects the specified application in the table (if the filter still shows it)
+           through the model's ID-to-row index, unless it is selected already
+        2. Updates the details panel
+        3. Updates the events table, which is left alone if the events did not change
+        """
+        row = self.applicationModel.row_for_id(app.id)
+        if row >= 0:
+            if row != self.applicationTable.currentIndex().row():
+                select_application(self.applicationTable, app.id)
+            self.update_details_panel(app)
+
+        self.show_events(app.id)
+
+    def show_events(self, app_id):
+        """Show the events of an application, loading them in the background if they are not cached."""
+        events = self.store.events.cached(app_id)
+        if events is None:
+            # events_changed shows them once loaded
+            self.store.events.prefetch([app_id])
+            events = []
+        self.eventModel.set_events(events)
+
+    def prefetch_adjacent_events(self, row, distance=2):
+        """
+        Load the events of the applications around a table row in the background.
+
+        Args:
+            row (int): Proxy row of the selected application
+            distance (int): Number of rows to prefetch above and below it
+        """
+        rows = [row + offset for offset in range(-distance, distance + 1) if offset]
+        self.store.events.prefetch(app.id for app in map(self.applicationModel.application_at, rows) if app)
 
     def filter_applications(self, filter_mode):
         """
@@ -501,16 +541,17 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
         Updates:
         - Filter label with current mode
-        - Applications list with filtered results
+        - Table contents with the applications matching the mode, queried page by page
         - Count label with number of filtered applications
-        - Table contents with filtered applications
         """
         self.filterLabel.setText(f"Filter: {filter_mode.name.title()}")
         self.filterMode = filter_mode
-        all_applications = db_helper.get_all_applications()
-        self.applications = apply_filter(all_applications, filter_mode)
-        self.countLabel.setText(f"Applications: {len(self.applications)}")
-        self.populate_table()
+        self.applicationModel.set_filter_mode(filter_mode)
+        self.update_count_label()
+
+    def update_count_label(self):
+        """Show the number of applications matching the table's filter, including rows not loaded yet."""
+        self.countLabel.setText(f"Applications: {self.applicationModel.total_count()}")
 
     def update_button_states(self, app=None, has_events=False):
         """
@@ -541,12 +582,18 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         Raises:
             ValueError: If no application is selected
         """
-        app_id = self.get_selected_app_id()
-        app = next((app for app in self.applications if app.id == app_id), None)
+        app = self.applicationModel.application_at(self.applicationTable.currentIndex().row())
         if app is None:
             raise ValueError("No application selected")
         return app
 
+    def closeEvent(self, event):
+        """Stop background queries and let queued writes finish before the window (and the database connections) close."""
+        self.search.cancel()
+        self.store.shutdown()
+        self.search.wait_for_done()
+        super().closeEvent(event)
+
     def show_warning(self, title, message):
         """
         Display a warning message dialog.